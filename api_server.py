@@ -0,0 +1,534 @@
+import argparse
+import asyncio
+import hashlib
+import json
+from league_storage import LeagueStorage
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error"
+}
+
+# 受け付けるリクエストボディの上限（バイト）
+MAX_BODY_SIZE = 64 * 1024
+
+class LeagueAPIServer:
+    def __init__(self, storage, league_name, reload_interval=2.0):
+        """
+        リーグの順位表・ランキング・試合結果を公開するHTTP/JSON API
+        
+        GETの応答はETag付きでキャッシュし、結果が変わったときだけ作り直す。
+        結果の入力は1件ずつ順番に処理し、その都度 LeagueStorage に保存する。
+        
+        Args:
+            storage (LeagueStorage): リーグの読み込み・保存に使うストレージ
+            league_name (str): 公開するリーグ名（保存ファイル名）
+            reload_interval (float): 他の端末による保存を確認する間隔（秒）
+        """
+        self.storage = storage
+        self.league_name = league_name
+        self.reload_interval = reload_interval
+        self.league = None
+        self._cache = {}  # キャッシュのキー（_cache_key） -> (ETag, 応答ボディ)
+        self._write_lock = None
+    
+    def load(self):
+        """
+        ストレージからリーグを読み込み、キャッシュを破棄する
+        
+        Returns:
+            bool: 読み込みに成功したらTrue
+        """
+        league = self.storage.load_league(self.league_name, lazy=True)
+        if league is None:
+            return False
+        self.league = league
+        self._cache.clear()
+        return True
+    
+    # 応答データの作成
+    def _league_summary(self):
+        """
+        リーグの概要
+        """
+        return {
+            "name": self.league.name,
+            "current_round": self.league.current_round,
+            "teams": len(self.league.teams),
+            "matches": len(self.league.matches),
+            "version": self.league.version
+        }
+    
+    def _standings(self):
+        """
+        チーム順位表
+        """
+        return [
+            {
+                "rank": rank,
+                "team_id": team.id,
+                "name": team.name,
+                "matches_played": team.matches_played,
+                "wins": team.wins,
+                "draws": team.draws,
+                "losses": team.losses,
+                "points": points,
+                "win_rate": win_rate,
+                "goals_for": team.goals_for,
+                "goals_against": team.goals_against,
+                "goal_difference": goal_diff,
+                "form": team.form.recent(),
+                "streak": team.form.streak(),
+                "longest_win_streak": team.form.longest_win_streak
+            }
+            for rank, (team, points, win_rate, goal_diff) in enumerate(self.league.get_standings(), 1)
+        ]
+    
+    def _player_rankings(self):
+        """
+        選手勝率ランキング
+        """
+        return [
+            {
+                "rank": rank,
+                "player_id": player.id,
+                "name": player.name,
+                "team_id": player.team_id,
+                "matches_played": matches,
+                "wins": player.wins,
+                "draws": player.draws,
+                "losses": player.losses,
+                "win_rate": win_rate,
+                "form": player.form.recent(),
+                "streak": player.form.streak()
+            }
+            for rank, (player, win_rate, matches) in enumerate(self.league.get_player_rankings(), 1)
+        ]
+    
+    def _race_status(self):
+        """
+        各チームの優勝の可能性
+        """
+        status = self.league.get_race_status()
+        return [
+            {"team_id": team.id, "name": team.name, "points": points, "status": status[team.id]}
+            for team, points, _, _ in self.league.get_standings()
+        ]
+    
+    def _power_rankings(self):
+        """
+        パワーランキング
+        """
+        return [
+            {"rank": rank, "team_id": team.id, "name": team.name, "strength": strength, "rating": rating}
+            for rank, (team, strength, rating) in enumerate(self.league.get_power_rankings(), 1)
+        ]
+    
+    def _round_matches(self, round_number):
+        """
+        指定ラウンドの試合一覧
+        """
+        return [
+            self._match_data(match, position)
+            for position, match in enumerate(self.league.matches_in_round(round_number))
+        ]
+    
+    def _squad(self, team_id, round_number=None):
+        """
+        指定ラウンドの時点のチームの選手と、各選手のそのチームでの成績
+        
+        Args:
+            team_id (str): チームID
+            round_number (int, optional): ラウンド番号（省略時は現在のラウンド）
+        """
+        if self.league.get_team(team_id) is None:
+            return None
+        if round_number is None:
+            round_number = self.league.current_round
+        stats = {row[0].id: row[1:5] for row in self.league.team_player_stats(team_id)}
+        return {
+            "team_id": team_id,
+            "round_number": round_number,
+            "players": [
+                {
+                    "player_id": player.id,
+                    "name": player.name,
+                    "position": player.position,
+                    "matches_played": stats[player.id][0],
+                    "wins": stats[player.id][1],
+                    "losses": stats[player.id][2],
+                    "draws": stats[player.id][3]
+                }
+                for player in self.league.squad(team_id, round_number)
+            ]
+        }
+    
+    def _match_data(self, match, position=None):
+        """
+        試合1つ分の応答データ
+        
+        Args:
+            match (Match): 試合オブジェクト
+            position (int, optional): ラウンド内での番号（試合IDで取得した場合はNone）
+        """
+        return {
+            "id": match.id,
+            "position": position,
+            "round_number": match.round_number,
+            "date": match.date.strftime("%Y-%m-%d %H:%M:%S"),
+            "home_team_id": match.home_team.id,
+            "home_team": match.home_team.name,
+            "away_team_id": match.away_team.id,
+            "away_team": match.away_team.name,
+            "home_score": match.home_score,
+            "away_score": match.away_score,
+            "is_finished": match.is_finished,
+            "overtime": match.overtime,
+            "player_results": match.player_results
+        }
+    
+    def _build_get(self, parts):
+        """
+        GETのパスに対応する応答データを作成
+        
+        Args:
+            parts (list): '/' で区切ったパス
+            
+        Returns:
+            object: JSONに変換する応答データ、該当しない場合はNone
+        """
+        if not parts:
+            return self._league_summary()
+        if parts == ["standings"]:
+            return self._standings()
+        if parts == ["rankings"]:
+            return self._player_rankings()
+        if parts == ["race"]:
+            return self._race_status()
+        if parts == ["power"]:
+            return self._power_rankings()
+        if len(parts) == 3 and parts[0] == "rounds" and parts[2] == "matches" and parts[1].isdecimal():
+            return self._round_matches(int(parts[1]))
+        if len(parts) == 3 and parts[0] == "teams" and parts[2] == "squad":
+            return self._squad(parts[1])
+        if len(parts) == 4 and parts[0] == "teams" and parts[2] == "squad" and parts[3].isdecimal():
+            return self._squad(parts[1], int(parts[3]))
+        if len(parts) == 2 and parts[0] == "matches":
+            match = self.league.get_match(parts[1])
+            return self._match_data(match) if match is not None else None
+        return None
+    
+    def _cache_key(self, parts):
+        """
+        GETの応答をキャッシュするときのキー
+        
+        ラウンド番号の表記（先頭の0など）の違いはまとめ、任意のラウンド番号の
+        リクエストでキャッシュが増え続けないよう、1から現在のラウンドまでの
+        ラウンドだけをキャッシュする。
+        
+        Args:
+            parts (list): '/' で区切ったパス
+            
+        Returns:
+            str: キャッシュのキー、キャッシュしない場合はNone
+        """
+        if len(parts) == 3 and parts[0] == "rounds":
+            position = 1
+        elif len(parts) == 4 and parts[0] == "teams":
+            position = 3
+        else:
+            return "/" + "/".join(parts)
+        
+        if not parts[position].isdecimal():
+            return None
+        round_number = int(parts[position])
+        if not 1 <= round_number <= self.league.current_round:
+            return None
+        parts = list(parts)
+        parts[position] = str(round_number)
+        return "/" + "/".join(parts)
+    
+    # 結果の入力
+    def _find_match(self, parts):
+        """
+        /rounds/<ラウンド>/matches/<番号>/... または /matches/<試合ID>/... から試合を取得
+        """
+        if len(parts) == 3 and parts[0] == "matches":
+            return self.league.get_match(parts[1])
+        if len(parts) != 5 or parts[0] != "rounds" or parts[2] != "matches":
+            return None
+        if not (parts[1].isdigit() and parts[3].isdigit()):
+            return None
+        matches = self.league.matches_in_round(int(parts[1]))
+        position = int(parts[3])
+        return matches[position] if position < len(matches) else None
+    
+    def _apply_result(self, parts, data):
+        """
+        結果の入力を試合に反映
+        
+        Args:
+            parts (list): '/' で区切ったパス
+            data (dict): リクエストボディ
+            
+        Returns:
+            tuple: (ステータスコード, 応答データ)
+        """
+        match = self._find_match(parts)
+        if match is None:
+            return 404, {"error": "試合が見つかりません"}
+        
+        if parts[-1] == "score":
+            home_score = data.get("home_score")
+            away_score = data.get("away_score")
+            # bool は int のサブクラスのため true/false をスコアとして受け付けないよう型を厳密に確認する
+            if not (type(home_score) is int and type(away_score) is int) \
+                    or home_score < 0 or away_score < 0:
+                return 400, {"error": "スコアは0以上の整数で指定してください"}
+            overtime = data.get("overtime", False)
+            if not isinstance(overtime, bool):
+                return 400, {"error": "overtime は true または false で指定してください"}
+            if match.is_finished:
+                return 409, {"error": "この試合の結果は入力済みです"}
+            match.set_score(home_score, away_score, overtime)
+        elif parts[-1] == "players":
+            player_id = data.get("player_id")
+            result = data.get("result")
+            if not isinstance(player_id, str):
+                return 400, {"error": "player_id は文字列で指定してください"}
+            if result not in ("○", "×", "△"):
+                return 400, {"error": "成績は ○, ×, △ のいずれかで指定してください"}
+            if match.team_of_player(player_id) is None:
+                return 404, {"error": "選手が見つかりません"}
+            if not match.is_finished:
+                return 409, {"error": "試合結果が入力されていません"}
+            if match.player_results.get(player_id, result) != result:
+                return 409, {"error": "この選手の成績は別の結果で入力済みです"}
+            # 同じ結果の再送信は成功として扱う（成績は二重に数えない）
+            match.add_player_result(player_id, result)
+        else:
+            return 404, {"error": "不明な操作です"}
+        return 200, {"result": str(match)}
+    
+    async def _submit(self, parts, body):
+        """
+        結果の入力を順番に処理して保存
+        
+        Args:
+            parts (list): '/' で区切ったパス
+            body (bytes): リクエストボディ
+            
+        Returns:
+            tuple: (ステータスコード, 応答データ)
+        """
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "JSONの形式が正しくありません"}
+        if not isinstance(data, dict):
+            return 400, {"error": "JSONオブジェクトを送信してください"}
+        
+        async with self._write_lock:
+            loop = asyncio.get_running_loop()
+            try:
+                status, payload = self._apply_result(parts, data)
+            except Exception:
+                # 途中まで反映された入力を取り消し、保存済みの状態に戻す
+                await loop.run_in_executor(None, self.load)
+                raise
+            if status != 200:
+                return status, payload
+            
+            saved = await loop.run_in_executor(None, self.storage.save_league, self.league)
+            if not saved:
+                # 保存できなかった入力は取り消し、保存済みの状態に戻す
+                await loop.run_in_executor(None, self.load)
+                return 409, {"error": "他の端末の入力と食い違いがあるため保存できませんでした"}
+            
+            self._cache.clear()
+            return status, payload
+    
+    async def _get(self, path):
+        """
+        GETの応答をキャッシュから返す（なければ作成してキャッシュ）
+        
+        Returns:
+            tuple: (ステータスコード, ETag, 応答ボディ)
+        """
+        parts = [p for p in path.split('/') if p]
+        key = self._cache_key(parts)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return 200, cached[0], cached[1]
+        
+        # 書き込み中はリーグが変化しているため完了を待つ
+        async with self._write_lock:
+            key = self._cache_key(parts)
+            cached = self._cache.get(key)
+            if cached is not None:
+                return 200, cached[0], cached[1]
+            
+            data = self._build_get(parts)
+            if data is None:
+                return 404, None, self._json_bytes({"error": "見つかりません"})
+            
+            body = self._json_bytes(data)
+            etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+            if key is not None:
+                self._cache[key] = (etag, body)
+            return 200, etag, body
+    
+    async def _watch_storage(self):
+        """
+        他の端末による保存を定期的に確認し、変わっていれば読み込み直す
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                version = await loop.run_in_executor(None, self.storage.get_league_version, self.league_name)
+                if version is not None and version != self.league.version:
+                    async with self._write_lock:
+                        await loop.run_in_executor(None, self.load)
+            except Exception as e:
+                # 書き込み途中のファイルなどで失敗しても確認を続ける（次の確認で読み込み直す）
+                print(f"保存ファイルの確認中にエラーが発生しました: {e!r}")
+    
+    # HTTPの処理
+    def _json_bytes(self, data):
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
+    
+    def _response(self, status, body=b"", etag=None, keep_alive=True):
+        """
+        HTTP応答のバイト列を作成
+        """
+        headers = [
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Cache-Control: no-cache",
+            "Connection: keep-alive" if keep_alive else "Connection: close"
+        ]
+        if etag:
+            headers.append(f"ETag: {etag}")
+        return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+    
+    async def handle_client(self, reader, writer):
+        """
+        1つの接続を処理（keep-aliveで複数のリクエストを順に処理）
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    writer.write(self._response(400, keep_alive=False))
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    writer.write(self._response(400, self._json_bytes({"error": "Content-Length が正しくありません"}),
+                                                keep_alive=False))
+                    break
+                if length > MAX_BODY_SIZE:
+                    writer.write(self._response(413, keep_alive=False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                
+                path = target.split("?", 1)[0].rstrip("/") or "/"
+                try:
+                    if method == "GET":
+                        status, etag, payload = await self._get(path)
+                        if status == 200 and headers.get("if-none-match") == etag:
+                            writer.write(self._response(304, etag=etag, keep_alive=keep_alive))
+                        else:
+                            writer.write(self._response(status, payload, etag, keep_alive))
+                    elif method == "POST":
+                        status, data = await self._submit([p for p in path.split('/') if p], body)
+                        writer.write(self._response(status, self._json_bytes(data), keep_alive=keep_alive))
+                    else:
+                        writer.write(self._response(405, self._json_bytes({"error": "未対応のメソッドです"}),
+                                                    keep_alive=keep_alive))
+                except Exception as e:
+                    # 想定外のエラーでも応答を返し、サーバーは他の接続の処理を続ける
+                    print(f"リクエストの処理中にエラーが発生しました: {method} {path}: {e!r}")
+                    writer.write(self._response(500, self._json_bytes({"error": "サーバー内部でエラーが発生しました"}),
+                                                keep_alive=False))
+                    await writer.drain()
+                    break
+                
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host="127.0.0.1", port=8080):
+        """
+        サーバーを起動して待ち受ける
+        """
+        self._write_lock = asyncio.Lock()
+        server = await asyncio.start_server(self.handle_client, host, port, backlog=1024)
+        watcher = asyncio.ensure_future(self._watch_storage())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+def main():
+    """
+    APIサーバーの起動
+    """
+    parser = argparse.ArgumentParser(description="リーグの順位表・ランキングを公開するHTTP/JSON APIサーバー")
+    parser.add_argument("league", help="公開するリーグ名（保存ファイル名）")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data", default="data", help="データディレクトリ")
+    parser.add_argument("--reload-interval", type=float, default=2.0,
+                        help="他の端末による保存を確認する間隔（秒）")
+    args = parser.parse_args()
+    
+    server = LeagueAPIServer(LeagueStorage(args.data), args.league, args.reload_interval)
+    if not server.load():
+        raise SystemExit(1)
+    
+    print(f"大会「{server.league.name}」を http://{args.host}:{args.port}/ で公開しています（Ctrl+Cで終了）")
+    print("  GET  /standings                         チーム順位表")
+    print("  GET  /rankings                          選手勝率ランキング")
+    print("  GET  /rounds/<ラウンド>/matches          ラウンドの試合一覧")
+    print("  GET  /matches/<試合ID>                   試合1つ分の情報")
+    print("  GET  /teams/<チームID>/squad[/<ラウンド>]  ラウンドの時点の選手とチームでの成績")
+    print("  POST /rounds/<ラウンド>/matches/<番号>/score    スコア入力 {\"home_score\", \"away_score\", \"overtime\"}")
+    print("  POST /rounds/<ラウンド>/matches/<番号>/players  選手成績入力 {\"player_id\", \"result\"}")
+    print("  POST /matches/<試合ID>/score, /matches/<試合ID>/players  試合IDを指定した入力（内容は上と同じ）")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("サーバーを終了します。")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""
+性能計測用のスクリプト群
+
+リポジトリのルートで ``python -m benchmarks.<モジュール名>`` として実行する。
+"""
\ No newline at end of file
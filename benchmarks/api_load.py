@@ -0,0 +1,134 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import shutil
+import tempfile
+import time
+from league_storage import LeagueStorage
+from api_server import LeagueAPIServer
+from benchmarks.synthetic import generate_league
+
+LEAGUE_NAME = "api league"
+
+def run_server(directory, port):
+    """
+    別プロセスでAPIサーバーを起動
+    """
+    server = LeagueAPIServer(LeagueStorage(directory), LEAGUE_NAME.replace(' ', '_'))
+    server.load()
+    asyncio.run(server.serve("127.0.0.1", port))
+
+async def request(reader, writer, method, path, body=b"", etag=None):
+    """
+    keep-alive接続で1件のリクエストを送り、応答を読み込む
+    
+    Returns:
+        tuple: (ステータスコード, ETag)
+    """
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    response_etag = None
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "etag":
+            response_etag = value.strip()
+    if length:
+        await reader.readexactly(length)
+    return status, response_etag
+
+async def reader_client(port, paths, deadline, counts, use_etag):
+    """
+    締め切りまでGETを送り続けるクライアント
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = {}
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        status, etag = await request(reader, writer, "GET", path, etag=etags.get(path) if use_etag else None)
+        if etag:
+            etags[path] = etag
+        counts[status] = counts.get(status, 0) + 1
+        i += 1
+    writer.close()
+
+async def writer_client(port, rounds, deadline, counts):
+    """
+    締め切りまで未入力の試合にスコアを入力し続けるクライアント
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for round_number in range(1, rounds + 1):
+        for position in range(100):
+            if time.perf_counter() >= deadline:
+                writer.close()
+                return
+            body = json.dumps({"home_score": 1, "away_score": 0}).encode()
+            status, _ = await request(reader, writer, "POST",
+                                      f"/rounds/{round_number}/matches/{position}/score", body)
+            if status == 404:
+                break
+            counts["writes"] = counts.get("writes", 0) + 1
+            await asyncio.sleep(0.05)
+    writer.close()
+
+async def load(port, clients, duration, rounds, use_etag, with_writes):
+    """
+    複数の接続から同時にリクエストを送る
+    """
+    paths = ["/standings", "/rankings", "/rounds/1/matches", "/"]
+    deadline = time.perf_counter() + duration
+    counts = {}
+    tasks = [reader_client(port, paths, deadline, counts, use_etag) for _ in range(clients)]
+    if with_writes:
+        tasks.append(writer_client(port, rounds, deadline, counts))
+    await asyncio.gather(*tasks)
+    return counts
+
+def main():
+    """
+    APIサーバーの読み込み性能を計測
+    """
+    parser = argparse.ArgumentParser(description="APIサーバーの読み込みスループットを計測")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=38)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--etag", action="store_true", help="If-None-Match を付けて送る")
+    parser.add_argument("--writes", action="store_true", help="同時にスコア入力も行う")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="league_api_")
+    try:
+        league = generate_league(name=LEAGUE_NAME, teams=args.teams, rounds=args.rounds, finished_ratio=0.5)
+        LeagueStorage(directory).save_league(league)
+        
+        process = multiprocessing.Process(target=run_server, args=(directory, args.port), daemon=True)
+        process.start()
+        time.sleep(1.0)
+        try:
+            counts = asyncio.run(load(args.port, args.clients, args.duration, args.rounds,
+                                      args.etag, args.writes))
+        finally:
+            process.terminate()
+            process.join()
+        
+        reads = sum(v for k, v in counts.items() if isinstance(k, int))
+        print(f"接続数: {args.clients}, 計測時間: {args.duration}s")
+        print(f"GET: {reads}件 ({reads / args.duration:.0f} 件/s), 内訳: "
+              + ", ".join(f"{k}: {v}" for k, v in sorted(counts.items(), key=str)))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
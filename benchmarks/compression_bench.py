@@ -0,0 +1,103 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from league_storage import LeagueStorage
+from storage_codec import CODECS
+from benchmarks.synthetic import generate_league
+
+def directory_size(path):
+    """
+    ディレクトリ以下のファイルサイズの合計を取得
+    
+    Args:
+        path (str): ディレクトリまたはファイルのパス
+        
+    Returns:
+        int: 合計サイズ（バイト）
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return total
+
+def run(league, sharded):
+    """
+    各圧縮形式で保存・読み込みを計測
+    
+    Args:
+        league (League): 計測に使うリーグ
+        sharded (bool): ディレクトリ形式で保存するか
+        
+    Returns:
+        list: 圧縮形式ごとの計測結果(dict)のリスト
+    """
+    results = []
+    for codec in CODECS:
+        workdir = tempfile.mkdtemp(prefix="league_bench_")
+        try:
+            storage = LeagueStorage(workdir, sharded=sharded, codec=codec)
+            stem = league.name.replace(' ', '_')
+            
+            start = time.perf_counter()
+            storage.save_league(league)
+            save_time = time.perf_counter() - start
+            
+            path = os.path.join(workdir, stem if sharded else f"{stem}.json")
+            size = directory_size(path)
+            
+            start = time.perf_counter()
+            storage.load_league(stem, lazy=True)
+            lazy_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            storage.load_league(stem)
+            load_time = time.perf_counter() - start
+            
+            results.append({
+                "codec": codec,
+                "size": size,
+                "save": save_time,
+                "lazy_load": lazy_time,
+                "load": load_time
+            })
+        finally:
+            shutil.rmtree(workdir)
+    return results
+
+def main():
+    """
+    圧縮形式ごとのサイズ・時間の比較を表示
+    """
+    parser = argparse.ArgumentParser(description="圧縮形式ごとの保存サイズ・時間を比較")
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--players", type=int, default=20, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--density", type=float, default=0.5, help="選手成績の記録割合")
+    parser.add_argument("--single-file", action="store_true", help="従来の1ファイル形式で計測")
+    args = parser.parse_args()
+    
+    league = generate_league(
+        teams=args.teams,
+        players_per_team=args.players,
+        rounds=args.rounds,
+        player_result_density=args.density
+    )
+    print(f"{league}, 選手成績の記録割合 {args.density}")
+    print()
+    
+    results = run(league, sharded=not args.single_file)
+    base_size = results[0]["size"]
+    
+    print(f"{'形式':<6} {'サイズ(MB)':>10} {'圧縮率':>7} {'保存(s)':>8} {'遅延読込(s)':>11} {'読込(s)':>8}")
+    print("-" * 60)
+    for r in results:
+        print(f"{r['codec']:<6} {r['size'] / 1e6:>10.2f} {r['size'] / base_size:>7.3f} "
+              f"{r['save']:>8.2f} {r['lazy_load']:>11.2f} {r['load']:>8.2f}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
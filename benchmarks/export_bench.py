@@ -0,0 +1,78 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from league_storage import LeagueStorage
+from report_export import FORMATS, export_report
+from benchmarks.synthetic import generate_league
+
+def measure(league, report, fmt, path):
+    """
+    レポートの書き出し時間とピークメモリを計測
+    
+    時間は tracemalloc なしで、ピークメモリは tracemalloc を有効にした別の1回で計測する。
+    
+    Args:
+        league (League): 対象のリーグ
+        report (str): レポート名
+        fmt (str): 出力形式
+        path (str): 出力先のファイル
+        
+    Returns:
+        tuple: (秒, ピークメモリ(バイト), 行数)
+    """
+    start = time.perf_counter()
+    rows = export_report(league, report, fmt, path)
+    seconds = time.perf_counter() - start
+    
+    tracemalloc.start()
+    export_report(league, report, fmt, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, rows
+
+def main():
+    """
+    保存済みのリーグから全試合の結果・選手の試合履歴を書き出す時間とピークメモリを表示
+    """
+    parser = argparse.ArgumentParser(description="レポートの書き出し（report_export.py）の時間とメモリを計測")
+    parser.add_argument("--teams", type=int, default=400)
+    parser.add_argument("--players", type=int, default=5, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.2, help="選手成績の記録割合")
+    parser.add_argument("--single-file", action="store_true", help="従来の1ファイル形式で保存したリーグから書き出す")
+    args = parser.parse_args()
+    
+    league = generate_league(
+        teams=args.teams,
+        players_per_team=args.players,
+        rounds=args.rounds,
+        player_result_density=args.density,
+        finished_ratio=0.9
+    )
+    print(f"{league}")
+    print()
+    
+    workdir = tempfile.mkdtemp(prefix="report_export_bench_")
+    try:
+        storage = LeagueStorage(workdir, sharded=not args.single_file)
+        storage.save_league(league)
+        # 保存済みのリーグを遅延読み込みした状態から書き出す（全試合は復元しない）
+        loaded = storage.load_league(league.name.replace(' ', '_'), lazy=True)
+        del league
+        
+        print(f"{'レポート':<10} {'形式':<6} {'行数':>9} {'時間':>9} {'ピークメモリ':>12} {'サイズ':>10}")
+        for report in ("results", "players"):
+            for fmt in FORMATS:
+                path = os.path.join(workdir, f"{report}{FORMATS[fmt]}")
+                seconds, peak, rows = measure(loaded, report, fmt, path)
+                print(f"{report:<10} {fmt:<6} {rows:>9} {seconds:8.2f}s {peak / 1024 / 1024:10.1f}MB "
+                      f"{os.path.getsize(path) / 1024 / 1024:8.1f}MB")
+        print(f"\n復元して保持した試合数: {loaded.matches.materialized_count()}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
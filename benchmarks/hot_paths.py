@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from league_storage import LeagueStorage
+from benchmarks.synthetic import generate_league
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# 規模ごとの合成リーグの設定
+SCALES = {
+    "small": {"teams": 20, "players_per_team": 15, "rounds": 38, "player_result_density": 0.5},
+    "medium": {"teams": 100, "players_per_team": 25, "rounds": 200, "player_result_density": 0.5},
+    "large": {"teams": 400, "players_per_team": 25, "rounds": 1000, "player_result_density": 0.5}
+}
+
+def case_create_match(params):
+    """
+    League.create_match: 全チームでリーグを作り、全ラウンド分の試合を作成
+    （同じラウンドに同じ組み合わせの試合は作れないため、1ラウンドごとにラウンドを進める）
+    """
+    league = generate_league(**dict(params, rounds=0))
+    team_ids = list(league.teams)
+    per_round = max(1, params["teams"] // 2)
+    fixtures = [(i // per_round + 1, team_ids[i % len(team_ids)], team_ids[(i * 7 + 1) % len(team_ids)])
+                for i in range(params["teams"] * params["rounds"] // 2)]
+    fixtures = [(round_number, home, away) for round_number, home, away in fixtures if home != away]
+    
+    def run():
+        for round_number, home, away in fixtures:
+            league.current_round = round_number
+            league.create_match(home, away)
+    return run, len(fixtures)
+
+def case_set_score(params):
+    """
+    Match.set_score: 未入力の試合すべてにスコアを入力
+    """
+    league = generate_league(**dict(params, finished_ratio=0.0))
+    matches = list(league.matches)
+    
+    def run():
+        for i, match in enumerate(matches):
+            match.set_score(i % 4, i % 3)
+    return run, len(matches)
+
+def case_add_player_result(params):
+    """
+    Match.add_player_result: 入力済みの試合に全選手の成績を入力
+    """
+    league = generate_league(**dict(params, player_result_density=0.0))
+    work = [(match, player_id) for match in league.matches for player_id in match.home_team.players]
+    
+    def run():
+        for match, player_id in work:
+            match.add_player_result(player_id, '○')
+    return run, len(work)
+
+def case_get_standings(params):
+    """
+    League.get_standings: 結果を1件入力するたびに順位表を取得（キャッシュが使えない計算し直しの時間）
+    """
+    league = generate_league(**params)
+    repeat = 100
+    team_ids = list(league.teams)
+    pending = []
+    for i in range(repeat):
+        # 既存のラウンドと重ならないラウンドに未入力の試合を作る
+        league.current_round = params["rounds"] + 1 + i
+        pending.append(league.create_match(team_ids[i % len(team_ids)], team_ids[(i + 1) % len(team_ids)]))
+    
+    def run():
+        for i, match in enumerate(pending):
+            match.set_score(i % 3, i % 2)
+            league.get_standings()
+    return run, repeat
+
+def case_get_standings_cached(params):
+    """
+    League.get_standings: 結果が変わらないまま順位表を繰り返し取得（キャッシュの時間）
+    """
+    league = generate_league(**params)
+    repeat = 100
+    
+    def run():
+        for _ in range(repeat):
+            league.get_standings()
+    return run, repeat
+
+def case_get_player_rankings(params):
+    """
+    League.get_player_rankings
+    """
+    league = generate_league(**params)
+    repeat = 20
+    
+    def run():
+        for _ in range(repeat):
+            league.get_player_rankings()
+    return run, repeat
+
+def case_squad(params):
+    """
+    League.squad: 選手の5人に1人がシーズン途中に移籍したリーグで、全チームの各ラウンドの時点の選手を取得
+    """
+    league = generate_league(**params)
+    team_ids = list(league.teams)
+    rounds = max(2, params["rounds"])
+    players = [player for team in league.teams.values() for player in team.players.values()]
+    for i, player in enumerate(players[::5]):
+        next_team = team_ids[(team_ids.index(player.team_id) + 1) % len(team_ids)]
+        league.transfer_player(player.id, next_team, 2 + i % (rounds - 1), allow_past=True)
+    queries = [(team_id, round_number) for team_id in team_ids for round_number in range(1, rounds + 1)]
+    
+    def run():
+        for team_id, round_number in queries:
+            league.squad(team_id, round_number)
+    return run, len(queries)
+
+def _storage_case(params, action, sharded=True, lazy=False):
+    league = generate_league(**params)
+    workdir = tempfile.mkdtemp(prefix="league_hotpath_")
+    storage = LeagueStorage(workdir, sharded=sharded)
+    stem = league.name.replace(' ', '_')
+    if action in ("load", "resave"):
+        storage.save_league(league)
+    if action == "resave":
+        # 保存済みのシャードから遅延読み込みしたまま変更していないリーグ
+        league = storage.load_league(stem, lazy=True)
+    
+    def run():
+        if action == "save":
+            # 毎回新しいディレクトリに全体を書き出す
+            shutil.rmtree(workdir)
+            os.makedirs(workdir)
+            storage.save_league(league)
+        elif action == "resave":
+            storage.save_league(league)
+        else:
+            storage.load_league(stem, lazy=lazy)
+    return run, 1, lambda: shutil.rmtree(workdir, ignore_errors=True)
+
+CASES = {
+    "create_match": case_create_match,
+    "set_score": case_set_score,
+    "add_player_result": case_add_player_result,
+    "get_standings": case_get_standings,
+    "get_standings_cached": case_get_standings_cached,
+    "get_player_rankings": case_get_player_rankings,
+    "squad": case_squad,
+    "save_league": lambda params: _storage_case(params, "save"),
+    "save_league_single_file": lambda params: _storage_case(params, "save", sharded=False),
+    "resave_league_unchanged": lambda params: _storage_case(params, "resave"),
+    "load_league": lambda params: _storage_case(params, "load"),
+    "load_league_lazy": lambda params: _storage_case(params, "load", lazy=True),
+    "load_league_single_file": lambda params: _storage_case(params, "load", sharded=False)
+}
+
+def measure(name, params, repeat):
+    """
+    1つの計測項目を実行
+    
+    実行時間は tracemalloc なしで repeat 回計測した最小値、
+    ピークメモリは tracemalloc を有効にした別の1回で計測する。
+    
+    Returns:
+        dict: 計測結果
+    """
+    timings = []
+    ops = 0
+    for _ in range(repeat):
+        prepared = CASES[name](params)
+        run, ops = prepared[0], prepared[1]
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+        if len(prepared) > 2:
+            prepared[2]()
+    
+    prepared = CASES[name](params)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    prepared[0]()
+    peak = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    if len(prepared) > 2:
+        prepared[2]()
+    
+    seconds = min(timings)
+    return {
+        "seconds": seconds,
+        "ops": ops,
+        "us_per_op": seconds / ops * 1e6 if ops else None,
+        "peak_kib": peak / 1024
+    }
+
+def compare(results, baseline, threshold):
+    """
+    基準値と比較して遅くなった項目を抽出
+    
+    Returns:
+        list: (項目名, 今回の時間, 基準の時間) のリスト
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["seconds"] > base["seconds"] * threshold:
+            regressions.append((name, result["seconds"], base["seconds"]))
+    return regressions
+
+def main():
+    """
+    主要な処理の性能を計測し、基準値と比較
+    """
+    parser = argparse.ArgumentParser(description="主要な処理の実行時間・ピークメモリを計測")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--teams", type=int)
+    parser.add_argument("--players", type=int, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int)
+    parser.add_argument("--density", type=float, help="選手成績の記録割合")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="計測の繰り返し回数（最小値を採用）")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="計測する項目")
+    parser.add_argument("--output", help="計測結果を書き出すJSONファイル")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="比較する基準値のJSONファイル")
+    parser.add_argument("--threshold", type=float, default=1.25, help="基準値の何倍で遅くなったとみなすか")
+    parser.add_argument("--update-baseline", action="store_true", help="今回の結果を基準値として保存")
+    args = parser.parse_args()
+    
+    params = dict(SCALES[args.scale], seed=args.seed)
+    for key, value in (("teams", args.teams), ("players_per_team", args.players),
+                       ("rounds", args.rounds), ("player_result_density", args.density)):
+        if value is not None:
+            params[key] = value
+    
+    results = {}
+    print(f"規模: {args.scale} {params}")
+    print(f"{'項目':<26} {'時間(s)':>9} {'回数':>9} {'us/回':>10} {'ピーク(KiB)':>12}")
+    print("-" * 72)
+    for name in args.only or CASES:
+        result = measure(name, params, args.repeat)
+        results[name] = result
+        per_op = f"{result['us_per_op']:.2f}" if result["us_per_op"] is not None else "-"
+        print(f"{name:<26} {result['seconds']:>9.4f} {result['ops']:>9} {per_op:>10} {result['peak_kib']:>12.0f}")
+    
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "params": params,
+            "created": time.strftime("%Y-%m-%d %H:%M:%S")
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    
+    if args.update_baseline:
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                baselines = json.load(f)
+        baselines[args.scale] = report
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2)
+        print(f"\n基準値を {args.baseline} に保存しました。")
+        return
+    
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f).get(args.scale)
+    if not baseline or baseline["meta"]["params"] != params:
+        print("\n同じ条件の基準値がないため比較をスキップしました。")
+        return
+    
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n基準値より {args.threshold} 倍以上遅くなった項目:")
+        for name, seconds, base in regressions:
+            print(f"  {name}: {seconds:.4f}s (基準 {base:.4f}s, {seconds / base:.2f}倍)")
+        raise SystemExit(1)
+    print("\n基準値と比べて遅くなった項目はありません。")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from league_storage import LeagueStorage
+from league_diff import LeagueDiff
+from benchmarks.synthetic import generate_league
+
+def run_diff(old_path, new_path, partition_bytes):
+    """
+    差分を最後まで計算
+    
+    Args:
+        old_path (str): 比較元のリーグ
+        new_path (str): 比較先のリーグ
+        partition_bytes (int): 1回にメモリへ読み込む試合データの大きさの目安
+        
+    Returns:
+        int: 試合の変更の数
+    """
+    diff = LeagueDiff(old_path, new_path, partition_bytes)
+    diff.roster_changes()
+    return sum(1 for _ in diff.iter_match_changes())
+
+def measure(old_path, new_path, partition_bytes):
+    """
+    差分の計算時間とピークメモリを計測
+    
+    時間は tracemalloc なしで、ピークメモリは tracemalloc を有効にした別の1回で計測する。
+    
+    Args:
+        old_path (str): 比較元のリーグ
+        new_path (str): 比較先のリーグ
+        partition_bytes (int): 1回にメモリへ読み込む試合データの大きさの目安
+        
+    Returns:
+        tuple: (秒, ピークメモリ(バイト), 試合の変更の数)
+    """
+    start = time.perf_counter()
+    changes = run_diff(old_path, new_path, partition_bytes)
+    seconds = time.perf_counter() - start
+    
+    tracemalloc.start()
+    run_diff(old_path, new_path, partition_bytes)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, changes
+
+def main():
+    """
+    2つの保存済みリーグの差分の計算時間・ピークメモリを表示
+    """
+    parser = argparse.ArgumentParser(description="保存済みリーグの差分（league_diff.py）の時間とメモリを計測")
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--players", type=int, default=10, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=100, help="結果を入力する試合数")
+    parser.add_argument("--partition-mb", type=float, default=4, help="1回にメモリへ読み込む大きさの目安（MB）")
+    args = parser.parse_args()
+    
+    league = generate_league(
+        teams=args.teams,
+        players_per_team=args.players,
+        rounds=args.rounds,
+        finished_ratio=0.9
+    )
+    print(f"{league}")
+    print()
+    
+    workdir = tempfile.mkdtemp(prefix="league_diff_bench_")
+    try:
+        old_dir = os.path.join(workdir, "old")
+        new_dir = os.path.join(workdir, "new")
+        stem = league.name.replace(' ', '_')
+        for sharded in (True, False):
+            LeagueStorage(old_dir, sharded=sharded).save_league(league)
+        
+        # 別の端末で一部の試合に結果を入力したコピー
+        rng = random.Random(0)
+        pending = [match for match in league.matches if not match.is_finished]
+        for match in rng.sample(pending, min(args.changes, len(pending))):
+            match.set_score(rng.randint(0, 4), rng.randint(0, 4))
+        for sharded in (True, False):
+            LeagueStorage(new_dir, sharded=sharded).save_league(league)
+        
+        size = os.path.getsize(os.path.join(old_dir, f"{stem}.json"))
+        print(f"1ファイル形式のサイズ: {size / 1024 / 1024:.1f} MB")
+        print()
+        print(f"{'形式':<24} {'時間':>10} {'ピークメモリ':>12} {'変更':>6}")
+        cases = [
+            ("ディレクトリ形式", stem, args.partition_mb),
+            ("1ファイル形式（分割）", f"{stem}.json", args.partition_mb),
+            ("1ファイル形式（一括）", f"{stem}.json", size / 1024 / 1024 + 1)
+        ]
+        for label, name, partition_mb in cases:
+            seconds, peak, changes = measure(
+                os.path.join(old_dir, name), os.path.join(new_dir, name), int(partition_mb * 1024 * 1024)
+            )
+            print(f"{label:<24} {seconds * 1000:8.0f}ms {peak / 1024 / 1024:10.1f}MB {changes:>6}")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from league_storage import LeagueStorage
+from live_dashboard import LeagueWatcher
+from benchmarks.synthetic import generate_league
+
+def standings_snapshot(league):
+    """
+    順位表・選手成績を比較用の値に変換
+    
+    Args:
+        league (League): 対象のリーグ
+        
+    Returns:
+        tuple: (チームごとの成績, 選手ごとの成績)
+    """
+    teams = [(team.id, points, team.goals_for, team.goals_against, team.form.recent())
+             for team, points, _, _ in league.get_standings()]
+    players = sorted(
+        (player.id, player.matches_played, player.wins, player.draws)
+        for team in league.teams.values() for player in team.players.values()
+    )
+    return teams, players
+
+def run(league, sharded, updates, seed=0):
+    """
+    他の端末が結果を1件ずつ保存するたびに、ライブ表示の更新時間を計測
+    
+    Args:
+        league (League): 計測に使うリーグ（未入力の試合を含むこと）
+        sharded (bool): ディレクトリ形式で保存するか
+        updates (int): 結果を保存する回数
+        seed (int): 結果を入力する試合を選ぶ乱数のシード値
+        
+    Returns:
+        dict: 計測結果
+    """
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix="league_live_")
+    try:
+        storage = LeagueStorage(workdir, sharded=sharded)
+        storage.save_league(league)
+        stem = league.name.replace(' ', '_')
+        
+        watcher = LeagueWatcher(LeagueStorage(workdir), stem)
+        start = time.perf_counter()
+        watcher.refresh()
+        initial = time.perf_counter() - start
+        
+        # 結果を入力する側（別の端末）
+        writer = storage.load_league(stem, lazy=True)
+        pending = [i for i, match in enumerate(league.matches) if not match.is_finished]
+        rng.shuffle(pending)
+        
+        times = []
+        kinds = []
+        for index in pending[:updates]:
+            writer.matches[index].set_score(rng.randint(0, 4), rng.randint(0, 4))
+            storage.save_league(writer)
+            
+            start = time.perf_counter()
+            watcher.refresh()
+            times.append(time.perf_counter() - start)
+            kinds.append(watcher.last_refresh[0])
+        
+        start = time.perf_counter()
+        reloaded = storage.load_league(stem, lazy=True)
+        full = time.perf_counter() - start
+        
+        return {
+            "initial": initial,
+            "refresh": times,
+            "kinds": kinds,
+            "full_reload": full,
+            "consistent": standings_snapshot(watcher.league) == standings_snapshot(reloaded)
+        }
+    finally:
+        shutil.rmtree(workdir)
+
+def main():
+    """
+    ライブ表示の差分更新の時間を表示
+    """
+    parser = argparse.ArgumentParser(description="ライブ表示（live_dashboard.py）の更新時間を計測")
+    parser.add_argument("--teams", type=int, default=400)
+    parser.add_argument("--players", type=int, default=5, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.2, help="選手成績の記録割合")
+    parser.add_argument("--updates", type=int, default=20, help="結果を保存する回数")
+    parser.add_argument("--single-file", action="store_true", help="従来の1ファイル形式で計測")
+    args = parser.parse_args()
+    
+    league = generate_league(
+        teams=args.teams,
+        players_per_team=args.players,
+        rounds=args.rounds,
+        player_result_density=args.density,
+        finished_ratio=0.95
+    )
+    print(f"{league}")
+    print()
+    
+    result = run(league, sharded=not args.single_file, updates=args.updates)
+    refresh = sorted(result["refresh"])
+    print(f"初回の読み込み:        {result['initial'] * 1000:8.1f} ms")
+    print(f"全体の読み込み直し:    {result['full_reload'] * 1000:8.1f} ms")
+    print(f"差分の更新 (中央値):   {refresh[len(refresh) // 2] * 1000:8.1f} ms")
+    print(f"差分の更新 (最大):     {refresh[-1] * 1000:8.1f} ms")
+    print(f"差分で更新した回数:    {result['kinds'].count('incremental')} / {len(refresh)}")
+    print(f"全体の読み込みと一致:  {result['consistent']}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
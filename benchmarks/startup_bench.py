@@ -0,0 +1,118 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from league_storage import LeagueStorage
+from session_cache import CACHE_FILE
+from benchmarks.synthetic import generate_league
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# メインメニューの入力待ちの表示（ここまでの時間を計測する）
+MENU_PROMPT = "コマンドを選択してください".encode("utf-8")
+
+def time_to_first_menu(workdir, options):
+    """
+    main.py を起動してメインメニューが表示されるまでの時間を計測
+    
+    メニューが表示されたら保存せずに終了する。
+    
+    Args:
+        workdir (str): 実行するディレクトリ（data ディレクトリを含む）
+        options (list): main.py に渡す引数
+        
+    Returns:
+        float: 秒
+    """
+    env = dict(os.environ, TERM="dumb")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", MAIN_SCRIPT] + options,
+        cwd=workdir, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    output = b""
+    while MENU_PROMPT not in output:
+        chunk = process.stdout.read1(65536)
+        if not chunk:
+            raise RuntimeError(f"メニューが表示されませんでした: {output.decode('utf-8', 'replace')[-500:]}")
+        output += chunk
+    elapsed = time.perf_counter() - start
+    process.communicate(b"0\nn\n")
+    return elapsed
+
+def measure(workdir, options, repeat, before=None):
+    """
+    起動時間を繰り返し計測して中央値を返す
+    
+    Args:
+        workdir (str): 実行するディレクトリ
+        options (list): main.py に渡す引数
+        repeat (int): 計測回数
+        before (callable, optional): 毎回の起動前に呼ぶ関数（キャッシュの削除など）
+        
+    Returns:
+        float: 中央値（秒）
+    """
+    times = []
+    for _ in range(repeat):
+        if before:
+            before()
+        times.append(time_to_first_menu(workdir, options))
+    return statistics.median(times)
+
+def main():
+    """
+    大きな大会を開いて起動したときの、メインメニューが表示されるまでの時間を
+    キャッシュなし（cold）とキャッシュあり（warm）で比較して表示
+    """
+    parser = argparse.ArgumentParser(description="起動してからメインメニューが表示されるまでの時間（session_cache.py）を計測")
+    parser.add_argument("--teams", type=int, default=400)
+    parser.add_argument("--players", type=int, default=15, help="1チームあたりの選手数")
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=0.2, help="選手成績の記録割合")
+    parser.add_argument("--repeat", type=int, default=3, help="各条件の計測回数（中央値を表示）")
+    parser.add_argument("--single-file", action="store_true", help="従来の1ファイル形式で保存した大会を開く")
+    args = parser.parse_args()
+    
+    league = generate_league(
+        teams=args.teams,
+        players_per_team=args.players,
+        rounds=args.rounds,
+        player_result_density=args.density,
+        finished_ratio=0.9
+    )
+    print(f"{league}")
+    print()
+    
+    workdir = tempfile.mkdtemp(prefix="startup_bench_")
+    try:
+        data_dir = os.path.join(workdir, "data")
+        LeagueStorage(data_dir, sharded=not args.single_file).save_league(league)
+        name = league.name.replace(' ', '_')
+        del league
+        cache_path = os.path.join(data_dir, CACHE_FILE)
+        
+        def remove_cache():
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+        
+        rows = [
+            ("キャッシュなし (--no-cache)", measure(workdir, ["--league", name, "--no-cache"], args.repeat)),
+            ("初回 (キャッシュを作成)", measure(workdir, ["--league", name], args.repeat, remove_cache)),
+            ("2回目以降 (--league 指定)", measure(workdir, ["--league", name], args.repeat)),
+            ("2回目以降 (前回の大会)", measure(workdir, [], args.repeat))
+        ]
+        cold = rows[0][1]
+        print(f"{'起動方法':<28} {'メニューまで':>12} {'短縮率':>8}")
+        for label, seconds in rows:
+            print(f"{label:<28} {seconds:11.3f}s {cold / seconds:7.1f}x")
+        print(f"\nキャッシュのサイズ: {os.path.getsize(cache_path) / 1024 / 1024:.1f}MB")
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,167 @@
+import argparse
+import sys
+import threading
+import time
+from benchmarks.synthetic import generate_league
+
+RESULT_SYMBOLS = {1: '○', -1: '×', 0: '△'}
+
+def expected_score(index):
+    """
+    試合ごとに決まったスコアを返す（検証用）
+    """
+    return index % 4, (index * 7) % 3
+
+def worker(league, matches, worker_id, workers, counts):
+    """
+    担当の試合に結果を入力する
+    
+    担当の試合に加えて隣のスレッドの担当分にも同じ結果を送信し、
+    同じ試合への二重入力が成績に二重に反映されないことを確かめる。
+    """
+    applied = 0
+    submitted = 0
+    for offset in (0, 1):
+        target = (worker_id + offset) % workers
+        for index in range(target, len(matches), workers):
+            match = matches[index]
+            home_score, away_score = expected_score(index)
+            applied += match.set_score(home_score, away_score)
+            submitted += 1
+            
+            outcome = (home_score > away_score) - (home_score < away_score)
+            for player_id in match.home_team.players:
+                applied += match.add_player_result(player_id, RESULT_SYMBOLS[outcome])
+                submitted += 1
+            for player_id in match.away_team.players:
+                applied += match.add_player_result(player_id, RESULT_SYMBOLS[-outcome])
+                submitted += 1
+        if workers == 1:
+            break
+    counts[worker_id] = (applied, submitted)
+
+def reader(league, stop, problems, snapshots):
+    """
+    結果の入力中に順位表を繰り返し取得し、1試合の結果が片方のチームにだけ
+    反映された状態が見えないことを確認する
+    """
+    while not stop.is_set():
+        standings = league.get_standings()
+        stats = league.snapshot_team_stats().values()
+        snapshots[0] += 1
+        goal_diff = sum(diff for _, _, _, diff in standings)
+        wins = sum(values[1] for values in stats)
+        draws = sum(values[2] for values in stats)
+        losses = sum(values[3] for values in stats)
+        played = sum(values[0] for values in stats)
+        if goal_diff != 0 or wins != losses or draws % 2 or played != wins + draws + losses:
+            problems.append(f"順位表の不整合: 得失点差計{goal_diff} 勝{wins} 負{losses} 分{draws} 試合{played}")
+
+def verify(league, matches):
+    """
+    チーム・選手の成績が試合結果から数え直した値と一致するか検証
+    
+    Returns:
+        list: 検出した問題の説明文のリスト
+    """
+    problems = []
+    team_stats = {team_id: [0, 0, 0, 0, 0] for team_id in league.teams}
+    player_stats = {}
+    for index, match in enumerate(matches):
+        if not match.is_finished:
+            problems.append(f"未入力: {match}")
+            continue
+        if (match.home_score, match.away_score) != expected_score(index):
+            problems.append(f"スコア不一致: {match}")
+        for team, own, opponent in ((match.home_team, match.home_score, match.away_score),
+                                    (match.away_team, match.away_score, match.home_score)):
+            stats = team_stats[team.id]
+            stats[(own < opponent) + 2 * (own == opponent)] += 1
+            stats[3] += own
+            stats[4] += opponent
+        for player_id, result in match.player_results.items():
+            stats = player_stats.setdefault(player_id, [0, 0, 0])
+            stats["○×△".index(result)] += 1
+    
+    for team in league.teams.values():
+        if [team.wins, team.losses, team.draws, team.goals_for, team.goals_against] != team_stats[team.id]:
+            problems.append(f"チーム成績の不一致: {team.name}")
+        for player in team.players.values():
+            if [player.wins, player.losses, player.draws] != player_stats.get(player.id, [0, 0, 0]):
+                problems.append(f"選手成績の不一致: {player.name}")
+    return problems
+
+def run(threads, teams, rounds, players):
+    """
+    指定したスレッド数で全試合の結果を入力し、スループットと不整合を調べる
+    
+    Returns:
+        tuple: (秒, 反映した件数, 送信した件数, 取得した順位表の数, 問題のリスト)
+    """
+    league = generate_league(
+        name="stress league", teams=teams, players_per_team=players,
+        rounds=rounds, finished_ratio=0.0
+    )
+    matches = list(league.matches)
+    counts = [None] * threads
+    problems = []
+    snapshots = [0]
+    stop = threading.Event()
+    
+    watcher = threading.Thread(target=reader, args=(league, stop, problems, snapshots))
+    workers = [
+        threading.Thread(target=worker, args=(league, matches, i, threads, counts))
+        for i in range(threads)
+    ]
+    watcher.start()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    watcher.join()
+    
+    applied = sum(a for a, _ in counts)
+    submitted = sum(s for _, s in counts)
+    expected = len(matches) * (1 + 2 * players)
+    if applied != expected:
+        problems.append(f"反映件数の不一致: {applied} (期待値 {expected})")
+    problems += verify(league, matches)
+    return elapsed, applied, submitted, snapshots[0], problems
+
+def main():
+    """
+    複数スレッドから同じリーグに同時に結果を入力し、成績のずれがないことと
+    スレッド数ごとのスループットを表示
+    """
+    parser = argparse.ArgumentParser(description="複数スレッドからの同時結果入力のストレステスト")
+    parser.add_argument("--threads", default="1,2,4,8", help="試すスレッド数（カンマ区切り）")
+    parser.add_argument("--teams", type=int, default=40)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--players", type=int, default=3, help="1チームあたりの選手数")
+    parser.add_argument("--switch-interval", type=float, default=None,
+                        help="スレッドの切り替え間隔（秒）。小さくすると競合が起きやすくなる")
+    args = parser.parse_args()
+    
+    if args.switch_interval is not None:
+        sys.setswitchinterval(args.switch_interval)
+    
+    failed = False
+    print(f"{'スレッド':>8} {'時間':>9} {'反映/送信':>16} {'送信/s':>10} {'反映/s':>10} {'順位表':>8}  検証")
+    for threads in (int(value) for value in args.threads.split(",")):
+        elapsed, applied, submitted, snapshots, problems = run(threads, args.teams, args.rounds, args.players)
+        status = "OK" if not problems else f"NG ({len(problems)}件)"
+        print(f"{threads:>8} {elapsed:8.2f}s {applied:>7}/{submitted:<8} {submitted / elapsed:10.0f} "
+              f"{applied / elapsed:10.0f} {snapshots:>8}  {status}")
+        for problem in problems[:10]:
+            print(f"    {problem}")
+        failed = failed or bool(problems)
+    
+    if failed:
+        raise SystemExit(1)
+    print("OK: 二重入力の反映・成績のずれ・不整合な順位表はありません")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+import argparse
+import multiprocessing
+import shutil
+import tempfile
+import time
+from league_storage import LeagueStorage
+from benchmarks.synthetic import generate_league
+
+LEAGUE_NAME = "stress league"
+
+def expected_score(round_number, position):
+    """
+    試合ごとに決まったスコアを返す（検証用）
+    """
+    return (round_number + position) % 4, (round_number * position) % 3
+
+def worker(directory, worker_id, workers, sharded, queue):
+    """
+    担当の試合に結果を入力し、1試合ごとに保存する
+    
+    保存が拒否された場合は読み込み直して同じ試合をやり直す。
+    """
+    storage = LeagueStorage(directory, sharded=sharded)
+    stem = LEAGUE_NAME.replace(' ', '_')
+    league = storage.load_league(stem, lazy=True)
+    saves = 0
+    retries = 0
+    
+    for round_number in range(1, league.current_round + 1):
+        for position, _ in enumerate(league.matches_in_round(round_number)):
+            if (round_number + position) % workers != worker_id:
+                continue
+            while True:
+                match = league.matches_in_round(round_number)[position]
+                home_score, away_score = expected_score(round_number, position)
+                match.set_score(home_score, away_score)
+                player_id = next(iter(match.home_team.players))
+                match.add_player_result(player_id, '○' if home_score > away_score else
+                                        '×' if home_score < away_score else '△')
+                if storage.save_league(league):
+                    saves += 1
+                    break
+                retries += 1
+                league = storage.load_league(stem, lazy=True)
+    
+    queue.put((saves, retries))
+
+def verify(storage):
+    """
+    すべての結果が保存され、チーム・選手の成績が試合結果と一致するか検証
+    
+    Returns:
+        list: 検出した問題の説明文のリスト
+    """
+    league = storage.load_league(LEAGUE_NAME.replace(' ', '_'))
+    problems = []
+    team_points = {team_id: 0 for team_id in league.teams}
+    team_matches = {team_id: 0 for team_id in league.teams}
+    player_matches = {}
+    
+    for round_number in range(1, league.current_round + 1):
+        for position, match in enumerate(league.matches_in_round(round_number)):
+            if not match.is_finished:
+                problems.append(f"未入力: {match}")
+                continue
+            if (match.home_score, match.away_score) != expected_score(round_number, position):
+                problems.append(f"スコア不一致: {match}")
+            if len(match.player_results) != 1:
+                problems.append(f"選手成績の件数不一致: {match}")
+            for player_id in match.player_results:
+                player_matches[player_id] = player_matches.get(player_id, 0) + 1
+            home, away = match.home_team.id, match.away_team.id
+            team_matches[home] += 1
+            team_matches[away] += 1
+            if match.home_score > match.away_score:
+                team_points[home] += 3
+            elif match.home_score < match.away_score:
+                team_points[away] += 3
+            else:
+                team_points[home] += 1
+                team_points[away] += 1
+    
+    for team in league.teams.values():
+        if team.points() != team_points[team.id] or team.matches_played != team_matches[team.id]:
+            problems.append(f"チーム成績の不一致: {team.name}")
+        for player in team.players.values():
+            if player.matches_played != player_matches.get(player.id, 0):
+                problems.append(f"選手成績の不一致: {player.name}")
+    return problems
+
+def main():
+    """
+    複数プロセスから同じリーグに同時に結果を保存し、結果が失われないことを確認
+    """
+    parser = argparse.ArgumentParser(description="複数プロセスからの同時保存のストレステスト")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--teams", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--single-file", action="store_true", help="従来の1ファイル形式で実行")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="league_stress_")
+    try:
+        sharded = not args.single_file
+        storage = LeagueStorage(directory, sharded=sharded)
+        league = generate_league(
+            name=LEAGUE_NAME, teams=args.teams, players_per_team=3,
+            rounds=args.rounds, finished_ratio=0.0
+        )
+        storage.save_league(league)
+        total = len(league.matches)
+        
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(directory, i, args.workers, sharded, queue))
+            for i in range(args.workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        stats = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        
+        saves = sum(s for s, _ in stats)
+        retries = sum(r for _, r in stats)
+        problems = verify(storage)
+        
+        print(f"プロセス数: {args.workers}, 試合数: {total}")
+        print(f"保存回数: {saves}, やり直し: {retries}, 所要時間: {elapsed:.2f}s, "
+              f"スループット: {saves / elapsed:.1f} 保存/s")
+        if problems:
+            print(f"NG: {len(problems)}件の問題")
+            for problem in problems[:20]:
+                print(f"  {problem}")
+            raise SystemExit(1)
+        print("OK: 結果の消失・成績の不一致はありません")
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
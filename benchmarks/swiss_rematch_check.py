@@ -0,0 +1,150 @@
+import argparse
+import random
+import time
+from league_class import League
+from team_class import Team
+from swiss_pairing import SwissPairing
+
+# 以前の組み合わせ（グループごとの貪欲法と1回の入れ替え）で避けられる再戦が起きていた例:
+# シード値 6・10チームの第7ラウンドで t00 と t02 が再戦になっていた
+REGRESSION_CASES = [(6, 10)]
+
+def can_avoid_rematch(team_ids, opponents):
+    """
+    未対戦の組だけで全チームを組めるかを総当たりで調べる（検証用、少ないチーム数のみ）
+    
+    Args:
+        team_ids (list): 組み合わせるチームIDのリスト
+        opponents (dict): チームID -> 対戦済みのチームIDの集合
+        
+    Returns:
+        bool: 組めればTrue
+    """
+    if not team_ids:
+        return True
+    first = team_ids[0]
+    for other in team_ids[1:]:
+        if other not in opponents[first]:
+            rest = [team_id for team_id in team_ids if team_id not in (first, other)]
+            if can_avoid_rematch(rest, opponents):
+                return True
+    return False
+
+def run_season(seed, teams, rounds):
+    """
+    スイス式でシーズンを進め、避けられた再戦と組み合わせの不整合を返す
+    
+    Args:
+        seed (int): 試合結果の乱数のシード値
+        teams (int): チーム数
+        rounds (int): ラウンド数
+        
+    Returns:
+        list: 問題の説明のリスト
+    """
+    rng = random.Random(seed)
+    league = League("swiss check")
+    for t in range(teams):
+        league.add_team(Team(f"t{t:02d}", f"Team {t}"))
+    
+    problems = []
+    for round_number in range(1, rounds + 1):
+        opponents = SwissPairing(league).opponents
+        matches, bye = league.create_swiss_round()
+        team_ids = [team_id for team_id in league.teams if bye is None or team_id != bye.id]
+        
+        paired = sorted(team_id for match in matches for team_id in (match.home_team.id, match.away_team.id))
+        if paired != sorted(team_ids):
+            problems.append(f"シード {seed}, {teams}チーム, 第{round_number}ラウンド: 組まれていないか重複したチームがあります")
+        
+        rematches = [f"{match.home_team.id}-{match.away_team.id}" for match in matches
+                     if match.away_team.id in opponents[match.home_team.id]]
+        if rematches and can_avoid_rematch(team_ids, opponents):
+            problems.append(f"シード {seed}, {teams}チーム, 第{round_number}ラウンド: 避けられる再戦 {', '.join(rematches)}")
+        
+        for match in matches:
+            match.set_score(rng.randint(0, 3), rng.randint(0, 3))
+    return problems
+
+def check_scale(teams, rounds, time_limit):
+    """
+    多数のチームで組み合わせの作成時間と再戦の有無を確かめる
+    
+    対戦済みの相手はラウンド数未満のため、チーム数がラウンド数の2倍より多ければ
+    未対戦の組だけで全チームを組める（各チームが半数以上のチームと未対戦）。
+    
+    Args:
+        teams (int): チーム数
+        rounds (int): ラウンド数
+        time_limit (float): 1ラウンドの組み合わせにかけてよい秒数
+        
+    Returns:
+        tuple: (問題の説明のリスト, 最も時間のかかったラウンドの秒数)
+    """
+    rng = random.Random(0)
+    league = League("swiss scale check")
+    for t in range(teams):
+        league.add_team(Team(f"t{t:05d}", f"Team {t}"))
+    
+    problems = []
+    slowest = 0.0
+    for round_number in range(1, rounds + 1):
+        start = time.perf_counter()
+        pairing = SwissPairing(league)
+        pairs, bye = pairing.pair()
+        elapsed = time.perf_counter() - start
+        slowest = max(slowest, elapsed)
+        if elapsed > time_limit:
+            problems.append(f"{teams}チーム, 第{round_number}ラウンド: 組み合わせに {elapsed:.3f}秒かかりました")
+        if len(pairs) != teams // 2:
+            problems.append(f"{teams}チーム, 第{round_number}ラウンド: {len(pairs)}組しか組まれていません")
+        rematches = sum(1 for home, away in pairs if away.id in pairing.opponents[home.id])
+        if rematches:
+            problems.append(f"{teams}チーム, 第{round_number}ラウンド: 避けられる再戦が{rematches}組あります")
+        
+        matches, _ = league.create_swiss_round()
+        for match in matches:
+            match.set_score(rng.randint(0, 3), rng.randint(0, 3))
+    return problems, slowest
+
+def main():
+    """
+    乱数で結果を入れながらスイス式のシーズンを進め、未対戦の組だけで組める
+    ラウンドで再戦が組まれないことを確かめる
+    """
+    parser = argparse.ArgumentParser(description="スイス式の組み合わせで避けられる再戦がないことの確認")
+    parser.add_argument("--seeds", type=int, default=20, help="試すシード値の数")
+    parser.add_argument("--teams", default="6,7,8,9,10,11,12", help="試すチーム数（カンマ区切り）")
+    parser.add_argument("--scale-teams", type=int, default=10000, help="作成時間を確かめるチーム数（0で省略）")
+    parser.add_argument("--scale-rounds", type=int, default=5, help="作成時間を確かめるラウンド数")
+    parser.add_argument("--time-limit", type=float, default=1.0, help="1ラウンドの組み合わせにかけてよい秒数")
+    args = parser.parse_args()
+    
+    cases = list(REGRESSION_CASES)
+    for seed in range(args.seeds):
+        for teams in (int(value) for value in args.teams.split(",")):
+            if (seed, teams) not in cases:
+                cases.append((seed, teams))
+    
+    problems = []
+    rounds_checked = 0
+    for seed, teams in cases:
+        # 全チームと一度ずつ対戦するまで（奇数の場合はバイがあるため1ラウンド多い）
+        rounds = teams - 1 if teams % 2 == 0 else teams
+        problems += run_season(seed, teams, rounds)
+        rounds_checked += rounds
+    
+    print(f"{len(cases)}シーズン, {rounds_checked}ラウンドを確認")
+    if args.scale_teams:
+        scale_problems, slowest = check_scale(args.scale_teams, args.scale_rounds, args.time_limit)
+        problems += scale_problems
+        print(f"{args.scale_teams}チーム, {args.scale_rounds}ラウンド: 組み合わせは最長 {slowest:.3f}秒")
+    for problem in problems[:20]:
+        print(f"    {problem}")
+    if problems:
+        print(f"NG: {len(problems)}件")
+        raise SystemExit(1)
+    print("OK: 避けられる再戦・組み合わせの不整合はありません")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
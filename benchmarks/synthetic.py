@@ -0,0 +1,75 @@
+import random
+from datetime import datetime, timedelta
+from league_class import League
+from team_class import Team
+from player_class import Player
+
+POSITIONS = ["GK", "DF", "MF", "FW"]
+RESULT_SYMBOLS = {1: '○', -1: '×', 0: '△'}
+
+def generate_league(name="synthetic league", teams=20, players_per_team=15,
+                    rounds=38, matches_per_round=None, player_result_density=0.5,
+                    finished_ratio=1.0, seed=0):
+    """
+    再現可能な合成リーグを生成
+    
+    同じ引数・シード値からは常に同じリーグが生成される。
+    
+    Args:
+        name (str): リーグ名
+        teams (int): チーム数
+        players_per_team (int): 1チームあたりの選手数
+        rounds (int): ラウンド数
+        matches_per_round (int, optional): 1ラウンドあたりの試合数（省略時は teams // 2）
+        player_result_density (float): 1試合あたり成績を記録する選手の割合 (0.0 ~ 1.0)
+        finished_ratio (float): 結果を入力済みにする試合の割合 (0.0 ~ 1.0)
+        seed (int): 乱数のシード値
+        
+    Returns:
+        League: 生成したリーグオブジェクト
+    """
+    rng = random.Random(seed)
+    league = League(name)
+    
+    for t in range(teams):
+        team = Team(f"team{t + 1}", f"Team {t + 1}")
+        for p in range(players_per_team):
+            player = Player(
+                f"team{t + 1}_player{p + 1}",
+                f"Player {t + 1}-{p + 1}",
+                position=POSITIONS[p % len(POSITIONS)],
+                age=rng.randint(16, 38)
+            )
+            team.add_player(player)
+        league.add_team(team)
+    
+    team_ids = list(league.teams)
+    if matches_per_round is None:
+        matches_per_round = max(1, teams // 2)
+    start_date = datetime(2024, 4, 1, 13, 0, 0)
+    
+    for round_number in range(1, rounds + 1):
+        league.current_round = round_number
+        for _ in range(matches_per_round):
+            # 同じラウンドに同じ組み合わせの試合は作れないため、作れるまで選び直す
+            match = None
+            while match is None:
+                home_id, away_id = rng.sample(team_ids, 2)
+                match = league.create_match(home_id, away_id)
+            match.date = start_date + timedelta(days=7 * (round_number - 1))
+            
+            if rng.random() >= finished_ratio:
+                continue
+            
+            home_score = rng.randint(0, 4)
+            away_score = rng.randint(0, 4)
+            match.set_score(home_score, away_score)
+            
+            # 選手成績はチームの勝敗と同じ記号で記録する
+            outcome = (home_score > away_score) - (home_score < away_score)
+            for team, sign in ((match.home_team, outcome), (match.away_team, -outcome)):
+                for player_id in team.players:
+                    if rng.random() < player_result_density:
+                        match.add_player_result(player_id, RESULT_SYMBOLS[sign])
+    
+    return league
\ No newline at end of file
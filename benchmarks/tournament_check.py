@@ -0,0 +1,172 @@
+import argparse
+import random
+import shutil
+import tempfile
+from league_storage import LeagueStorage
+from team_class import Team
+from tournament_class import Tournament
+
+def make_tournament(teams, elimination="double"):
+    """
+    シード順のチームでトーナメントを作成
+    
+    Args:
+        teams (int): チーム数
+        elimination (str): "single" または "double"
+        
+    Returns:
+        Tournament: 作成したトーナメント
+    """
+    tournament = Tournament("check", elimination)
+    for t in range(teams):
+        tournament.add_team(Team(f"t{t:02d}", f"Team {t}"))
+    tournament.start([f"t{t:02d}" for t in range(teams)])
+    return tournament
+
+def ready_matches(tournament):
+    """
+    対戦が決まっていて未終了の試合番号
+    """
+    return [match_index for match_index, match in enumerate(tournament.matches)
+            if match is not None and not match.is_finished]
+
+def play(tournament, choose):
+    """
+    優勝が決まるまで試合を進める
+    
+    Args:
+        tournament (Tournament): 対象のトーナメント
+        choose (function): (試合番号, Match) -> ホームが勝つならTrue
+        
+    Returns:
+        dict: チームID -> 敗戦数
+    """
+    losses = {team_id: 0 for team_id in tournament.entrants}
+    while True:
+        pending = ready_matches(tournament)
+        if not pending:
+            return losses
+        match_index = pending[0]
+        match = tournament.matches[match_index]
+        home_wins = choose(match_index, match)
+        tournament.set_score(match_index, 1 if home_wins else 0, 0 if home_wins else 1)
+        losses[(match.away_team if home_wins else match.home_team).id] += 1
+
+def check_grand_final(winners_side_wins):
+    """
+    グランドファイナルの結果ごとに、再戦の有無と優勝チームを確かめる
+    
+    Args:
+        winners_side_wins (bool): グランドファイナルで勝者側の優勝チームが勝つか
+        
+    Returns:
+        list: 問題の説明のリスト
+    """
+    problems = []
+    label = "勝者側の勝利" if winners_side_wins else "敗者側の勝利"
+    tournament = make_tournament(4)
+    final_index = len(tournament.matches) - 2
+    reset_index = final_index + 1
+    
+    # グランドファイナルまではシード上位（番号の小さいチーム）が勝つ
+    def choose(match_index, match):
+        if match_index == final_index:
+            return winners_side_wins
+        return match.home_team.id < match.away_team.id
+    losses = play(tournament, choose)
+    
+    final = tournament.matches[final_index]
+    if final is None or not final.is_finished:
+        return [f"{label}: グランドファイナルが行われていません"]
+    winners_champion, losers_champion = final.home_team, final.away_team
+    if losses[winners_champion.id] != (0 if winners_side_wins else 1):
+        problems.append(f"{label}: 勝者側の優勝チームの敗戦数が {losses[winners_champion.id]} です")
+    
+    reset = tournament.matches[reset_index]
+    champion = tournament.champion()
+    if winners_side_wins:
+        if reset is not None or not tournament.is_reset_skipped(reset_index):
+            problems.append(f"{label}: 不要な再戦が組まれています")
+        if champion is not winners_champion:
+            problems.append(f"{label}: 優勝チームが勝者側の優勝チームではありません")
+    else:
+        if reset is None or not reset.is_finished:
+            problems.append(f"{label}: 再戦が行われていません")
+        elif (reset.home_team, reset.away_team) != (winners_champion, losers_champion):
+            problems.append(f"{label}: 再戦の組み合わせが正しくありません")
+        elif champion is None or losses[champion.id] != 1:
+            problems.append(f"{label}: 再戦の勝者が優勝になっていません")
+    return problems
+
+def check_random(teams, seed):
+    """
+    乱数で結果を入れ、優勝チーム以外がちょうど2敗で敗退することを確かめる
+    
+    Args:
+        teams (int): チーム数
+        seed (int): 乱数のシード値
+        
+    Returns:
+        list: 問題の説明のリスト
+    """
+    rng = random.Random(seed)
+    tournament = make_tournament(teams)
+    losses = play(tournament, lambda match_index, match: rng.random() < 0.5)
+    champion = tournament.champion()
+    if champion is None:
+        return [f"{teams}チーム, シード {seed}: 優勝チームが決まっていません"]
+    problems = []
+    for team_id, count in losses.items():
+        expected = (0, 1) if team_id == champion.id else (2,)
+        if count not in expected:
+            problems.append(f"{teams}チーム, シード {seed}: {team_id} が {count}敗で終了しています")
+    return problems
+
+def check_storage():
+    """
+    再戦のあるトーナメントを保存・読み込みしても同じ状態に戻ることを確かめる
+    
+    Returns:
+        list: 問題の説明のリスト
+    """
+    tournament = make_tournament(4)
+    final_index = len(tournament.matches) - 2
+    play(tournament, lambda match_index, match: match_index != final_index and match.home_team.id < match.away_team.id)
+    
+    directory = tempfile.mkdtemp()
+    try:
+        storage = LeagueStorage(directory)
+        if not storage.save_tournament(tournament):
+            return ["保存に失敗しました"]
+        loaded = storage.load_tournament(tournament.name)
+    finally:
+        shutil.rmtree(directory)
+    if loaded is None:
+        return ["読み込みに失敗しました"]
+    if loaded.champion() is None or loaded.champion().id != tournament.champion().id:
+        return ["読み込み後の優勝チームが一致しません"]
+    return []
+
+def main():
+    """
+    ダブルエリミネーションのグランドファイナルと再戦（ブラケットリセット）を確かめる
+    """
+    parser = argparse.ArgumentParser(description="ダブルエリミネーションの敗戦数と再戦の確認")
+    parser.add_argument("--seeds", type=int, default=20, help="チーム数ごとに試すシード値の数")
+    parser.add_argument("--max-teams", type=int, default=24, help="試す最大チーム数")
+    args = parser.parse_args()
+    
+    problems = check_grand_final(True) + check_grand_final(False) + check_storage()
+    for teams in range(2, args.max_teams + 1):
+        for seed in range(args.seeds):
+            problems += check_random(teams, seed)
+    
+    for problem in problems[:20]:
+        print(f"    {problem}")
+    if problems:
+        print(f"NG: {len(problems)}件")
+        raise SystemExit(1)
+    print("OK: 優勝チーム以外はすべて2敗で敗退し、再戦は敗者側のチームがグランドファイナルに勝った場合だけ行われます")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    def __init__(self, path):
+        """
+        ロックファイルを使ったプロセス間の排他ロック（アドバイザリロック）
+        
+        with文で使用し、ブロック内では同じロックファイルを使う
+        他のプロセスの書き込みを待たせる。
+        
+        Args:
+            path (str): ロックファイルのパス
+        """
+        self.path = path
+        self._fd = None
+    
+    def acquire(self):
+        """
+        ロックを取得（他のプロセスが保持している間は待機）
+        """
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            # 先頭1バイトをロック（取得できるまで再試行される）
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+    
+    def release(self):
+        """
+        ロックを解放
+        """
+        if self._fd is None:
+            return
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
\ No newline at end of file
@@ -0,0 +1,164 @@
+# 直近の成績として保持する試合数
+FORM_SIZE = 5
+
+# 結果の記号 <-> 内部の値
+RESULT_CODES = {'○': 1, '×': 2, '△': 3}
+RESULT_SYMBOLS = {code: symbol for symbol, code in RESULT_CODES.items()}
+
+class FormTracker:
+    __slots__ = (
+        "size", "_buffer", "_position", "count", "_window",
+        "streak_result", "streak_length", "longest_win_streak", "longest_loss_streak"
+    )
+    
+    def __init__(self, size=FORM_SIZE):
+        """
+        直近の成績（調子）と連勝・連敗の記録
+        
+        直近 size 試合の結果を固定長のリングバッファに持ち、
+        結果の追加は O(1) で行う（古い結果を取り除くときに直近の勝ち数なども更新する）。
+        
+        Args:
+            size (int): 直近の成績として保持する試合数
+        """
+        self.size = size
+        self._buffer = bytearray(size)
+        self._position = 0   # 次に書き込む位置
+        self.count = 0       # 保持している結果の数（最大 size）
+        
+        # 直近 size 試合の結果ごとの数（内部の値で引く）
+        self._window = [0, 0, 0, 0]
+        
+        # 現在続いている結果と回数、最長の連勝・連敗
+        self.streak_result = None
+        self.streak_length = 0
+        self.longest_win_streak = 0
+        self.longest_loss_streak = 0
+    
+    def add(self, result):
+        """
+        結果を追加
+        
+        Args:
+            result (str): '○' (勝ち), '×' (負け), or '△' (引き分け)
+        """
+        code = RESULT_CODES.get(result)
+        if code is None:
+            return
+        
+        # 試合結果の入力のたびに呼ばれるため、属性の参照を減らしている
+        buffer = self._buffer
+        position = self._position
+        window = self._window
+        if self.count == self.size:
+            window[buffer[position]] -= 1
+        else:
+            self.count += 1
+        buffer[position] = code
+        window[code] += 1
+        position += 1
+        self._position = 0 if position == self.size else position
+        
+        if result == self.streak_result:
+            length = self.streak_length = self.streak_length + 1
+        else:
+            self.streak_result = result
+            length = self.streak_length = 1
+        if code == 1:
+            if length > self.longest_win_streak:
+                self.longest_win_streak = length
+        elif code == 2:
+            if length > self.longest_loss_streak:
+                self.longest_loss_streak = length
+    
+    @property
+    def window_wins(self):
+        """
+        直近の勝ち数
+        """
+        return self._window[1]
+    
+    @property
+    def window_losses(self):
+        """
+        直近の負け数
+        """
+        return self._window[2]
+    
+    @property
+    def window_draws(self):
+        """
+        直近の引き分け数
+        """
+        return self._window[3]
+    
+    def recent(self):
+        """
+        直近の結果（古い順）
+        
+        Returns:
+            str: 例 "○○×△○"
+        """
+        start = (self._position - self.count) % self.size
+        return "".join(
+            RESULT_SYMBOLS[self._buffer[(start + i) % self.size]] for i in range(self.count)
+        )
+    
+    def win_rate(self):
+        """
+        直近の勝率
+        
+        Returns:
+            float: 勝率 (0.0 ~ 1.0)、試合数が0の場合は0を返す
+        """
+        if self.count == 0:
+            return 0.0
+        return self.window_wins / self.count
+    
+    def streak(self):
+        """
+        現在の連勝・連敗の表示用文字列
+        
+        Returns:
+            str: 例 "3連勝", "2連敗", "1引分"、試合がなければ空文字列
+        """
+        if self.streak_result == '○':
+            return f"{self.streak_length}連勝"
+        if self.streak_result == '×':
+            return f"{self.streak_length}連敗"
+        if self.streak_result == '△':
+            return f"{self.streak_length}引分"
+        return ""
+    
+    def to_dict(self):
+        """
+        保存形式に変換
+        
+        Returns:
+            dict: 直近の結果・連続記録
+        """
+        return {
+            "recent": self.recent(),
+            "streak_length": self.streak_length,
+            "longest_win_streak": self.longest_win_streak,
+            "longest_loss_streak": self.longest_loss_streak
+        }
+    
+    def restore(self, form_data):
+        """
+        保存形式から復元
+        
+        Args:
+            form_data (dict): to_dict() の結果
+        """
+        recent = form_data["recent"][-self.size:]
+        codes = [RESULT_CODES[result] for result in recent]
+        self._buffer[:len(codes)] = bytes(codes)
+        self.count = len(codes)
+        self._position = self.count % self.size
+        for code in codes:
+            self._window[code] += 1
+        self.streak_result = recent[-1] if recent else None
+        self.streak_length = form_data["streak_length"]
+        self.longest_win_streak = form_data["longest_win_streak"]
+        self.longest_loss_streak = form_data["longest_loss_streak"]
\ No newline at end of file
@@ -0,0 +1,378 @@
+def max_weight_matching(edges, max_cardinality=False):
+    """
+    一般グラフの最大重みマッチング（Edmonds のブロッサム法、主双対法による O(n^3)）
+    
+    二部グラフに限らず、奇数長の閉路（ブロッサム）を縮約しながら増加路を探す。
+    重みが整数なら計算はすべて整数で行う。
+    
+    Args:
+        edges (list): (頂点i, 頂点j, 重み) のリスト（頂点は 0 から始まる整数、i != j）
+        max_cardinality (bool): Trueなら辺の数が最大のマッチングのうち重みが最大のものを求める
+        
+    Returns:
+        list: 頂点 -> 相手の頂点（組まれなかった頂点は -1）のリスト
+    """
+    if not edges:
+        return []
+    
+    edge_count = len(edges)
+    vertex_count = 1 + max(max(i, j) for i, j, _ in edges)
+    max_weight = max(0, max(weight for _, _, weight in edges))
+    
+    # 端点 p は辺 p // 2 の一方の頂点（p ^ 1 がもう一方の端点）
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * edge_count)]
+    # 頂点 -> その頂点から出ている辺の「相手側の端点」のリスト
+    neighbour_ends = [[] for _ in range(vertex_count)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbour_ends[i].append(2 * k + 1)
+        neighbour_ends[j].append(2 * k)
+    
+    # 頂点 -> 相手側の端点（組まれていなければ -1）
+    mate = [-1] * vertex_count
+    # ブロッサム（0 ~ vertex_count - 1 は頂点そのもの）の状態。ラベルは 0: なし, 1: S, 2: T
+    label = [0] * (2 * vertex_count)
+    label_end = [-1] * (2 * vertex_count)
+    in_blossom = list(range(vertex_count))
+    blossom_parent = [-1] * (2 * vertex_count)
+    blossom_children = [None] * (2 * vertex_count)
+    blossom_base = list(range(vertex_count)) + [-1] * vertex_count
+    blossom_ends = [None] * (2 * vertex_count)
+    best_edge = [-1] * (2 * vertex_count)
+    blossom_best_edges = [None] * (2 * vertex_count)
+    unused_blossoms = list(range(vertex_count, 2 * vertex_count))
+    dual = [max_weight] * vertex_count + [0] * vertex_count
+    allow_edge = [False] * edge_count
+    queue = []
+    
+    def slack(k):
+        i, j, weight = edges[k]
+        return dual[i] + dual[j] - 2 * weight
+    
+    def blossom_leaves(b):
+        if b < vertex_count:
+            yield b
+        else:
+            for child in blossom_children[b]:
+                if child < vertex_count:
+                    yield child
+                else:
+                    yield from blossom_leaves(child)
+    
+    def assign_label(w, t, p):
+        # 頂点 w を含む最上位のブロッサムにラベルを付け、T なら相手側に S を付ける
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        best_edge[w] = best_edge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+    
+    def scan_blossom(v, w):
+        # v, w から交互路を根へたどり、共通の祖先（新しいブロッサムの底）を探す。なければ -1（増加路）
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & 4:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if label_end[b] == -1:
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+    
+    def add_blossom(base, k):
+        # 辺 k と底 base からなる奇閉路を新しいブロッサムに縮約する
+        v, w, _ = edges[k]
+        bb = in_blossom[base]
+        bv = in_blossom[v]
+        bw = in_blossom[w]
+        b = unused_blossoms.pop()
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[bb] = b
+        blossom_children[b] = path = []
+        blossom_ends[b] = ends = []
+        while bv != bb:
+            blossom_parent[bv] = b
+            path.append(bv)
+            ends.append(label_end[bv])
+            v = endpoint[label_end[bv]]
+            bv = in_blossom[v]
+        path.append(bb)
+        path.reverse()
+        ends.reverse()
+        ends.append(2 * k)
+        while bw != bb:
+            blossom_parent[bw] = b
+            path.append(bw)
+            ends.append(label_end[bw] ^ 1)
+            w = endpoint[label_end[bw]]
+            bw = in_blossom[w]
+        label[b] = 1
+        label_end[b] = label_end[bb]
+        dual[b] = 0
+        for leaf in blossom_leaves(b):
+            if label[in_blossom[leaf]] == 2:
+                queue.append(leaf)
+            in_blossom[leaf] = b
+        
+        # 他の S ブロッサムへの余裕が最小の辺を子のブロッサムからまとめる
+        best_edge_to = [-1] * (2 * vertex_count)
+        for bv in path:
+            if blossom_best_edges[bv] is None:
+                edge_lists = [[p // 2 for p in neighbour_ends[leaf]] for leaf in blossom_leaves(bv)]
+            else:
+                edge_lists = [blossom_best_edges[bv]]
+            for edge_list in edge_lists:
+                for k in edge_list:
+                    i, j, _ = edges[k]
+                    if in_blossom[j] == b:
+                        i, j = j, i
+                    bj = in_blossom[j]
+                    if bj != b and label[bj] == 1 and (best_edge_to[bj] == -1 or slack(k) < slack(best_edge_to[bj])):
+                        best_edge_to[bj] = k
+            blossom_best_edges[bv] = None
+            best_edge[bv] = -1
+        blossom_best_edges[b] = [k for k in best_edge_to if k != -1]
+        best_edge[b] = -1
+        for k in blossom_best_edges[b]:
+            if best_edge[b] == -1 or slack(k) < slack(best_edge[b]):
+                best_edge[b] = k
+    
+    def expand_blossom(b, end_stage):
+        # ブロッサムを子に戻す（探索中の T ブロッサムなら子にラベルを付け直す）
+        for child in blossom_children[b]:
+            blossom_parent[child] = -1
+            if child < vertex_count:
+                in_blossom[child] = child
+            elif end_stage and dual[child] == 0:
+                expand_blossom(child, end_stage)
+            else:
+                for leaf in blossom_leaves(child):
+                    in_blossom[leaf] = child
+        
+        if not end_stage and label[b] == 2:
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                step = 1
+                trick = 0
+            else:
+                step = -1
+                trick = 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossom_ends[b][j - trick] ^ trick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allow_edge[blossom_ends[b][j - trick] // 2] = True
+                j += step
+                p = blossom_ends[b][j - trick] ^ trick
+                allow_edge[p // 2] = True
+                j += step
+            bv = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            label_end[endpoint[p ^ 1]] = label_end[bv] = p
+            best_edge[bv] = -1
+            j += step
+            while blossom_children[b][j] != entry_child:
+                bv = blossom_children[b][j]
+                if label[bv] == 1:
+                    j += step
+                    continue
+                for leaf in blossom_leaves(bv):
+                    if label[leaf] != 0:
+                        break
+                if label[leaf] != 0:
+                    label[leaf] = 0
+                    label[endpoint[mate[blossom_base[bv]]]] = 0
+                    assign_label(leaf, 2, label_end[leaf])
+                j += step
+        
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_ends[b] = None
+        blossom_base[b] = -1
+        blossom_best_edges[b] = None
+        best_edge[b] = -1
+        unused_blossoms.append(b)
+    
+    def augment_blossom(b, v):
+        # ブロッサム内の組み合わせを入れ替え、頂点 v を新しい底にする
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= vertex_count:
+            augment_blossom(t, v)
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            step = 1
+            trick = 0
+        else:
+            step = -1
+            trick = 1
+        while j != 0:
+            j += step
+            t = blossom_children[b][j]
+            p = blossom_ends[b][j - trick] ^ trick
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p])
+            j += step
+            t = blossom_children[b][j]
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = blossom_children[b][i:] + blossom_children[b][:i]
+        blossom_ends[b] = blossom_ends[b][i:] + blossom_ends[b][:i]
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+    
+    def augment_matching(k):
+        # 辺 k を通る増加路に沿って組み合わせを入れ替える
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = in_blossom[s]
+                if bs >= vertex_count:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if label_end[bs] == -1:
+                    break
+                t = endpoint[label_end[bs]]
+                bt = in_blossom[t]
+                s = endpoint[label_end[bt]]
+                j = endpoint[label_end[bt] ^ 1]
+                if bt >= vertex_count:
+                    augment_blossom(bt, j)
+                mate[j] = label_end[bt]
+                p = label_end[bt] ^ 1
+    
+    # 1段階ごとに増加路を1本見つけて組み合わせを1つ増やす
+    for _ in range(vertex_count):
+        label[:] = [0] * (2 * vertex_count)
+        best_edge[:] = [-1] * (2 * vertex_count)
+        blossom_best_edges[vertex_count:] = [None] * vertex_count
+        allow_edge[:] = [False] * edge_count
+        queue[:] = []
+        for v in range(vertex_count):
+            if mate[v] == -1 and label[in_blossom[v]] == 0:
+                assign_label(v, 1, -1)
+        
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbour_ends[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allow_edge[k]:
+                        k_slack = slack(k)
+                        if k_slack <= 0:
+                            allow_edge[k] = True
+                    if allow_edge[k]:
+                        if label[in_blossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[in_blossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == 1:
+                        b = in_blossom[v]
+                        if best_edge[b] == -1 or k_slack < slack(best_edge[b]):
+                            best_edge[b] = k
+                    elif label[w] == 0:
+                        if best_edge[w] == -1 or k_slack < slack(best_edge[w]):
+                            best_edge[w] = k
+            if augmented:
+                break
+            
+            # 増加路が見つからなければ双対変数を更新して使える辺を増やす
+            delta_type = -1
+            delta = delta_edge = delta_blossom = None
+            if not max_cardinality:
+                delta_type = 1
+                delta = min(dual[:vertex_count])
+            for v in range(vertex_count):
+                if label[in_blossom[v]] == 0 and best_edge[v] != -1:
+                    d = slack(best_edge[v])
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 2
+                        delta_edge = best_edge[v]
+            for b in range(2 * vertex_count):
+                if blossom_parent[b] == -1 and label[b] == 1 and best_edge[b] != -1:
+                    d = slack(best_edge[b]) // 2
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 3
+                        delta_edge = best_edge[b]
+            for b in range(vertex_count, 2 * vertex_count):
+                if (blossom_base[b] >= 0 and blossom_parent[b] == -1 and label[b] == 2
+                        and (delta_type == -1 or dual[b] < delta)):
+                    delta = dual[b]
+                    delta_type = 4
+                    delta_blossom = b
+            if delta_type == -1:
+                # 最大マッチングに達した（max_cardinality の場合のみ）
+                delta_type = 1
+                delta = max(0, min(dual[:vertex_count]))
+            
+            for v in range(vertex_count):
+                if label[in_blossom[v]] == 1:
+                    dual[v] -= delta
+                elif label[in_blossom[v]] == 2:
+                    dual[v] += delta
+            for b in range(vertex_count, 2 * vertex_count):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1:
+                    if label[b] == 1:
+                        dual[b] += delta
+                    elif label[b] == 2:
+                        dual[b] -= delta
+            
+            if delta_type == 1:
+                break
+            elif delta_type == 2:
+                allow_edge[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                if label[in_blossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                allow_edge[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(i)
+            elif delta_type == 4:
+                expand_blossom(delta_blossom, False)
+        
+        if not augmented:
+            break
+        
+        # 双対変数が 0 になった S ブロッサムは展開する
+        for b in range(vertex_count, 2 * vertex_count):
+            if blossom_parent[b] == -1 and blossom_base[b] >= 0 and label[b] == 1 and dual[b] == 0:
+                expand_blossom(b, True)
+    
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
\ No newline at end of file
@@ -0,0 +1,203 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from functools import wraps
+
+# 計測対象: (モジュール名, クラス名, メソッド名)
+TARGETS = [
+    ("league_class", "League", "add_team"),
+    ("league_class", "League", "create_match"),
+    ("league_class", "League", "next_round"),
+    ("league_class", "League", "get_standings"),
+    ("league_class", "League", "get_player_rankings"),
+    ("match_class", "Match", "set_score"),
+    ("match_class", "Match", "set_score_by_symbols"),
+    ("match_class", "Match", "add_player_result"),
+    ("team_class", "Team", "add_match_result"),
+    ("player_class", "Player", "add_result"),
+    ("league_storage", "LeagueStorage", "save_league"),
+    ("league_storage", "LeagueStorage", "load_league")
+]
+
+# 遅延ヒストグラムの区切り（マイクロ秒、2のべき乗）
+HISTOGRAM_BUCKETS = 24
+
+class _Metric:
+    __slots__ = ("count", "total", "histogram")
+    
+    def __init__(self):
+        """
+        1つの処理の呼び出し回数・合計時間・遅延ヒストグラム
+        """
+        self.count = 0
+        self.total = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+    
+    def record(self, elapsed):
+        """
+        1回分の処理時間を記録
+        
+        Args:
+            elapsed (float): 処理時間（秒）
+        """
+        self.count += 1
+        self.total += elapsed
+        bucket = min(int(elapsed * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.histogram[bucket] += 1
+
+_metrics = {}
+_originals = {}
+
+def _wrap(func, metric):
+    """
+    処理時間を記録する関数で包む
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metric.record(time.perf_counter() - start)
+    return wrapper
+
+def is_enabled():
+    """
+    計測が有効か
+    
+    Returns:
+        bool: 有効ならTrue
+    """
+    return bool(_originals)
+
+def enable():
+    """
+    主要な処理の計測を有効にする
+    
+    対象のメソッドを計測用の関数で置き換える。無効の間は元のメソッドが
+    そのまま使われるため、計測のための処理は一切発生しない。
+    """
+    import importlib
+    
+    if _originals:
+        return
+    for module_name, class_name, method_name in TARGETS:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        name = f"{class_name}.{method_name}"
+        original = cls.__dict__[method_name]
+        metric = _metrics.setdefault(name, _Metric())
+        _originals[(cls, method_name)] = original
+        setattr(cls, method_name, _wrap(original, metric))
+
+def disable():
+    """
+    計測を無効にして元のメソッドに戻す（計測結果は残る）
+    """
+    for (cls, method_name), original in _originals.items():
+        setattr(cls, method_name, original)
+    _originals.clear()
+
+def reset():
+    """
+    計測結果を消去
+    """
+    for metric in _metrics.values():
+        metric.__init__()
+
+def snapshot():
+    """
+    計測結果を取得
+    
+    Returns:
+        dict: 処理名 -> {"count", "total", "histogram"}
+    """
+    return {
+        name: {"count": m.count, "total": m.total, "histogram": list(m.histogram)}
+        for name, m in _metrics.items() if m.count
+    }
+
+def _bucket_label(bucket):
+    """
+    ヒストグラムの区切りの表示名
+    """
+    if bucket == 0:
+        return "<1us"
+    upper = 1 << bucket
+    if upper >= 1000000:
+        return f"<{upper / 1e6:g}s"
+    if upper >= 1000:
+        return f"<{upper / 1e3:g}ms"
+    return f"<{upper}us"
+
+def format_report():
+    """
+    計測結果を表形式の文字列に変換
+    
+    Returns:
+        str: 計測結果のレポート
+    """
+    data = snapshot()
+    if not data:
+        return "計測結果はありません（計測が無効か、対象の処理が呼ばれていません）。"
+    
+    lines = [f"{'処理':<30} {'回数':>9} {'合計(ms)':>10} {'平均(us)':>10}  遅延の分布"]
+    lines.append("-" * 90)
+    for name, m in sorted(data.items(), key=lambda item: -item[1]["total"]):
+        average = m["total"] / m["count"] * 1e6
+        spread = " ".join(
+            f"{_bucket_label(b)}:{n}" for b, n in enumerate(m["histogram"]) if n
+        )
+        lines.append(f"{name:<30} {m['count']:>9} {m['total'] * 1e3:>10.2f} {average:>10.2f}  {spread}")
+    return "\n".join(lines)
+
+class SessionProfiler:
+    def __init__(self, directory):
+        """
+        セッション全体を cProfile と tracemalloc で計測し、終了時にレポートを書き出す
+        
+        Args:
+            directory (str): レポートの出力先ディレクトリ
+        """
+        self.directory = directory
+        self._profile = cProfile.Profile()
+    
+    def __enter__(self):
+        tracemalloc.start()
+        self._profile.enable()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profile.disable()
+        memory_snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.write_reports(memory_snapshot, current, peak)
+    
+    def write_reports(self, memory_snapshot, current, peak):
+        """
+        プロファイル結果をファイルに書き出す
+        """
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        
+        # cProfile（pstats形式と上位の関数の一覧）
+        self._profile.dump_stats(os.path.join(self.directory, f"profile_{stamp}.pstats"))
+        text = io.StringIO()
+        pstats.Stats(self._profile, stream=text).sort_stats("cumulative").print_stats(50)
+        with open(os.path.join(self.directory, f"profile_{stamp}.txt"), 'w', encoding='utf-8') as f:
+            f.write(text.getvalue())
+        
+        # tracemalloc（メモリ確保の多い箇所）
+        with open(os.path.join(self.directory, f"memory_{stamp}.txt"), 'w', encoding='utf-8') as f:
+            f.write(f"現在のメモリ使用量: {current / 1024:.0f} KiB, ピーク: {peak / 1024:.0f} KiB\n\n")
+            for stat in memory_snapshot.statistics("lineno")[:50]:
+                f.write(f"{stat}\n")
+        
+        # 計測が有効なら処理ごとの集計も残す
+        if snapshot():
+            with open(os.path.join(self.directory, f"metrics_{stamp}.txt"), 'w', encoding='utf-8') as f:
+                f.write(format_report())
\ No newline at end of file
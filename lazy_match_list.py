@@ -0,0 +1,239 @@
+from collections.abc import MutableSequence
+from itertools import repeat
+from round_shard_reader import ShardRef
+
+class LazyMatchList(MutableSequence):
+    def __init__(self, raw_matches, decoder, round_reader=None, id_reader=None, teams_reader=None):
+        """
+        保存データから必要な分だけ試合を復元する試合リスト
+        
+        通常のリストと同じように扱えるが、各試合は最初にアクセスされた
+        時点で初めて Match オブジェクトに変換される。
+        
+        Args:
+            raw_matches (list): 保存形式の試合データ(dict またはJSONバイト列)のリスト
+            decoder (callable): 試合データを Match に変換する関数
+            round_reader (callable, optional): 試合データを復元せずに
+                ラウンド番号を取り出す関数
+            id_reader (callable, optional): 試合データを復元せずに試合IDを取り出す関数
+            teams_reader (callable, optional): 試合データを復元せずに
+                (ホームチームID, アウェイチームID) を取り出す関数
+        """
+        self._raw = list(raw_matches)
+        self._decoded = [None] * len(self._raw)
+        self._decoder = decoder
+        self._round_reader = round_reader or (lambda raw: raw["round_number"])
+        self._id_reader = id_reader or (lambda raw: raw.get("id"))
+        self._teams_reader = teams_reader or (lambda raw: (raw["home_team_id"], raw["away_team_id"]))
+        self._round_index = None  # ラウンド番号 -> 試合位置のリスト
+    
+    def __getstate__(self):
+        """
+        保存用の状態（session_cache.py で使用）
+        
+        同じシャードの連続した参照は (読み込み元, ラウンド番号, 開始位置, 件数) にまとめる
+        （参照を1件ずつ保存すると、復元に保存ファイルから読み込むより時間がかかるため）。
+        変換関数は保存できないため除き、復元後に bind で設定し直す。
+        """
+        runs = []  # ("refs", 読み込み元, ラウンド番号, 開始位置, 件数) または ("items", 試合データのリスト)
+        for item in self._raw:
+            last = runs[-1] if runs else None
+            if isinstance(item, ShardRef):
+                if (last and last[0] == "refs" and last[1] is item.reader and last[2] == item.round_number
+                        and last[3] + last[4] == item.position):
+                    last[4] += 1
+                else:
+                    runs.append(["refs", item.reader, item.round_number, item.position, 1])
+            elif last and last[0] == "items":
+                last[1].append(item)
+            else:
+                runs.append(["items", [item]])
+        return {"runs": runs, "decoded": self._decoded}
+    
+    def __setstate__(self, state):
+        raw = []
+        for run in state["runs"]:
+            if run[0] == "refs":
+                _, reader, round_number, start, count = run
+                # 件数が多いため ShardRef(...) を1件ずつ呼ばずにまとめて作る
+                raw.extend(map(tuple.__new__, repeat(ShardRef, count),
+                               zip(repeat(reader), repeat(round_number), range(start, start + count))))
+            else:
+                raw.extend(run[1])
+        self._raw = raw
+        self._decoded = state["decoded"]
+        self._decoder = None
+        self._round_reader = lambda raw: raw["round_number"]
+        self._id_reader = lambda raw: raw.get("id")
+        self._teams_reader = lambda raw: (raw["home_team_id"], raw["away_team_id"])
+        self._round_index = None
+    
+    def bind(self, decoder, round_reader=None, id_reader=None, teams_reader=None):
+        """
+        試合データを Match に変換する関数を設定し直す（保存した状態から復元した後に使用）
+        
+        Args:
+            decoder (callable): 試合データを Match に変換する関数
+            round_reader (callable, optional): 試合データを復元せずにラウンド番号を取り出す関数
+            id_reader (callable, optional): 試合データを復元せずに試合IDを取り出す関数
+            teams_reader (callable, optional): 試合データを復元せずに
+                (ホームチームID, アウェイチームID) を取り出す関数
+        """
+        self._decoder = decoder
+        if round_reader is not None:
+            self._round_reader = round_reader
+        if id_reader is not None:
+            self._id_reader = id_reader
+        if teams_reader is not None:
+            self._teams_reader = teams_reader
+    
+    def _materialize(self, index):
+        """
+        指定位置の試合を復元して返す
+        
+        Args:
+            index (int): 試合の位置（正規化済み）
+            
+        Returns:
+            Match: 試合オブジェクト
+        """
+        match = self._decoded[index]
+        if match is None:
+            match = self._decoder(self._raw[index])
+            self._decoded[index] = match
+            # 復元後は元データを保持する必要がない
+            self._raw[index] = None
+        return match
+    
+    def __len__(self):
+        return len(self._decoded)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("試合リストの範囲外です")
+        return self._materialize(index)
+    
+    def __setitem__(self, index, match):
+        if isinstance(index, slice):
+            raise TypeError("スライスへの代入はサポートしていません")
+        if index < 0:
+            index += len(self)
+        self._decoded[index] = match
+        self._raw[index] = None
+        self._round_index = None
+    
+    def __delitem__(self, index):
+        del self._raw[index]
+        del self._decoded[index]
+        self._round_index = None
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._materialize(i)
+    
+    def insert(self, index, match):
+        self._raw.insert(index, None)
+        self._decoded.insert(index, match)
+        self._round_index = None
+    
+    def append(self, match):
+        """
+        試合を末尾に追加（ラウンド索引は差分更新）
+        
+        Args:
+            match (Match): 追加する試合オブジェクト
+        """
+        self._raw.append(None)
+        self._decoded.append(match)
+        if self._round_index is not None:
+            self._round_index.setdefault(match.round_number, []).append(len(self) - 1)
+    
+    def _round_of(self, index):
+        """
+        指定位置の試合のラウンド番号を復元せずに取得
+        """
+        match = self._decoded[index]
+        if match is not None:
+            return match.round_number
+        return self._round_reader(self._raw[index])
+    
+    def match_id(self, index):
+        """
+        指定位置の試合の試合IDを復元せずに取得
+        
+        Args:
+            index (int): 試合の位置
+            
+        Returns:
+            str: 試合ID（古い形式のデータではNone）
+        """
+        match = self._decoded[index]
+        if match is not None:
+            return match.id
+        return self._id_reader(self._raw[index])
+    
+    def match_teams(self, index):
+        """
+        指定位置の試合の対戦チームのIDを復元せずに取得
+        
+        Args:
+            index (int): 試合の位置
+            
+        Returns:
+            tuple: (ホームチームID, アウェイチームID)
+        """
+        match = self._decoded[index]
+        if match is not None:
+            return match.home_team.id, match.away_team.id
+        return self._teams_reader(self._raw[index])
+    
+    def matches_in_round(self, round_number):
+        """
+        指定ラウンドの試合だけを復元して取得
+        
+        Args:
+            round_number (int): ラウンド番号
+            
+        Returns:
+            list: 該当ラウンドの Match オブジェクトのリスト
+        """
+        if self._round_index is None:
+            self._round_index = {}
+            for i in range(len(self)):
+                self._round_index.setdefault(self._round_of(i), []).append(i)
+        return [self._materialize(i) for i in self._round_index.get(round_number, [])]
+    
+    def iter_raw(self):
+        """
+        保存用に各試合を列挙（未復元の試合は元データのまま返す）
+        
+        Yields:
+            tuple: (元データ dict または None, 復元済み Match または None)
+        """
+        for raw, match in zip(self._raw, self._decoded):
+            yield raw, match
+    
+    def iter_transient(self):
+        """
+        全試合を列挙（未復元の試合は一時的に復元するだけで、リストには保持しない）
+        
+        書き出しなどで全試合を1回たどるだけの場合に、復元した試合でメモリが増えないようにする。
+        
+        Yields:
+            Match: 試合オブジェクト
+        """
+        for raw, match in zip(self._raw, self._decoded):
+            yield match if match is not None else self._decoder(raw)
+    
+    def materialized_count(self):
+        """
+        復元済みの試合数を取得
+        
+        Returns:
+            int: 復元済みの試合数
+        """
+        return sum(1 for match in self._decoded if match is not None)
\ No newline at end of file
@@ -1,5 +1,11 @@
-from operator import itemgetter
+import re
+import threading
+from datetime import timedelta
+from operator import attrgetter
 from match_class import Match
+from membership_history import MembershipHistory
+from scoring_rules import ScoringRules
+from team_class import hold_locks, lock_teams
 
 class League:
     def __init__(self, name):
@@ -13,6 +19,111 @@ class League:
         self.teams = {}  # チームID -> Teamオブジェクト
         self.matches = []  # 試合リスト
         self.current_round = 1
+        self.version = 0  # 読み込み・保存時の保存ファイルのバージョン
+        self.id_counters = {"team": 0, "player": 0, "match": 0}  # IDの採番に使った連番（保存ファイルにも記録）
+        self.byes = {}  # ラウンド番号 -> 不戦勝（バイ）のチームID
+        self.unawarded_byes = set()  # バイで不戦勝（勝ち1つ）を与えなかったラウンド番号（保存ファイルにも記録）
+        self.min_rest_hours = 0  # 同じチームの試合の間に必要な間隔（時間）。同じ日の試合は常に重複とする
+        self.scoring_rules = ScoringRules()  # 勝点の計算方法・順位の決め方（保存ファイルにも記録）
+        self._rules_version = 0  # 勝点の計算方法を変更した回数（順位表のキャッシュの判定に使う）
+        self._standings_cache = None  # (キャッシュの判定値, 順位表)
+        self._race_cache = None  # (キャッシュの判定値, 優勝の可能性の判定結果)
+        self._power_ranking = None  # 強さの計算（前回の結果を次の計算の初期値にする）
+        self._power_key = None  # 強さを計算したときのキャッシュの判定値
+        self._team_index = None  # チーム名の検索用索引（最初の検索時に作成）
+        self._player_index = None  # 選手名の検索用索引（最初の検索時に作成）
+        self._players_by_id = {}  # 選手ID -> Playerオブジェクト（全チーム共通のIDの索引）
+        self.membership = MembershipHistory(self._players_by_id)  # 移籍した選手の所属履歴（保存ファイルにも記録）
+        self._query_index = None  # 選手・試合の条件検索用の索引（最初の検索時に作成）
+        self._lock = threading.RLock()  # 試合の追加・ラウンドの変更の排他制御（結果の入力はチームごとにロック）
+        self._team_locks = None  # 全チームのロック（チームIDの順。チームの追加時に作り直す）
+        self._match_positions = None  # 試合ID -> 試合リスト内の位置（最初の検索時に作成）
+        self._fixtures = {}  # ラウンド番号 -> {(ホームID, アウェイID): Match}（最初の確認時に作成）
+        self._all_fixtures = False  # 全ラウンドの組み合わせの索引を作成済みか
+        self._indexed_matches = None  # 試合の索引を作成した試合リスト（読み込みで置き換わったら作り直す）
+        self._indexed_count = 0  # 試合の索引に加えた試合数
+    
+    def __getstate__(self):
+        """
+        保存用の状態（session_cache.py で使用）
+        
+        ロックは保存できないため除く。集計結果のキャッシュ・検索用の索引は
+        Match.score_version がプロセスごとに採番し直されるため保存せず、次に使うときに作り直す。
+        """
+        state = self.__dict__.copy()
+        for key in ("_standings_cache", "_race_cache", "_power_ranking", "_power_key", "_team_index",
+                    "_player_index", "_query_index", "_lock", "_team_locks", "_match_positions",
+                    "_indexed_matches"):
+            state[key] = None
+        state["_fixtures"] = {}
+        state["_all_fixtures"] = False
+        state["_indexed_count"] = 0
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def allocate_team_id(self, team_name=""):
+        """
+        他のチームと重ならないチームIDを採番
+        
+        Args:
+            team_name (str): チーム名（アルファベット部分をIDに使う）
+            
+        Returns:
+            str: チームID
+        """
+        return self._allocate_id("team", team_name, self.teams)
+    
+    def allocate_player_id(self, player_name=""):
+        """
+        全チームの選手と重ならない選手IDを採番
+        
+        Args:
+            player_name (str): 選手名（アルファベット部分をIDに使う）
+            
+        Returns:
+            str: 選手ID
+        """
+        return self._allocate_id("player", player_name, self._players_by_id)
+    
+    def allocate_match_id(self):
+        """
+        試合IDを採番（連番は減らさないため、同じIDを2度使わない）
+        
+        Returns:
+            str: 試合ID（例: "m12"）
+        """
+        with self._lock:
+            self.id_counters["match"] = self.id_counters.get("match", 0) + 1
+            return f"m{self.id_counters['match']}"
+    
+    def _allocate_id(self, kind, name, used):
+        """
+        IDを採番
+        
+        名前のアルファベット部分が未使用ならそのまま使い、使用済み・アルファベットが
+        ない場合は末尾に連番を付ける。連番は減らさないため、削除されたIDも再利用しない。
+        
+        Args:
+            kind (str): "team" または "player"（連番の種類・アルファベットがない場合の接頭辞）
+            name (str): 名前
+            used (dict): 使用中のID -> オブジェクト
+            
+        Returns:
+            str: 未使用のID
+        """
+        base = re.sub(r'[^a-zA-Z]', '', name).lower()
+        if base and base not in used:
+            return base
+        
+        prefix = base or kind
+        while True:
+            self.id_counters[kind] += 1
+            candidate = f"{prefix}{self.id_counters[kind]}"
+            if candidate not in used:
+                return candidate
     
     def add_team(self, team):
         """
@@ -21,7 +132,147 @@ class League:
         Args:
             team (Team): チームオブジェクト
         """
+        replaced = self.teams.get(team.id)
+        if replaced is not None:
+            for player in replaced.players.values():
+                if self._players_by_id.get(player.id) is player:
+                    del self._players_by_id[player.id]
+        for player in team.players.values():
+            self._players_by_id[player.id] = player
+        if self._team_index is not None:
+            if replaced is not None:
+                self._team_index.remove(replaced)
+                for player in replaced.players.values():
+                    self._player_index.remove(player)
+            self._team_index.add(team.name, team)
+            for player in team.players.values():
+                self._player_index.add(player.name, player)
+        if self._query_index is not None:
+            if replaced is not None:
+                for player in replaced.players.values():
+                    self._query_index.remove_player(player)
+            for player in team.players.values():
+                self._query_index.add_player(player)
+        team.scoring_rules = self.scoring_rules
+        team.membership = self.membership
         self.teams[team.id] = team
+        self._team_locks = None
+        self._standings_cache = None
+    
+    def add_player(self, team_id, player):
+        """
+        チームに選手を追加（選手IDの索引・名前の検索用索引も更新する）
+        
+        Args:
+            team_id (str): チームID
+            player (Player): 選手オブジェクト
+            
+        Returns:
+            bool: 追加できればTrue、チームが存在しない場合はFalse
+        """
+        team = self.teams.get(team_id)
+        if team is None:
+            return False
+        self._players_by_id[player.id] = player
+        replaced = team.players.get(player.id)
+        if self._player_index is not None:
+            if replaced is not None:
+                self._player_index.remove(replaced)
+            self._player_index.add(player.name, player)
+        if self._query_index is not None:
+            if replaced is not None:
+                self._query_index.remove_player(replaced)
+            self._query_index.add_player(player)
+        team.add_player(player)
+        return True
+    
+    def transfer_player(self, player_id, team_id, from_round=None, allow_past=False):
+        """
+        選手を別のチームに移籍させる
+        
+        移籍先の所属は from_round から有効になり、それより前のラウンドの試合の成績は
+        移籍前のチームでの成績として扱う。選手の一覧（Team.players）は移籍先に移る。
+        
+        Args:
+            player_id (str): 選手ID
+            team_id (str): 移籍先のチームID
+            from_round (int, optional): 移籍先の所属が有効になるラウンド（省略時は現在のラウンド）
+            allow_past (bool): 現在のラウンドより前からの移籍も記録するか（他の端末での移籍の取り込み用）
+            
+        Returns:
+            bool: 移籍できればTrue、選手・チームが存在しない場合、同じチームへの移籍の場合、
+                前回の移籍と同じかそれより前のラウンド（または現在より前のラウンド）の場合はFalse
+        """
+        player = self.get_player(player_id)
+        new_team = self.get_team(team_id)
+        if player is None or new_team is None or player.team_id == team_id:
+            return False
+        
+        with self._lock:
+            if from_round is None:
+                from_round = self.current_round
+            if from_round < self.current_round and not allow_past:
+                return False
+            old_team = self.teams[player.team_id]
+            # 成績の入力と重ならないよう両チームのロックを取得してから移す
+            with lock_teams((old_team, new_team)):
+                if not self.membership.transfer(player_id, old_team.id, team_id, from_round):
+                    return False
+                del old_team.players[player_id]
+                new_team.add_player(player)
+        return True
+    
+    def squad(self, team_id, round_number=None):
+        """
+        指定ラウンドの時点でチームに所属している選手を取得
+        
+        移籍していない選手は現在の選手一覧から、移籍した選手はチームごとの
+        在籍期間の索引から取り出す（試合は調べない）。
+        
+        Args:
+            team_id (str): チームID
+            round_number (int, optional): ラウンド番号（省略時は現在のラウンド）
+            
+        Returns:
+            list: Player のリスト
+        """
+        team = self.get_team(team_id)
+        if team is None:
+            return []
+        if round_number is None:
+            round_number = self.current_round
+        membership = self.membership
+        squad = [player for player in team.players.values() if not membership.has_history(player.id)]
+        squad.extend(self._players_by_id[player_id] for player_id in membership.squad_ids(team_id, round_number))
+        return squad
+    
+    def team_player_stats(self, team_id):
+        """
+        チームの選手ごとの、そのチームに所属していたときの成績
+        
+        移籍した選手は移籍前・移籍後のチームでの成績を分けて集計している。
+        移籍していない選手は通算成績がそのチームでの成績になる。
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            list: [(Player, 試合数, 勝利数, 敗北数, 引き分け数, 現在も所属しているか), ...]
+                （現在の選手、移籍した選手の順）
+        """
+        team = self.get_team(team_id)
+        if team is None:
+            return []
+        membership = self.membership
+        rows = [
+            (player, player.matches_played, player.wins, player.losses, player.draws, True)
+            for player in team.players.values() if not membership.has_history(player.id)
+        ]
+        for player_id, stats in membership.team_stats(team_id).items():
+            player = self._players_by_id[player_id]
+            rows.append((player, *stats, player.team_id == team_id))
+        rows.sort(key=lambda row: not row[5])
+        return rows
     
     def get_team(self, team_id):
         """
@@ -35,31 +286,162 @@ class League:
         """
         return self.teams.get(team_id)
     
+    def get_player(self, player_id):
+        """
+        選手IDから選手を取得（全チームから探す）
+        
+        Args:
+            player_id (str): 選手ID
+            
+        Returns:
+            Player: 選手オブジェクト、存在しない場合はNone
+        """
+        return self._players_by_id.get(player_id)
+    
     def get_team_by_name(self, team_name):
         """
         チーム名からチームを取得
         
+        全角・半角や大文字小文字の違いは区別しない（表記まで同じチームを優先する）。
+        
         Args:
             team_name (str): チーム名
             
         Returns:
             Team: チームオブジェクト、存在しない場合はNone
         """
-        for team in self.teams.values():
+        team_index, _ = self._name_indexes()
+        teams = team_index.exact(team_name)
+        for team in teams:
             if team.name == team_name:
                 return team
-        return None
+        return teams[0] if teams else None
+    
+    def search_teams(self, query, limit=10):
+        """
+        チーム名の一部・表記ゆれからチームの候補を検索
+        
+        Args:
+            query (str): 入力されたチーム名
+            limit (int): 返す候補の数
+            
+        Returns:
+            list: [(Team, 一致度), ...] の形式で一致度の降順
+        """
+        team_index, _ = self._name_indexes()
+        return team_index.search(query, limit)
+    
+    def search_players(self, query, limit=10):
+        """
+        選手名の一部・表記ゆれから選手の候補を検索
+        
+        Args:
+            query (str): 入力された選手名
+            limit (int): 返す候補の数
+            
+        Returns:
+            list: [(Player, 一致度), ...] の形式で一致度の降順
+        """
+        _, player_index = self._name_indexes()
+        return player_index.search(query, limit)
+    
+    def query_players(self, position=None, min_age=None, max_age=None, team_id=None, min_games=0,
+                      sort="win_rate", descending=True, limit=None):
+        """
+        条件に合う選手を検索（例: 20歳未満のGKで10試合以上、勝率順）
+        
+        ポジション・年齢・所属チームの索引のうち候補が最も少ないものから絞り込む。
+        
+        Args:
+            position (str, optional): ポジション
+            min_age (int, optional): 年齢の下限（この年齢を含む）
+            max_age (int, optional): 年齢の上限（この年齢を含む）
+            team_id (str, optional): 所属チームID
+            min_games (int): 最低試合数
+            sort (str): 並べ替えの指標（"win_rate", "matches", "wins", "age", "name"）
+            descending (bool): 降順に並べるか
+            limit (int, optional): 返す選手数の上限
+            
+        Returns:
+            list: 条件に合う Player のリスト
+        """
+        return self._get_query_index().players(
+            position, min_age, max_age, team_id, min_games, sort, descending, limit
+        )
+    
+    def query_matches(self, team_id=None, round_from=None, round_to=None, date_from=None, date_to=None,
+                      finished=None, sort="round", descending=False, limit=None):
+        """
+        条件に合う試合を検索（例: チームXの5~9ラウンドの試合）
+        
+        チーム・ラウンド・試合日の索引のうち候補が最も少ないものから絞り込む。
+        
+        Args:
+            team_id (str, optional): ホーム・アウェイのどちらかがこのチームの試合
+            round_from (int, optional): ラウンドの下限（このラウンドを含む）
+            round_to (int, optional): ラウンドの上限（このラウンドを含む）
+            date_from (datetime, optional): 試合日時の下限（この日時を含む）
+            date_to (datetime, optional): 試合日時の上限（この日時を含む）
+            finished (bool, optional): True なら終了した試合、False なら未終了の試合のみ
+            sort (str): 並べ替えの指標（"round", "date"）
+            descending (bool): 降順に並べるか
+            limit (int, optional): 返す試合数の上限
+            
+        Returns:
+            list: 条件に合う Match のリスト
+        """
+        return self._get_query_index().matches(
+            team_id, round_from, round_to, date_from, date_to, finished, sort, descending, limit
+        )
+    
+    def _get_query_index(self):
+        """
+        条件検索用の索引を取得（未作成なら作成）
+        
+        Returns:
+            QueryIndex: 条件検索用の索引
+        """
+        if self._query_index is None:
+            from query_index import QueryIndex
+            self._query_index = QueryIndex(self)
+        return self._query_index
     
-    def create_match(self, home_team_id, away_team_id):
+    def _name_indexes(self):
+        """
+        チーム名・選手名の検索用索引を取得（未作成なら全チーム・全選手から作成）
+        
+        Returns:
+            tuple: (チーム名の NameIndex, 選手名の NameIndex)
+        """
+        if self._team_index is None:
+            from name_index import NameIndex
+            
+            team_index = NameIndex()
+            player_index = NameIndex()
+            for team in self.teams.values():
+                team_index.add(team.name, team)
+                for player in team.players.values():
+                    player_index.add(player.name, player)
+            self._team_index = team_index
+            self._player_index = player_index
+        return self._team_index, self._player_index
+    
+    def create_match(self, home_team_id, away_team_id, date=None, allow_conflicts=False):
         """
         試合を作成
         
+        現在のラウンドに同じ組み合わせ（ホーム・アウェイ）の試合がある場合は作成しない。
+        日時を指定した場合は、どちらかのチームの前後の試合と日程が重複していないかも調べる。
+        
         Args:
             home_team_id (str): ホームチームID
             away_team_id (str): アウェイチームID
+            date (datetime, optional): 試合日時（省略時は現在日時で、日程の重複は調べない）
+            allow_conflicts (bool): 日程が重複していても作成するか
             
         Returns:
-            Match: 作成された試合オブジェクト、チームが存在しない場合はNone
+            Match: 作成された試合オブジェクト、チームが存在しない場合や
+                同じ組み合わせの試合・日程の重複がある場合はNone
         """
         home_team = self.get_team(home_team_id)
         away_team = self.get_team(away_team_id)
@@ -67,62 +449,470 @@ class League:
         if not home_team or not away_team:
             return None
         
-        match = Match(home_team, away_team, round_number=self.current_round)
-        self.matches.append(match)
+        # 確認から追加までの間に他のスレッドが試合を追加しないようにする
+        with self._lock:
+            if self.find_fixture(home_team_id, away_team_id, self.current_round) is not None:
+                return None
+            if date is not None and not allow_conflicts \
+                    and self.find_schedule_conflicts(home_team_id, away_team_id, date):
+                return None
+            match = Match(home_team, away_team, date=date, round_number=self.current_round)
+            return self.add_match(match)
+    
+    def add_match(self, match):
+        """
+        作成済みの試合をリーグに追加（試合IDがなければ採番し、試合の索引も更新する）
+        
+        同じ組み合わせの確認はしない（保存済みの試合の取り込みなどで使用）。
+        
+        Args:
+            match (Match): 試合オブジェクト
+            
+        Returns:
+            Match: 追加した試合オブジェクト
+        """
+        with self._lock:
+            if match.id is None:
+                match.id = self.allocate_match_id()
+            self.matches.append(match)
+            self._sync_match_index()
         return match
     
-    def next_round(self):
+    def get_match(self, match_id):
+        """
+        試合IDから試合を取得（O(1)）
+        
+        最初の呼び出しで全試合のIDの索引を作る。遅延読み込みの試合は復元せずに
+        保存データからIDだけを読み取り、見つかった試合だけを復元する。
+        
+        Args:
+            match_id (str): 試合ID
+            
+        Returns:
+            Match: 試合オブジェクト、存在しない場合はNone
+        """
+        with self._lock:
+            self._sync_match_index()
+            if self._match_positions is None:
+                matches = self.matches
+                if hasattr(matches, "match_id"):
+                    ids = (matches.match_id(i) for i in range(len(matches)))
+                else:
+                    ids = (match.id for match in matches)
+                positions = {}
+                for position, key in enumerate(ids):
+                    positions.setdefault(key, position)
+                self._match_positions = positions
+            position = self._match_positions.get(match_id)
+            return self.matches[position] if position is not None else None
+    
+    def find_fixture(self, home_team_id, away_team_id, round_number):
+        """
+        同じラウンド・組み合わせの試合を取得（重複した試合の確認用、O(1)）
+        
+        遅延読み込みの試合リストではラウンドごとに最初の確認で、そのラウンドの試合だけを
+        復元して索引を作る。通常のリストでは最初の確認で全ラウンドの索引をまとめて作る。
+        
+        Args:
+            home_team_id (str): ホームチームID
+            away_team_id (str): アウェイチームID
+            round_number (int): ラウンド番号
+            
+        Returns:
+            Match: 該当する試合、ない場合はNone
+        """
+        with self._lock:
+            self._sync_match_index()
+            fixtures = self._fixtures.get(round_number)
+            if fixtures is None:
+                if hasattr(self.matches, "matches_in_round"):
+                    fixtures = self._fixtures[round_number] = {}
+                    for match in self.matches.matches_in_round(round_number):
+                        fixtures.setdefault((match.home_team.id, match.away_team.id), match)
+                elif not self._all_fixtures:
+                    self._all_fixtures = True
+                    for match in self.matches:
+                        self._index_fixture(match)
+                    fixtures = self._fixtures.get(round_number)
+            return fixtures.get((home_team_id, away_team_id)) if fixtures else None
+    
+    def _index_fixture(self, match):
+        """
+        試合を組み合わせの索引に加える（同じ組み合わせが複数ある古いデータでは最初の試合を残す）
+        
+        Args:
+            match (Match): 試合オブジェクト
+        """
+        fixtures = self._fixtures.get(match.round_number)
+        if fixtures is None:
+            if not self._all_fixtures:
+                return
+            fixtures = self._fixtures[match.round_number] = {}
+        fixtures.setdefault((match.home_team.id, match.away_team.id), match)
+    
+    def set_match_id(self, match, match_id):
+        """
+        試合IDを付け替える（他の端末で保存された試合の取り込み用）
+        
+        同じIDの別の試合がある場合（両方の端末で同時に採番した場合）は、
+        その試合に新しいIDを採番する。
+        
+        Args:
+            match (Match): IDを付け替える試合
+            match_id (str): 新しい試合ID
+        """
+        with self._lock:
+            other = self.get_match(match_id)
+            if other is match:
+                return
+            positions = self._match_positions
+            position = positions.pop(match.id, None)
+            if other is not None:
+                other.id = self.allocate_match_id()
+                positions[other.id] = positions.pop(match_id)
+            match.id = match_id
+            if position is not None:
+                positions[match_id] = position
+    
+    def _sync_match_index(self):
+        """
+        前回以降に追加された試合を試合IDの索引・組み合わせの索引に加える
+        
+        試合は追加のみのため、追加された分だけを索引に加える。
+        """
+        matches = self.matches
+        if self._indexed_matches is not matches:
+            # 読み込みなどで試合リストが置き換わった場合は作り直す
+            self._indexed_matches = matches
+            self._indexed_count = len(matches)
+            self._match_positions = None
+            self._fixtures = {}
+            self._all_fixtures = False
+            return
+        
+        for position in range(self._indexed_count, len(matches)):
+            match = matches[position]
+            if self._match_positions is not None:
+                self._match_positions.setdefault(match.id, position)
+            self._index_fixture(match)
+        self._indexed_count = len(matches)
+    
+    def find_schedule_conflicts(self, home_team_id, away_team_id, date):
+        """
+        新しい試合の日時が、どちらかのチームの前後の試合と重複していないかを調べる
+        
+        同じ日の試合、または間隔が min_rest_hours 未満の試合を重複とする。
+        チームごとの日時順の索引で前後の試合だけを調べる。
+        
+        Args:
+            home_team_id (str): ホームチームID
+            away_team_id (str): アウェイチームID
+            date (datetime): 新しい試合の日時
+            
+        Returns:
+            list: [(チームID, 重複している Match), ...]
+        """
+        return self._get_query_index().conflicts_for(
+            dict.fromkeys((home_team_id, away_team_id)), date, timedelta(hours=self.min_rest_hours)
+        )
+    
+    def audit_schedule(self):
+        """
+        シーズン全体の日程の重複を調べる（試合を日時の順に1回だけたどる）
+        
+        Returns:
+            list: [(チームID, 前の Match, 後の Match), ...] の形式で日時の順
+        """
+        return self._get_query_index().audit(timedelta(hours=self.min_rest_hours))
+    
+    def matches_between(self, start=None, end=None):
+        """
+        期間内の試合を日時の順に取得（例: 今週末の試合）
+        
+        Args:
+            start (datetime, optional): 期間の開始（この日時を含む）
+            end (datetime, optional): 期間の終了（この日時を含む）
+            
+        Returns:
+            list: 期間内の Match のリスト
+        """
+        return self._get_query_index().matches_between(start, end)
+    
+    def create_matches(self, pairs):
+        """
+        複数の試合を現在のラウンドにまとめて作成
+        
+        Args:
+            pairs (list): [(ホームチーム, アウェイチーム), ...] のリスト
+            
+        Returns:
+            list: 作成された試合オブジェクトのリスト
+        """
+        with self._lock:
+            round_number = self.current_round
+            matches = [
+                self.add_match(Match(home_team, away_team, round_number=round_number))
+                for home_team, away_team in pairs
+            ]
+        return matches
+    
+    def create_swiss_round(self, award_bye=True):
+        """
+        スイス式で次のラウンドの組み合わせを作成
+        
+        現在のラウンドに試合がすでにある場合は次のラウンドに進んでから組む。
+        
+        Args:
+            award_bye (bool): バイのチームに不戦勝（勝ち1つ、得失点なし）を与えるか
+            
+        Returns:
+            tuple: (作成された試合のリスト, バイのチーム または None)
+        """
+        from swiss_pairing import SwissPairing
+        
+        with self._lock:
+            if self.matches_in_round(self.current_round):
+                self.next_round()
+            
+            pairs, bye = SwissPairing(self).pair()
+            matches = self.create_matches(pairs)
+            
+            if bye is not None:
+                self.record_bye(self.current_round, bye, award_bye)
+        
+        return matches, bye
+    
+    def record_bye(self, round_number, team, award=True):
+        """
+        ラウンドの不戦勝（バイ）を記録
+        
+        Args:
+            round_number (int): ラウンド番号
+            team (Team): バイのチーム
+            award (bool): 不戦勝（勝ち1つ、得失点なし）をチームの成績に加えるか
+        """
+        with self._lock:
+            self.byes[round_number] = team.id
+            if award:
+                with team.lock:
+                    team.add_match_result(0, 0, '○')
+                self._standings_cache = None
+            else:
+                self.unawarded_byes.add(round_number)
+    
+    def create_tournament(self, name, elimination="single", ratings=None, limit=None):
+        """
+        リーグの成績をシードにしたトーナメントを作成
+        
+        トーナメントの成績はリーグと別に集計するため、チーム・選手は
+        リーグのものを写したオブジェクトを使う。
+        
+        Args:
+            name (str): トーナメント名
+            elimination (str): "single" または "double"
+            ratings (dict, optional): チームID -> レーティング。指定した場合は
+                レーティングの高い順、省略時は順位表の順にシードする
+            limit (int, optional): 出場チーム数（上位から）
+            
+        Returns:
+            Tournament: 作成したトーナメント
+        """
+        from player_class import Player
+        from team_class import Team
+        from tournament_class import Tournament
+        
+        if ratings is not None:
+            seeded = sorted(self.teams.values(), key=lambda team: ratings.get(team.id, float("-inf")), reverse=True)
+        else:
+            seeded = [team for team, _, _, _ in self.get_standings()]
+        if limit is not None:
+            seeded = seeded[:limit]
+        
+        tournament = Tournament(name, elimination)
+        for source in seeded:
+            team = Team(source.id, source.name)
+            for player in source.players.values():
+                team.add_player(Player(player.id, player.name, team.id, player.position, player.age))
+            tournament.add_team(team)
+        tournament.start([team.id for team in seeded])
+        return tournament
+    
+    def matches_in_round(self, round_number):
+        """
+        指定ラウンドの試合を取得
+        
+        Args:
+            round_number (int): ラウンド番号
+            
+        Returns:
+            list: 該当ラウンドの試合オブジェクトのリスト
+        """
+        if hasattr(self.matches, "matches_in_round"):
+            # 遅延読み込み時は該当ラウンドの試合だけを復元する
+            return self.matches.matches_in_round(round_number)
+        return [m for m in self.matches if m.round_number == round_number]
+    
+    def next_round(self, expected_round=None):
         """
         次のラウンドに進む
+        
+        Args:
+            expected_round (int, optional): 進める前のラウンド。指定した場合、すでに
+                他のスレッドがラウンドを進めていれば何もしない（同じ操作の重複で2つ進まない）
+                
+        Returns:
+            bool: ラウンドを進めたらTrue
         """
-        self.current_round += 1
+        with self._lock:
+            if expected_round is not None and self.current_round != expected_round:
+                return False
+            self.current_round += 1
+        return True
+    
+    def _lock_all_teams(self):
+        """
+        全チームのロックを取得する（順位表などを同じ時点の値で集計するため）
+        
+        Returns:
+            contextmanager: with 文で使うロックの取得
+        """
+        locks = self._team_locks
+        if locks is None or len(locks) != len(self.teams):
+            locks = self._team_locks = [
+                team.lock for team in sorted(self.teams.values(), key=attrgetter("id"))
+            ]
+        return hold_locks(locks)
+    
+    def set_scoring_rules(self, rules):
+        """
+        勝点の計算方法・順位の決め方を変更
+        
+        シーズン途中に変更した場合も、次に順位表を取得したときに
+        全チームの勝点・順位を1回の走査で計算し直す。
+        
+        Args:
+            rules (ScoringRules): 新しい設定
+        """
+        with self._lock:
+            self.scoring_rules = rules
+            for team in self.teams.values():
+                team.scoring_rules = rules
+            self._rules_version += 1
+            self._standings_cache = None
     
     def get_standings(self):
         """
         リーグ順位表を取得
         
+        勝点・順位はリーグの設定（scoring_rules）で全チームまとめて計算し、
+        次に結果が入力されるか設定が変わるまで計算結果を使い回す。
+        他のスレッドが結果を入力中でも、全チームのロックを取得してから集計するため、
+        1試合の結果が片方のチームにだけ反映された状態は見えない。
+        
         Returns:
             list: [(Team, 勝点, 勝率, 得失点差), ...] の形式でソート済み
         """
-        standings = []
-        for team in self.teams.values():
-            standings.append((
-                team,
-                team.points(),
-                team.win_rate(),
-                team.goal_difference()
-            ))
-        
-        # 勝点 > 勝率 > 得失点差 の順でソート
-        return sorted(
-            standings,
-            key=itemgetter(1, 2, 3),
-            reverse=True
-        )
+        # 判定値は集計より先に読む（集計中に入力された結果は次の呼び出しで反映される）
+        key = (Match.score_version, len(self.teams), self._rules_version)
+        cache = self._standings_cache
+        if cache is None or cache[0] != key:
+            with self._lock_all_teams():
+                standings = self.scoring_rules.standings(self.teams.values())
+            cache = self._standings_cache = (key, standings)
+        return list(cache[1])
     
-    def get_player_rankings(self):
+    def snapshot_team_stats(self):
         """
-        選手の勝率ランキングを取得
+        全チームの成績を同じ時点の値として取得
+        
+        他のスレッドが結果を入力中でも、全チームのロックを取得してから写すため、
+        1試合の結果が片方のチームにだけ反映された状態は含まれない。
         
         Returns:
-            list: [(Player, 勝率, 試合数), ...] の形式でソート済み
+            dict: チームID -> (試合数, 勝, 分, 負, 得点, 失点)
         """
-        all_players = []
-        for team in self.teams.values():
-            for player in team.players.values():
-                all_players.append((
-                    player,
-                    player.win_rate(),
-                    player.matches_played
-                ))
-        
-        # 1試合以上出場している選手のみ、勝率降順でソート
-        qualified_players = [p for p in all_players if p[2] > 0]
-        return sorted(
-            qualified_players,
-            key=itemgetter(1, 2),
-            reverse=True
-        )
+        with self._lock_all_teams():
+            return {
+                team.id: (team.matches_played, team.wins, team.draws, team.losses,
+                          team.goals_for, team.goals_against)
+                for team in self.teams.values()
+            }
+    
+    def get_player_rankings(self, metric="win_rate", min_games=1):
+        """
+        選手のランキングを取得
+        
+        Args:
+            metric (str): 指標名（"win_rate", "half_draw", "wilson", "bayes"）
+            min_games (int): ランキングに含める最低試合数
+            
+        Returns:
+            list: [(Player, 指標の値, 試合数), ...] の形式でソート済み
+        """
+        players, scores = self.rank_players(metric, min_games)
+        return [(player, score, player.matches_played) for player, score in zip(players, scores)]
+    
+    def rank_players(self, metric="win_rate", min_games=1):
+        """
+        選手を指標の降順（同じ値なら試合数の多い順）に並べる
+        
+        選手ごとのタプルを作らずに配列でまとめて計算するため、大人数でも速い。
+        
+        Args:
+            metric (str): 指標名（"win_rate", "half_draw", "wilson", "bayes"）
+            min_games (int): ランキングに含める最低試合数
+            
+        Returns:
+            tuple: (並べ替えた Player のリスト, 対応する指標の値のリスト)
+        """
+        from player_ranking import PlayerRankingEngine
+        
+        with self._lock_all_teams():
+            players = [player for team in self.teams.values() for player in team.players.values()]
+            return PlayerRankingEngine(metric, min_games).rank(players)
+    
+    def get_race_status(self):
+        """
+        残り試合から各チームの優勝（1位）の可能性を判定
+        
+        結果は次にスコアが入力されるか、試合・チームの追加・勝点の計算方法の変更までキャッシュする。
+        
+        Returns:
+            dict: チームID -> "clinched"（1位確定）, "eliminated"（可能性なし）, "alive"（可能性あり）
+        """
+        key = (Match.score_version, len(self.matches), len(self.teams), self._rules_version)
+        if self._race_cache is None or self._race_cache[0] != key:
+            from race_analysis import RaceAnalysis
+            self._race_cache = (key, RaceAnalysis(self).analyze())
+        return self._race_cache[1]
+    
+    def get_power_rankings(self):
+        """
+        対戦相手の強さを考慮したパワーランキングを取得
+        
+        結果が追加された場合は前回の強さを初期値にして計算し直す。
+        
+        Returns:
+            list: [(Team, 強さ, レーティング), ...] の形式で強さの降順
+        """
+        from power_ranking import PowerRanking
+        
+        if self._power_ranking is None:
+            self._power_ranking = PowerRanking()
+        key = (Match.score_version, len(self.matches), len(self.teams))
+        if self._power_key != key:
+            self._power_ranking.fit(self)
+            self._power_key = key
+        return self._power_ranking.rankings(self)
+    
+    def get_power_ratings(self):
+        """
+        パワーランキングのレーティングを取得（トーナメントのシードなどに使う）
+        
+        Returns:
+            dict: チームID -> レーティング
+        """
+        return {team.id: rating for team, _, rating in self.get_power_rankings()}
     
     def __str__(self):
         """
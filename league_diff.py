@@ -0,0 +1,557 @@
+import argparse
+import json
+import os
+import tempfile
+from collections import Counter, namedtuple
+from league_storage import MANIFEST_FILE, MATCHES_MARKER, ROSTER_FILE, ROUNDS_DIR
+from storage_codec import detect_codec, open_for_read
+
+# 1回にメモリへ読み込む試合データの大きさの目安（バイト）。
+# 試合リストがこれより大きい場合はラウンド番号で分割した一時ファイルを経由して比較する
+PARTITION_BYTES = 16 * 1024 * 1024
+
+# 圧縮ファイルの展開後の大きさの見積もり（圧縮後の何倍か）
+COMPRESSION_RATIO = 8
+
+# リーグ全体の値として比較する項目
+HEADER_FIELDS = ("name", "version", "current_round", "id_counters", "min_rest_hours", "scoring_rules", "byes", "memberships")
+
+# チーム・選手の成績として比較する項目
+TEAM_STATS = ("matches_played", "wins", "draws", "losses", "goals_for", "goals_against")
+PLAYER_STATS = ("matches_played", "wins", "draws", "losses")
+
+# 試合の変更
+#   kind: "added"（追加）, "removed"（削除）, "changed"（結果・日時・選手成績の変更）
+#   old, new: 保存形式の試合データ（追加・削除の場合は片方がNone）
+MatchChange = namedtuple(
+    "MatchChange", ["kind", "round_number", "home_team_id", "away_team_id", "old", "new"]
+)
+
+def _round_number_of(line):
+    """
+    試合データを解析せずにラウンド番号だけを取り出す
+    
+    Args:
+        line (bytes): 保存形式の試合データ（1行）
+        
+    Returns:
+        int: ラウンド番号（未設定の場合はNone）
+    """
+    key = b'"round_number":'
+    start = line.find(key)
+    if start < 0:
+        return json.loads(line)["round_number"]
+    start += len(key)
+    value = line[start:line.find(b",", start)]
+    return None if value == b"null" else int(value)
+
+class LeagueSource:
+    def __init__(self, path):
+        """
+        比較する保存済みリーグ（読み取り専用）
+        
+        ディレクトリ形式（manifest.json のあるディレクトリ）と
+        1ファイル形式（.json、圧縮も可）のどちらも扱う。
+        試合はファイルを先頭から読みながら1行ずつ取り出し、全体をメモリに保持しない。
+        
+        Args:
+            path (str): リーグのディレクトリまたはJSONファイルのパス
+        """
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.isdir(path) and os.path.exists(manifest_path):
+            with open(manifest_path, 'rb') as f:
+                self.manifest = json.loads(f.read())
+        elif os.path.isfile(path):
+            self.manifest = None
+        else:
+            raise FileNotFoundError(f"リーグが見つかりません: {path}")
+    
+    @property
+    def sharded(self):
+        """
+        ディレクトリ形式か
+        """
+        return self.manifest is not None
+    
+    def read_header(self):
+        """
+        試合以外のリーグ情報（チーム・選手を含む）を読み込む
+        
+        Returns:
+            dict: リーグ情報（"teams" にチーム・選手の保存形式のリスト）
+        """
+        if self.sharded:
+            roster_file = self.manifest.get("roster_file", ROSTER_FILE)
+            with open_for_read(os.path.join(self.path, roster_file)) as f:
+                roster = json.loads(f.read())
+            header = {field: self.manifest.get(field) for field in HEADER_FIELDS}
+            header["teams"] = roster["teams"]
+            return header
+        
+        lines = []
+        with open_for_read(self.path) as f:
+            for line in f:
+                if line.rstrip(b"\r\n") == MATCHES_MARKER.strip("\n").encode("utf-8"):
+                    header = json.loads(b"".join(lines).rstrip().rstrip(b",") + b"\n}")
+                    if "teams" in header:
+                        return header
+                    break
+                lines.append(line)
+        
+        # 試合リストの位置が分からない形式はファイル全体を解析する
+        with open_for_read(self.path) as f:
+            header = json.loads(f.read())
+        header.pop("matches", None)
+        return header
+    
+    def estimated_size(self):
+        """
+        試合データ全体の大きさの見積もり
+        
+        Returns:
+            int: バイト数
+        """
+        if self.sharded:
+            rounds_dir = os.path.join(self.path, ROUNDS_DIR)
+            size = sum(os.path.getsize(os.path.join(rounds_dir, entry["file"])) for entry in self.manifest["rounds"])
+            codec = self.manifest.get("codec", "none")
+        else:
+            size = os.path.getsize(self.path)
+            codec = detect_codec(self.path)
+        return size if codec == "none" else size * COMPRESSION_RATIO
+    
+    def round_digests(self):
+        """
+        ラウンドごとの試合ファイルのハッシュ値
+        
+        Returns:
+            dict: ラウンド番号 -> ハッシュ値（ディレクトリ形式のみ）
+        """
+        return {entry["round_number"]: entry["sha1"] for entry in self.manifest["rounds"]}
+    
+    def read_round(self, round_number):
+        """
+        1ラウンドの試合データを読み込む（ディレクトリ形式のみ）
+        
+        Args:
+            round_number (int): ラウンド番号
+            
+        Returns:
+            list: 試合データ(bytes)のリスト
+        """
+        for entry in self.manifest["rounds"]:
+            if entry["round_number"] == round_number:
+                with open_for_read(os.path.join(self.path, ROUNDS_DIR, entry["file"])) as f:
+                    return f.read().splitlines()
+        return []
+    
+    def iter_lines(self):
+        """
+        試合データを保存順に1行ずつ取り出す
+        
+        Yields:
+            bytes: 保存形式の試合データ（改行を含まないJSON）
+        """
+        if self.sharded:
+            for entry in self.manifest["rounds"]:
+                with open_for_read(os.path.join(self.path, ROUNDS_DIR, entry["file"])) as f:
+                    for line in f:
+                        line = line.rstrip(b"\r\n")
+                        if line:
+                            yield line
+            return
+        
+        marker = MATCHES_MARKER.strip("\n").encode("utf-8")
+        with open_for_read(self.path) as f:
+            for line in f:
+                if line.rstrip(b"\r\n") == marker:
+                    for line in f:
+                        line = line.rstrip(b"\r\n")
+                        if line.startswith(b"  ]"):
+                            return
+                        if line.startswith(b" "):
+                            # 旧形式（試合もインデント付き）は行単位で扱えない
+                            break
+                        yield line.rstrip(b",")
+                    break
+        
+        # 試合リストの位置が分からない形式はファイル全体を解析する
+        with open_for_read(self.path) as f:
+            data = json.loads(f.read())
+        for match_data in data.get("matches", []):
+            yield json.dumps(match_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+class LeagueDiff:
+    def __init__(self, old_path, new_path, partition_bytes=PARTITION_BYTES):
+        """
+        2つの保存済みリーグ（別の端末で入力したコピーなど）の差分
+        
+        試合は保存順ではなく (ラウンド, ホーム, アウェイ) をキーに対応付ける
+        （同じラウンドに同じ組み合わせが複数ある場合は登場順で区別する）。
+        内容がまったく同じ試合データは解析せずに読み飛ばす。
+        
+        試合リストが大きい場合は両方のファイルを先頭から読みながら
+        ラウンド番号で分割した一時ファイルに書き出し、分割ごとに比較するため、
+        メモリ使用量はファイルの大きさによらず partition_bytes 程度に収まる。
+        ディレクトリ形式どうしではハッシュ値が同じラウンドは読み込まない。
+        
+        Args:
+            old_path (str): 比較元のリーグ（ディレクトリまたはJSONファイル）
+            new_path (str): 比較先のリーグ（ディレクトリまたはJSONファイル）
+            partition_bytes (int): 1回にメモリへ読み込む試合データの大きさの目安
+        """
+        self.old = LeagueSource(old_path)
+        self.new = LeagueSource(new_path)
+        self.partition_bytes = partition_bytes
+        self._old_header = self.old.read_header()
+        self._new_header = self.new.read_header()
+    
+    def header_changes(self):
+        """
+        リーグ全体の値（バージョン・ラウンド・IDの採番状態など）の変更
+        
+        Returns:
+            list: [(項目名, 変更前, 変更後), ...]
+        """
+        return [
+            (field, self._old_header.get(field), self._new_header.get(field))
+            for field in HEADER_FIELDS
+            if self._old_header.get(field) != self._new_header.get(field)
+        ]
+    
+    def roster_changes(self):
+        """
+        チーム・選手の追加・削除・変更
+        
+        Returns:
+            dict: teams_added, teams_removed, players_added, players_removed（保存形式のリスト）,
+                teams_changed, players_changed（[(変更前, 変更後, 変わった項目のリスト), ...]）
+        """
+        changes = {
+            "teams_added": [], "teams_removed": [], "teams_changed": [],
+            "players_added": [], "players_removed": [], "players_changed": []
+        }
+        old_teams = {team["id"]: team for team in self._old_header["teams"]}
+        new_teams = {team["id"]: team for team in self._new_header["teams"]}
+        self._compare_items(old_teams, new_teams, ("name",) + TEAM_STATS, "teams", changes)
+        
+        old_players = {player["id"]: player for team in old_teams.values() for player in team["players"]}
+        new_players = {player["id"]: player for team in new_teams.values() for player in team["players"]}
+        self._compare_items(
+            old_players, new_players, ("name", "team_id", "position", "age") + PLAYER_STATS, "players", changes
+        )
+        return changes
+    
+    def _compare_items(self, old_items, new_items, fields, kind, changes):
+        """
+        IDごとにチーム・選手を比べ、結果を changes に追加
+        
+        Args:
+            old_items (dict): ID -> 変更前の保存形式
+            new_items (dict): ID -> 変更後の保存形式
+            fields (tuple): 比較する項目
+            kind (str): "teams" または "players"
+            changes (dict): 結果の追加先
+        """
+        for item_id, old_item in old_items.items():
+            new_item = new_items.get(item_id)
+            if new_item is None:
+                changes[f"{kind}_removed"].append(old_item)
+                continue
+            changed = [field for field in fields if old_item.get(field) != new_item.get(field)]
+            if changed:
+                changes[f"{kind}_changed"].append((old_item, new_item, changed))
+        for item_id, new_item in new_items.items():
+            if item_id not in old_items:
+                changes[f"{kind}_added"].append(new_item)
+    
+    def iter_match_changes(self):
+        """
+        試合の追加・削除・変更を順に取り出す
+        
+        Yields:
+            MatchChange: 試合の変更
+        """
+        if self.old.sharded and self.new.sharded:
+            yield from self._iter_sharded_changes()
+            return
+        
+        size = max(self.old.estimated_size(), self.new.estimated_size())
+        partitions = max(1, -(-size // self.partition_bytes))
+        if partitions == 1:
+            yield from self._diff_partition(self.old.iter_lines(), self.new.iter_lines())
+            return
+        
+        with tempfile.TemporaryDirectory(prefix="league_diff_") as workdir:
+            old_paths = self._write_partitions(self.old, workdir, "old", partitions)
+            new_paths = self._write_partitions(self.new, workdir, "new", partitions)
+            for old_path, new_path in zip(old_paths, new_paths):
+                yield from self._diff_partition(self._read_partition(old_path), self._read_partition(new_path))
+                os.remove(old_path)
+                os.remove(new_path)
+    
+    def _iter_sharded_changes(self):
+        """
+        ディレクトリ形式どうしの試合の変更（ハッシュ値が変わったラウンドだけを読む）
+        
+        Yields:
+            MatchChange: 試合の変更
+        """
+        old_digests = self.old.round_digests()
+        new_digests = self.new.round_digests()
+        round_numbers = list(old_digests)
+        round_numbers += [round_number for round_number in new_digests if round_number not in old_digests]
+        for round_number in round_numbers:
+            if old_digests.get(round_number) == new_digests.get(round_number):
+                continue
+            yield from self._diff_round(
+                round_number, self.old.read_round(round_number), self.new.read_round(round_number)
+            )
+    
+    def _write_partitions(self, source, workdir, prefix, partitions):
+        """
+        試合データをラウンド番号ごとに分割して一時ファイルに書き出す
+        
+        Args:
+            source (LeagueSource): 読み込むリーグ
+            workdir (str): 一時ファイルのディレクトリ
+            prefix (str): 一時ファイル名の先頭
+            partitions (int): 分割数
+            
+        Returns:
+            list: 分割ごとの一時ファイルのパス
+        """
+        paths = [os.path.join(workdir, f"{prefix}_{i}.jsonl") for i in range(partitions)]
+        files = [open(path, 'wb') for path in paths]
+        try:
+            for line in source.iter_lines():
+                round_number = _round_number_of(line)
+                files[(round_number or 0) % partitions].write(line + b"\n")
+        finally:
+            for f in files:
+                f.close()
+        return paths
+    
+    def _read_partition(self, path):
+        """
+        一時ファイルの試合データを1行ずつ取り出す
+        
+        Args:
+            path (str): 一時ファイルのパス
+            
+        Yields:
+            bytes: 保存形式の試合データ
+        """
+        with open(path, 'rb') as f:
+            for line in f:
+                yield line.rstrip(b"\n")
+    
+    def _diff_partition(self, old_lines, new_lines):
+        """
+        分割1つ分の試合データをラウンドごとにまとめて比較
+        
+        Args:
+            old_lines (iterable): 変更前の試合データ
+            new_lines (iterable): 変更後の試合データ
+            
+        Yields:
+            MatchChange: 試合の変更
+        """
+        old_rounds = {}
+        for line in old_lines:
+            old_rounds.setdefault(_round_number_of(line), []).append(line)
+        new_rounds = {}
+        for line in new_lines:
+            new_rounds.setdefault(_round_number_of(line), []).append(line)
+        
+        for round_number, lines in old_rounds.items():
+            yield from self._diff_round(round_number, lines, new_rounds.pop(round_number, []))
+        for round_number, lines in new_rounds.items():
+            yield from self._diff_round(round_number, [], lines)
+    
+    def _diff_round(self, round_number, old_lines, new_lines):
+        """
+        1ラウンドの試合を対応付けて比較
+        
+        両方のすべての試合に試合IDがあれば試合IDで、試合IDのない古い形式のデータを含む場合は
+        (ホーム, アウェイ, 登場順) のキーで対応付ける（その場合は試合IDの違いを変更としない）。
+        
+        Args:
+            round_number (int): ラウンド番号
+            old_lines (list): 変更前の試合データ(bytes)のリスト
+            new_lines (list): 変更後の試合データ(bytes)のリスト
+            
+        Yields:
+            MatchChange: 試合の変更
+        """
+        if old_lines == new_lines:
+            return
+        
+        # 内容が同じ試合データは同じ試合として読み飛ばす
+        unchanged = Counter(old_lines) & Counter(new_lines)
+        old_data = self._parse_changed(old_lines, Counter(unchanged))
+        new_data = self._parse_changed(new_lines, Counter(unchanged))
+        by_id = all(match_data.get("id") is not None for match_data in old_data + new_data)
+        old_matches = self._keyed_matches(old_data, by_id)
+        new_matches = self._keyed_matches(new_data, by_id)
+        
+        for key, old_data in old_matches.items():
+            new_data = new_matches.pop(key, None)
+            if new_data is None:
+                yield MatchChange("removed", round_number, key[0], key[1], old_data, None)
+            elif old_data != new_data:
+                yield MatchChange("changed", round_number, key[0], key[1], old_data, new_data)
+        for key, new_data in new_matches.items():
+            yield MatchChange("added", round_number, key[0], key[1], None, new_data)
+    
+    def _parse_changed(self, lines, skip):
+        """
+        内容が同じ試合データを除いて解析
+        
+        Args:
+            lines (list): 試合データ(bytes)のリスト
+            skip (Counter): 読み飛ばす試合データと件数（内容が同じもの）
+            
+        Returns:
+            list: 保存形式の試合データ(dict)のリスト
+        """
+        parsed = []
+        for line in lines:
+            if skip[line] > 0:
+                skip[line] -= 1
+                continue
+            parsed.append(json.loads(line))
+        return parsed
+    
+    def _keyed_matches(self, parsed, by_id):
+        """
+        試合データを (ホーム, アウェイ, 試合ID または 登場順) をキーにした辞書にする
+        
+        Args:
+            parsed (list): 保存形式の試合データ(dict)のリスト
+            by_id (bool): 試合IDで対応付けるか
+            
+        Returns:
+            dict: キー -> 保存形式の試合データ
+        """
+        matches = {}
+        occurrences = Counter()
+        for match_data in parsed:
+            pair = (match_data["home_team_id"], match_data["away_team_id"])
+            if by_id:
+                matches[pair + (match_data["id"],)] = match_data
+                continue
+            match_data.pop("id", None)
+            matches[pair + (occurrences[pair],)] = match_data
+            occurrences[pair] += 1
+        return matches
+    
+    def team_names(self):
+        """
+        表示用のチーム名（変更後を優先）
+        
+        Returns:
+            dict: チームID -> チーム名
+        """
+        names = {team["id"]: team["name"] for team in self._old_header["teams"]}
+        names.update((team["id"], team["name"]) for team in self._new_header["teams"])
+        return names
+
+def describe_match_change(change, team_names):
+    """
+    試合の変更を表示用の文字列にする
+    
+    Args:
+        change (MatchChange): 試合の変更
+        team_names (dict): チームID -> チーム名
+        
+    Returns:
+        list: 表示する行のリスト
+    """
+    home = team_names.get(change.home_team_id, change.home_team_id)
+    away = team_names.get(change.away_team_id, change.away_team_id)
+    title = f"Round {change.round_number}: {home} vs {away}"
+    
+    if change.kind == "added":
+        return [f"+ {title}（試合の追加）"]
+    if change.kind == "removed":
+        return [f"- {title}（試合の削除）"]
+    
+    old, new = change.old, change.new
+    lines = [f"* {title}"]
+    old_score = f"{old['home_score']}-{old['away_score']}{' (延長)' if old.get('overtime') else ''}"
+    new_score = f"{new['home_score']}-{new['away_score']}{' (延長)' if new.get('overtime') else ''}"
+    if not old["is_finished"] and new["is_finished"]:
+        lines.append(f"    結果の入力: {new_score}")
+    elif old["is_finished"] and not new["is_finished"]:
+        lines.append(f"    結果の取り消し: {old_score}")
+    elif old["is_finished"] and old_score != new_score:
+        lines.append(f"    スコアの変更: {old_score} → {new_score}")
+    if old["date"] != new["date"]:
+        lines.append(f"    日時の変更: {old['date']} → {new['date']}")
+    
+    old_results = old["player_results"]
+    new_results = new["player_results"]
+    for player_id, result in new_results.items():
+        if player_id not in old_results:
+            lines.append(f"    選手成績の追加: {player_id} {result}")
+        elif old_results[player_id] != result:
+            lines.append(f"    選手成績の変更: {player_id} {old_results[player_id]} → {result}")
+    for player_id, result in old_results.items():
+        if player_id not in new_results:
+            lines.append(f"    選手成績の削除: {player_id} {result}")
+    return lines
+
+def main():
+    """
+    2つの保存済みリーグの差分を表示
+    """
+    parser = argparse.ArgumentParser(description="2つの保存済みリーグ（ディレクトリまたはJSONファイル）の差分を表示する")
+    parser.add_argument("old", help="比較元のリーグ（例: data/リーグ名 または data/リーグ名.json）")
+    parser.add_argument("new", help="比較先のリーグ")
+    parser.add_argument("--partition-mb", type=int, default=PARTITION_BYTES // (1024 * 1024),
+                        help="1回にメモリへ読み込む試合データの大きさの目安（MB）")
+    args = parser.parse_args()
+    
+    diff = LeagueDiff(args.old, args.new, args.partition_mb * 1024 * 1024)
+    
+    print("=== リーグ情報 ===")
+    for field, old, new in diff.header_changes():
+        print(f"  {field}: {old} → {new}")
+    
+    print("\n=== チーム・選手 ===")
+    roster = diff.roster_changes()
+    for team in roster["teams_added"]:
+        print(f"+ チーム: {team['name']} ({team['id']})")
+    for team in roster["teams_removed"]:
+        print(f"- チーム: {team['name']} ({team['id']})")
+    for player in roster["players_added"]:
+        print(f"+ 選手: {player['name']} ({player['id']}, {player['team_id']})")
+    for player in roster["players_removed"]:
+        print(f"- 選手: {player['name']} ({player['id']}, {player['team_id']})")
+    for kind, label in (("teams_changed", "チーム"), ("players_changed", "選手")):
+        for old, new, fields in roster[kind]:
+            details = ", ".join(f"{field}: {old.get(field)} → {new.get(field)}" for field in fields)
+            print(f"* {label}: {new['name']} ({new['id']}) {details}")
+    
+    print("\n=== 試合 ===")
+    team_names = diff.team_names()
+    counts = Counter()
+    for change in diff.iter_match_changes():
+        counts[change.kind] += 1
+        if change.kind == "changed":
+            if not change.old["is_finished"] and change.new["is_finished"]:
+                counts["finished"] += 1
+            if change.old["player_results"] != change.new["player_results"]:
+                counts["player_results"] += 1
+        for line in describe_match_change(change, team_names):
+            print(line)
+    
+    print(
+        f"\n試合の追加 {counts['added']}件・削除 {counts['removed']}件・変更 {counts['changed']}件"
+        f"（新しく結果が入力された試合 {counts['finished']}件・選手成績が変わった試合 {counts['player_results']}件）"
+    )
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
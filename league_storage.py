@@ -1,88 +1,105 @@
+import hashlib
 import json
 import os
+import time
 from datetime import datetime
+from file_lock import FileLock
+from lazy_match_list import LazyMatchList
+from round_shard_reader import RoundShardReader, ShardRef
+from storage_codec import detect_codec, open_for_read, open_for_write
+
+# 試合リストの開始位置を示す目印（試合リストは常にファイル末尾に置く）
+MATCHES_MARKER = '\n  "matches": [\n'
+
+# リーグごとのディレクトリ形式で使うファイル名
+MANIFEST_FILE = "manifest.json"
+ROSTER_FILE = "roster.json"
+ROUNDS_DIR = "rounds"
+TOURNAMENTS_DIR = "tournaments"
+SHARD_FORMAT_VERSION = 2
+
+# 参照されなくなったファイルを削除するまでの猶予（読み込み中の他プロセスのため）
+STALE_FILE_SECONDS = 3600
 
 class LeagueStorage:
-    def __init__(self, directory="data"):
+    def __init__(self, directory="data", sharded=True, codec="none"):
         """
         リーグ情報の保存・読み込みを管理するクラス
         
         Args:
             directory (str): データを保存するディレクトリ
+            sharded (bool): Trueの場合、リーグごとのディレクトリに
+                マニフェスト・選手名簿・ラウンドごとの試合ファイルを分けて保存する。
+                Falseの場合は従来どおり1つのJSONファイルに保存する
+            codec (str): 新しく保存するリーグの圧縮形式
+                （"none", "gzip", "bz2", "lzma"）
         """
         self.directory = directory
+        self.sharded = sharded
+        self.codec = codec
         # ディレクトリが存在しない場合は作成
         if not os.path.exists(directory):
             os.makedirs(directory)
     
-    def save_league(self, league):
+    def save_league(self, league, codec=None):
         """
-        リーグ情報をJSONファイルに保存
+        リーグ情報を保存
+        
+        保存はリーグごとのロックファイルで排他制御する。保存ファイルの
+        バージョンが読み込み時から進んでいる場合（他のプロセスが先に保存した場合）は
+        保存済みの内容を試合単位で取り込んでから保存し、同じ試合の結果が
+        食い違っている場合は保存しない。
         
         Args:
             league (League): 保存するリーグオブジェクト
-            
+            codec (str, optional): 圧縮形式。省略時は保存済みのリーグと
+                同じ形式、新しいリーグではストレージの既定値を使う
+                
         Returns:
             bool: 保存に成功したらTrue
         """
         try:
-            # リーグ基本情報
-            league_data = {
-                "name": league.name,
-                "current_round": league.current_round,
-                "teams": [],
-                "matches": []
-            }
-            
-            # チーム情報の保存
-            for team in league.teams.values():
-                team_data = {
-                    "id": team.id,
-                    "name": team.name,
-                    "matches_played": team.matches_played,
-                    "wins": team.wins,
-                    "losses": team.losses,
-                    "draws": team.draws,
-                    "goals_for": team.goals_for,
-                    "goals_against": team.goals_against,
-                    "players": []
-                }
+            stem = self._file_stem(league.name)
+            with FileLock(os.path.join(self.directory, f"{stem}.lock")):
+                # 他のプロセスが先に保存していれば、その結果を取り込む
+                disk_version = self.get_league_version(league.name)
+                if disk_version is not None and disk_version != league.version:
+                    conflicts = self._merge_from_disk(league, stem)
+                    if conflicts:
+                        print("他の端末で保存された結果と食い違いがあるため保存できません:")
+                        for conflict in conflicts:
+                            print(f"  {conflict}")
+                        return False
                 
-                # チームに所属する選手情報の保存
-                for player in team.players.values():
-                    player_data = {
-                        "id": player.id,
-                        "name": player.name,
-                        "team_id": player.team_id,
-                        "position": player.position,
-                        "age": player.age,
-                        "matches_played": player.matches_played,
-                        "wins": player.wins,
-                        "losses": player.losses,
-                        "draws": player.draws
-                    }
-                    team_data["players"].append(player_data)
+                if codec is None:
+                    codec = self.get_league_codec(league.name) or self.codec
                 
-                league_data["teams"].append(team_data)
-            
-            # 試合情報の保存
-            for match in league.matches:
-                match_data = {
-                    "home_team_id": match.home_team.id,
-                    "away_team_id": match.away_team.id,
-                    "date": match.date.strftime("%Y-%m-%d %H:%M:%S"),
-                    "round_number": match.round_number,
-                    "home_score": match.home_score,
-                    "away_score": match.away_score,
-                    "is_finished": match.is_finished,
-                    "player_results": match.player_results
+                # リーグ基本情報
+                league_data = {
+                    "name": league.name,
+                    "current_round": league.current_round,
+                    "version": (disk_version or 0) + 1,
+                    "byes": {str(round_number): team_id for round_number, team_id in league.byes.items()},
+                    "unawarded_byes": sorted(league.unawarded_byes),
+                    "id_counters": dict(league.id_counters),
+                    "min_rest_hours": league.min_rest_hours,
+                    "scoring_rules": league.scoring_rules.to_dict(),
+                    "memberships": league.membership.to_dict(),
+                    "transfer_count": league.membership.transfer_count(),
+                    "teams": self._teams_to_list(league)
                 }
-                league_data["matches"].append(match_data)
-            
-            # ファイルに保存
-            filename = os.path.join(self.directory, f"{league.name.replace(' ', '_')}.json")
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(league_data, f, ensure_ascii=False, indent=2)
+                
+                if self.sharded:
+                    self._save_sharded(league, league_data, codec)
+                else:
+                    # ファイルに保存（圧縮しながら書き出す）
+                    filename = os.path.join(self.directory, f"{stem}.json")
+                    tmp_filename = filename + ".tmp"
+                    with open_for_write(tmp_filename, codec) as f:
+                        self._write_league_json(f, league_data, league.matches)
+                    os.replace(tmp_filename, filename)
+                
+                league.version = league_data["version"]
             
             return True
         
@@ -90,21 +107,27 @@ class LeagueStorage:
             print(f"保存中にエラーが発生しました: {e}")
             return False
     
-    def load_league(self, filename):
+    def load_league(self, filename, lazy=False):
         """
-        JSONファイルからリーグ情報を読み込む
+        保存されたリーグ情報を読み込む
+        
+        リーグごとのディレクトリがあればそちらを優先する。
+        拡張子 .json 付きで指定した場合は従来形式のファイルを読み込む（移行用）。
         
         Args:
-            filename (str): 読み込むJSONファイル名
-            
+            filename (str): 読み込むリーグ名またはJSONファイル名
+            lazy (bool): Trueの場合、チーム・選手のみ即座に復元し、
+                試合はアクセスされた時点で復元する
+                
         Returns:
             League: 読み込んだリーグオブジェクト、失敗時はNone
         """
         try:
-            from player_class import Player
-            from team_class import Team
-            from match_class import Match
-            from league_class import League
+            # ディレクトリ形式のリーグ
+            if not filename.endswith('.json'):
+                league_dir = os.path.join(self.directory, filename)
+                if os.path.exists(os.path.join(league_dir, MANIFEST_FILE)):
+                    return self._load_sharded(league_dir, lazy)
             
             # ファイルパスの処理
             if not filename.endswith('.json'):
@@ -118,67 +141,50 @@ class LeagueStorage:
                 return None
             
             # JSONファイルの読み込み
-            with open(filepath, 'r', encoding='utf-8') as f:
-                league_data = json.load(f)
+            # 試合部分を分割するだけで済むようバイト列のまま扱う
+            # 圧縮ファイルは先頭のバイト列から形式を判定し、読みながら展開する
+            with open_for_read(filepath) as f:
+                league_data, match_lines = self._parse_league_json(f.read(), lazy)
             
             # リーグオブジェクトの作成
-            league = League(league_data["name"])
-            league.current_round = league_data["current_round"]
+            league = self._league_from_data(league_data)
+            legacy_ids = "match" not in league_data.get("id_counters", {})
             
-            # チーム情報の復元
-            for team_data in league_data["teams"]:
-                team = Team(team_data["id"], team_data["name"])
-                
-                # チームの成績復元
-                team.matches_played = team_data["matches_played"]
-                team.wins = team_data["wins"]
-                team.losses = team_data["losses"]
-                team.draws = team_data["draws"]
-                team.goals_for = team_data["goals_for"]
-                team.goals_against = team_data["goals_against"]
+            # 試合情報の復元
+            if match_lines is not None:
+                # 1行1試合の形式: 試合はアクセスされた時点で復元する
+                if legacy_ids:
+                    match_lines = self._assign_legacy_match_ids(league, match_lines)
+                league.matches = LazyMatchList(
+                    match_lines,
+                    lambda match_data: self._match_from_dict(match_data, league),
+                    self._read_round_number,
+                    self._read_match_id,
+                    self._read_team_ids
+                )
+            else:
+                # チームが存在しない試合は読み飛ばす
+                match_list = [
+                    match_data for match_data in league_data["matches"]
+                    if match_data["home_team_id"] in league.teams
+                    and match_data["away_team_id"] in league.teams
+                ]
+                if legacy_ids:
+                    match_list = self._assign_legacy_match_ids(league, match_list)
                 
-                # 選手情報の復元
-                for player_data in team_data["players"]:
-                    player = Player(
-                        player_data["id"],
-                        player_data["name"],
-                        player_data["team_id"],
-                        player_data["position"],
-                        player_data["age"]
+                if lazy:
+                    league.matches = LazyMatchList(
+                        match_list,
+                        lambda match_data: self._match_from_dict(match_data, league),
+                        id_reader=self._read_match_id,
+                        teams_reader=self._read_team_ids
                     )
-                    
-                    # 選手の成績復元
-                    player.matches_played = player_data["matches_played"]
-                    player.wins = player_data["wins"]
-                    player.losses = player_data["losses"]
-                    player.draws = player_data["draws"]
-                    
-                    team.add_player(player)
-                
-                league.add_team(team)
+                else:
+                    for match_data in match_list:
+                        league.matches.append(self._match_from_dict(match_data, league))
             
-            # 試合情報の復元
-            for match_data in league_data["matches"]:
-                home_team = league.get_team(match_data["home_team_id"])
-                away_team = league.get_team(match_data["away_team_id"])
-                
-                if home_team and away_team:
-                    # 試合オブジェクトの作成
-                    match_date = datetime.strptime(match_data["date"], "%Y-%m-%d %H:%M:%S")
-                    match = Match(home_team, away_team, match_date, match_data["round_number"])
-                    
-                    # 試合結果の復元
-                    if match_data["is_finished"]:
-                        # スコアの設定だけで、チーム成績は更新しない（すでに復元済み）
-                        match.home_score = match_data["home_score"]
-                        match.away_score = match_data["away_score"]
-                        match.is_finished = True
-                    
-                    # 選手の試合結果の復元
-                    match.player_results = match_data["player_results"]
-                    
-                    # リーグに試合を追加
-                    league.matches.append(match)
+            if league_data["teams"]:
+                self._rebuild_missing_stats(league, league_data["teams"][0])
             
             return league
         
@@ -186,18 +192,1208 @@ class LeagueStorage:
             print(f"読み込み中にエラーが発生しました: {e}")
             return None
     
+    def save_tournament(self, tournament, codec=None):
+        """
+        トーナメント情報を保存
+        
+        data/tournaments/<トーナメント名>.json に、チーム・選手、シード順、
+        入力順の試合結果を保存する。組み合わせ表はシード順から作り直せるため保存しない。
+        
+        Args:
+            tournament (Tournament): 保存するトーナメント
+            codec (str, optional): 圧縮形式。省略時は保存済みのファイルと同じ形式
+            
+        Returns:
+            bool: 保存に成功したらTrue
+        """
+        try:
+            directory = os.path.join(self.directory, TOURNAMENTS_DIR)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            stem = self._file_stem(tournament.name)
+            filepath = os.path.join(directory, f"{stem}.json")
+            
+            with FileLock(os.path.join(directory, f"{stem}.lock")):
+                disk_version = None
+                if os.path.exists(filepath):
+                    with open_for_read(filepath) as f:
+                        disk_version = json.loads(f.read()).get("version", 0)
+                    if codec is None:
+                        codec = detect_codec(filepath)
+                if disk_version is not None and disk_version != tournament.version:
+                    print("他の端末で保存されたトーナメントがあるため保存できません。読み込み直してください。")
+                    return False
+                
+                results = []
+                for match_index in tournament.results:
+                    match = tournament.matches[match_index]
+                    results.append([match_index, match.home_score, match.away_score, match.player_results])
+                
+                tournament_data = {
+                    "name": tournament.name,
+                    "elimination": tournament.elimination,
+                    "version": (disk_version or 0) + 1,
+                    "entrants": tournament.entrants,
+                    "teams": self._teams_to_list(tournament),
+                    "results": results
+                }
+                self._write_atomic(
+                    filepath,
+                    json.dumps(tournament_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+                    codec or self.codec
+                )
+                tournament.version = tournament_data["version"]
+            
+            return True
+        
+        except Exception as e:
+            print(f"保存中にエラーが発生しました: {e}")
+            return False
+    
+    def load_tournament(self, name):
+        """
+        保存されたトーナメント情報を読み込む
+        
+        Args:
+            name (str): トーナメント名
+            
+        Returns:
+            Tournament: 読み込んだトーナメント、失敗時はNone
+        """
+        from tournament_class import Tournament
+        
+        try:
+            filepath = os.path.join(self.directory, TOURNAMENTS_DIR, f"{self._file_stem(name)}.json")
+            if not os.path.exists(filepath):
+                print(f"ファイル '{filepath}' が見つかりません。")
+                return None
+            
+            with open_for_read(filepath) as f:
+                tournament_data = json.loads(f.read())
+            
+            tournament = Tournament(tournament_data["name"], tournament_data["elimination"])
+            tournament.version = tournament_data.get("version", 0)
+            for team in self._teams_from_list(tournament_data["teams"]):
+                tournament.add_team(team)
+            tournament.start(tournament_data["entrants"])
+            
+            # 入力順に結果を反映して組み合わせ表を再現する（チーム成績は復元済み）
+            for match_index, home_score, away_score, player_results in tournament_data["results"]:
+                match = tournament.restore_score(match_index, home_score, away_score)
+                match.player_results = player_results
+            
+            return tournament
+        
+        except Exception as e:
+            print(f"読み込み中にエラーが発生しました: {e}")
+            return None
+    
+    def get_available_tournaments(self):
+        """
+        利用可能なトーナメントの一覧を取得
+        
+        Returns:
+            list: 保存されているトーナメント名のリスト
+        """
+        directory = os.path.join(self.directory, TOURNAMENTS_DIR)
+        if not os.path.isdir(directory):
+            return []
+        return [
+            os.path.splitext(entry)[0]
+            for entry in sorted(os.listdir(directory)) if entry.endswith('.json')
+        ]
+    
+    def get_league_version(self, league_name):
+        """
+        保存済みのリーグのバージョン（保存回数）を取得
+        
+        ロックを取らずに読み込むため、保存中でも待たされない。
+        
+        Args:
+            league_name (str): リーグ名
+            
+        Returns:
+            int: バージョン、保存されていない場合はNone
+        """
+        stem = self._file_stem(league_name)
+        manifest = self._read_manifest(os.path.join(self.directory, stem))
+        if manifest:
+            return manifest.get("version", 0)
+        
+        filepath = os.path.join(self.directory, f"{stem}.json")
+        if not os.path.exists(filepath):
+            return None
+        with open_for_read(filepath) as f:
+            league_data, _ = self._parse_league_json(f.read(), True)
+        return league_data.get("version", 0)
+    
+    def get_league_signature(self, league_name):
+        """
+        保存ファイルの更新時刻とサイズを取得（変更の確認用。ファイルは読まない）
+        
+        ディレクトリ形式ではマニフェスト（保存の最後に置き換わる）の値を返す。
+        
+        Args:
+            league_name (str): リーグ名
+            
+        Returns:
+            tuple: (更新時刻(ナノ秒), サイズ)、保存されていない場合はNone
+        """
+        stem = self._file_stem(league_name)
+        for path in (os.path.join(self.directory, stem, MANIFEST_FILE),
+                     os.path.join(self.directory, f"{stem}.json")):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return stat.st_mtime_ns, stat.st_size
+        return None
+    
+    def get_league_checksum(self, league_name):
+        """
+        保存ファイルの内容のハッシュ値を取得（前回の起動時のキャッシュが使えるかの確認用）
+        
+        ディレクトリ形式ではマニフェスト（選手名簿・各シャードのハッシュ値を含む）だけを、
+        単一ファイル形式ではファイル全体を（圧縮されたまま）少しずつ読んで計算する。
+        
+        Args:
+            league_name (str): リーグ名
+            
+        Returns:
+            str: SHA-1 の16進文字列、保存されていない場合はNone
+        """
+        stem = self._file_stem(league_name)
+        for path in (os.path.join(self.directory, stem, MANIFEST_FILE),
+                     os.path.join(self.directory, f"{stem}.json")):
+            digest = hashlib.sha1()
+            try:
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+            except OSError:
+                continue
+            return digest.hexdigest()
+        return None
+    
+    def bind_matches(self, league):
+        """
+        保存した状態から復元したリーグの試合リストに、試合データの変換関数を設定し直す
+        
+        Args:
+            league (League): session_cache.py で復元したリーグ
+        """
+        if isinstance(league.matches, LazyMatchList):
+            league.matches.bind(
+                lambda match_data: self._match_from_dict(match_data, league),
+                self._read_round_number,
+                self._read_match_id,
+                self._read_team_ids
+            )
+    
+    def read_match_updates(self, league_name, digests):
+        """
+        前回の読み込みから変わった部分の試合データを読み込む（差分の反映用）
+        
+        ディレクトリ形式ではハッシュ値が変わったラウンドのシャードだけを読む。
+        単一ファイル形式ではファイル全体を読み、試合リストの部分を解析せずに返す
+        （ラウンドの区別はせず、キー None に試合データを ",\\n" でつないだ bytes を入れる）。
+        
+        Args:
+            league_name (str): リーグ名
+            digests (dict): ラウンド番号 -> 前回読み込んだシャードのハッシュ値
+            
+        Returns:
+            dict: version, current_round, team_count, player_count（不明ならNone）,
+                transfer_count（移籍の回数）,
+                scoring_rules（勝点の計算方法の保存形式、旧形式ではNone）,
+                rounds（ラウンド番号 -> (ハッシュ値, 試合データ(bytes)のリスト)、変わったラウンドのみ。
+                単一ファイル形式では {None: (None, 試合リスト全体(bytes))}）,
+                round_numbers（保存されている全ラウンド番号）。
+                読み込めない・差分を扱えない形式の場合はNone
+        """
+        stem = self._file_stem(league_name)
+        league_dir = os.path.join(self.directory, stem)
+        manifest = self._read_manifest(league_dir)
+        if manifest:
+            reader = RoundShardReader(os.path.join(league_dir, ROUNDS_DIR), manifest["rounds"])
+            rounds = {
+                entry["round_number"]: (entry["sha1"], reader.load(entry["round_number"]))
+                for entry in manifest["rounds"]
+                if digests.get(entry["round_number"]) != entry["sha1"]
+            }
+            return {
+                "version": manifest.get("version", 0),
+                "current_round": manifest["current_round"],
+                "team_count": manifest.get("team_count"),
+                "player_count": manifest.get("player_count"),
+                "transfer_count": manifest.get("transfer_count", 0),
+                "scoring_rules": manifest.get("scoring_rules"),
+                "rounds": rounds,
+                "round_numbers": [entry["round_number"] for entry in manifest["rounds"]]
+            }
+        
+        filepath = os.path.join(self.directory, f"{stem}.json")
+        if not os.path.exists(filepath):
+            return None
+        with open_for_read(filepath) as f:
+            data = f.read()
+        marker = MATCHES_MARKER.encode("utf-8")
+        marker_pos = data.find(marker)
+        body_start = marker_pos + len(marker)
+        if marker_pos < 0 or data.startswith(b" ", body_start):
+            # 旧形式（試合もインデント付き）は行単位で扱えない
+            return None
+        
+        # チーム・選手の情報は解析せず、件数だけを数える
+        # （選手の情報にだけ "team_id" のキーがある）
+        header = data[:marker_pos]
+        body_end = data.rfind(b"\n  ]")
+        body = data[body_start:body_end]
+        return {
+            "version": self._header_int(header, "version") or 0,
+            "current_round": self._header_int(header, "current_round"),
+            "team_count": header.count(b'"players": ['),
+            "player_count": header.count(b'"team_id": '),
+            "transfer_count": self._header_int(header, "transfer_count") or 0,
+            "scoring_rules": self._header_value(header, "scoring_rules"),
+            "rounds": {None: (None, body)},
+            "round_numbers": [None]
+        }
+    
+    def _header_int(self, header, key):
+        """
+        保存ファイルの先頭部分から最上位の整数の値を解析せずに取り出す
+        
+        Args:
+            header (bytes): 試合リストより前の部分
+            key (str): キー名
+            
+        Returns:
+            int: 値、見つからない場合はNone
+        """
+        pattern = f'\n  "{key}": '.encode("utf-8")
+        start = header.find(pattern)
+        if start < 0:
+            return None
+        start += len(pattern)
+        end = start
+        while end < len(header) and header[end:end + 1].isdigit():
+            end += 1
+        return int(header[start:end]) if end > start else None
+    
+    def _header_value(self, header, key):
+        """
+        保存ファイルの先頭部分から最上位の値を1つだけ解析して取り出す
+        
+        Args:
+            header (bytes): 試合リストより前の部分
+            key (str): キー名
+            
+        Returns:
+            object: 値、見つからない場合はNone
+        """
+        pattern = f'\n  "{key}": '.encode("utf-8")
+        start = header.find(pattern)
+        if start < 0:
+            return None
+        start += len(pattern)
+        # 次の最上位のキーまでを解析する（後に続く選手名簿は読まない）
+        end = header.find(b'\n  "', start)
+        text = header[start:end if end >= 0 else len(header)].decode("utf-8")
+        return json.JSONDecoder().raw_decode(text)[0]
+    
+    def get_league_codec(self, league_name):
+        """
+        保存済みのリーグの圧縮形式を取得
+        
+        Args:
+            league_name (str): リーグ名
+            
+        Returns:
+            str: 圧縮形式、保存されていない場合はNone
+        """
+        stem = self._file_stem(league_name)
+        manifest = self._read_manifest(os.path.join(self.directory, stem))
+        if manifest:
+            return manifest.get("codec", "none")
+        
+        filepath = os.path.join(self.directory, f"{stem}.json")
+        if os.path.exists(filepath):
+            return detect_codec(filepath)
+        return None
+    
+    def _file_stem(self, league_name):
+        """
+        リーグ名から保存用のファイル名（拡張子なし）を作成
+        
+        Args:
+            league_name (str): リーグ名
+            
+        Returns:
+            str: ファイル名
+        """
+        return league_name.replace(' ', '_')
+    
+    def _teams_to_list(self, league):
+        """
+        チーム・選手情報を保存形式に変換
+        
+        Args:
+            league (League or Tournament): リーグまたはトーナメント
+            
+        Returns:
+            list: 保存形式のチーム情報のリスト
+        """
+        teams = []
+        for team in league.teams.values():
+            team_data = {
+                "id": team.id,
+                "name": team.name,
+                "matches_played": team.matches_played,
+                "wins": team.wins,
+                "losses": team.losses,
+                "draws": team.draws,
+                "goals_for": team.goals_for,
+                "goals_against": team.goals_against,
+                "form": team.form.to_dict(),
+                "overtime_wins": team.overtime_wins,
+                "overtime_losses": team.overtime_losses,
+                "score_counts": {str(goals): count for goals, count in team.score_counts.items()},
+                "loss_margins": {str(margin): count for margin, count in team.loss_margins.items()},
+                "players": []
+            }
+            
+            # チームに所属する選手情報の保存
+            for player in team.players.values():
+                player_data = {
+                    "id": player.id,
+                    "name": player.name,
+                    "team_id": player.team_id,
+                    "position": player.position,
+                    "age": player.age,
+                    "matches_played": player.matches_played,
+                    "wins": player.wins,
+                    "losses": player.losses,
+                    "draws": player.draws,
+                    "form": player.form.to_dict()
+                }
+                team_data["players"].append(player_data)
+            
+            teams.append(team_data)
+        return teams
+    
+    def _league_from_data(self, league_data):
+        """
+        保存形式のリーグ情報からリーグ・チーム・選手を復元
+        
+        Args:
+            league_data (dict): name, current_round, teams を含むリーグ情報
+            
+        Returns:
+            League: 復元したリーグオブジェクト（試合は含まない）
+        """
+        from league_class import League
+        from scoring_rules import ScoringRules
+        
+        league = League(league_data["name"])
+        league.current_round = league_data["current_round"]
+        league.version = league_data.get("version", 0)
+        league.byes = {int(round_number): team_id for round_number, team_id in league_data.get("byes", {}).items()}
+        league.unawarded_byes = set(league_data.get("unawarded_byes", []))
+        league.id_counters.update(league_data.get("id_counters", {}))
+        league.min_rest_hours = league_data.get("min_rest_hours", 0)
+        league.scoring_rules = ScoringRules.from_dict(league_data.get("scoring_rules"))
+        
+        for team in self._teams_from_list(league_data["teams"]):
+            league.add_team(team)
+        league.membership.restore(league_data.get("memberships", {}))
+        
+        return league
+    
+    def _teams_from_list(self, teams_data):
+        """
+        保存形式のチーム情報からチーム・選手を復元
+        
+        Args:
+            teams_data (list): 保存形式のチーム情報のリスト
+            
+        Returns:
+            list: 復元したTeamオブジェクトのリスト
+        """
+        from player_class import Player
+        from team_class import Team
+        
+        teams = []
+        
+        # チーム情報の復元
+        for team_data in teams_data:
+            team = Team(team_data["id"], team_data["name"])
+            
+            # チームの成績復元
+            team.matches_played = team_data["matches_played"]
+            team.wins = team_data["wins"]
+            team.losses = team_data["losses"]
+            team.draws = team_data["draws"]
+            team.goals_for = team_data["goals_for"]
+            team.goals_against = team_data["goals_against"]
+            if "form" in team_data:
+                team.form.restore(team_data["form"])
+            team.overtime_wins = team_data.get("overtime_wins", 0)
+            team.overtime_losses = team_data.get("overtime_losses", 0)
+            team.score_counts = {int(goals): count for goals, count in team_data.get("score_counts", {}).items()}
+            team.loss_margins = {int(margin): count for margin, count in team_data.get("loss_margins", {}).items()}
+            
+            # 選手情報の復元
+            for player_data in team_data["players"]:
+                player = Player(
+                    player_data["id"],
+                    player_data["name"],
+                    player_data["team_id"],
+                    player_data["position"],
+                    player_data["age"]
+                )
+                
+                # 選手の成績復元
+                player.matches_played = player_data["matches_played"]
+                player.wins = player_data["wins"]
+                player.losses = player_data["losses"]
+                player.draws = player_data["draws"]
+                if "form" in player_data:
+                    player.form.restore(player_data["form"])
+                
+                team.add_player(player)
+            
+            teams.append(team)
+        
+        return teams
+    
+    def _save_sharded(self, league, league_data, codec):
+        """
+        リーグをディレクトリ形式で保存
+        
+        data/<リーグ名>/ 以下に manifest.json、roster.json（チーム・選手）、
+        rounds/round_XXXX.jsonl（ラウンドごとの試合、1行1試合）を書き出す。
+        内容が変わっていないシャードは書き換えない。
+        
+        Args:
+            league (League): 保存するリーグオブジェクト
+            league_data (dict): 試合以外のリーグ情報
+            codec (str): 選手名簿・試合ファイルの圧縮形式
+        """
+        league_dir = os.path.join(self.directory, self._file_stem(league.name))
+        rounds_dir = os.path.abspath(os.path.join(league_dir, ROUNDS_DIR))
+        if not os.path.exists(rounds_dir):
+            os.makedirs(rounds_dir)
+        
+        manifest = self._read_manifest(league_dir) or {}
+        if manifest.get("codec", "none") != codec:
+            # 圧縮形式が変わった場合はすべて書き直す
+            manifest = {}
+        old_rounds = {entry["round_number"]: entry for entry in manifest.get("rounds", [])}
+        
+        # 選手名簿
+        # 各ファイルは内容のハッシュ値を名前に含め、一度書いたら変更しない。
+        # これによりロックなしで読み込む他のプロセスも一貫した内容を読める
+        roster_bytes = json.dumps(
+            {"teams": league_data["teams"]}, ensure_ascii=False, indent=2
+        ).encode("utf-8")
+        roster_sha1 = hashlib.sha1(roster_bytes).hexdigest()
+        roster_file = f"roster_{roster_sha1[:12]}.json"
+        if manifest.get("roster_sha1") != roster_sha1:
+            self._write_atomic(os.path.join(league_dir, roster_file), roster_bytes, codec)
+        
+        # ラウンドごとに試合をまとめる（ラウンドの登場順を保つ）
+        rounds = {}
+        for round_number, raw, match in self._iter_match_entries(league.matches):
+            rounds.setdefault(round_number, []).append((raw, match))
+        
+        round_entries = []
+        for round_number, entries in rounds.items():
+            old_entry = old_rounds.get(round_number)
+            if old_entry and self._is_clean_shard(entries, round_number, rounds_dir, old_entry):
+                round_entries.append(old_entry)
+                continue
+            
+            shard_bytes = b"".join(self._match_bytes(raw, match) + b"\n" for raw, match in entries)
+            sha1 = hashlib.sha1(shard_bytes).hexdigest()
+            if old_entry and old_entry["sha1"] == sha1:
+                round_entries.append(old_entry)
+                continue
+            
+            entry = {
+                "round_number": round_number,
+                "file": self._shard_file_name(round_number, sha1),
+                "count": len(entries),
+                "sha1": sha1
+            }
+            self._write_atomic(os.path.join(rounds_dir, entry["file"]), shard_bytes, codec)
+            round_entries.append(entry)
+        
+        # マニフェストは最後に書き換える
+        manifest = {
+            "format": SHARD_FORMAT_VERSION,
+            "name": league.name,
+            "version": league_data["version"],
+            "current_round": league.current_round,
+            "byes": league_data["byes"],
+            "unawarded_byes": league_data["unawarded_byes"],
+            "id_counters": league_data["id_counters"],
+            "min_rest_hours": league_data["min_rest_hours"],
+            "scoring_rules": league_data["scoring_rules"],
+            "memberships": league_data["memberships"],
+            "transfer_count": league_data["transfer_count"],
+            "codec": codec,
+            "roster_file": roster_file,
+            "roster_sha1": roster_sha1,
+            "team_count": len(league_data["teams"]),
+            "player_count": sum(len(team_data["players"]) for team_data in league_data["teams"]),
+            "rounds": round_entries
+        }
+        self._write_atomic(
+            os.path.join(league_dir, MANIFEST_FILE),
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+        )
+        
+        # 参照されなくなった古いファイルを削除
+        live_files = {entry["file"] for entry in round_entries}
+        live_files.add(roster_file)
+        self._remove_stale_files(league_dir, live_files)
+        self._remove_stale_files(rounds_dir, live_files)
+    
+    def _load_sharded(self, league_dir, lazy):
+        """
+        ディレクトリ形式のリーグを読み込む
+        
+        遅延読み込みの場合は選手名簿と現在のラウンドのシャードだけを読み、
+        他のラウンドはアクセスされた時点で読み込む。
+        
+        Args:
+            league_dir (str): リーグのディレクトリ
+            lazy (bool): 試合をアクセス時に復元するか
+            
+        Returns:
+            League: 読み込んだリーグオブジェクト
+        """
+        manifest = self._read_manifest(league_dir)
+        roster_file = manifest.get("roster_file", ROSTER_FILE)
+        with open_for_read(os.path.join(league_dir, roster_file)) as f:
+            roster = json.loads(f.read())
+        
+        league = self._league_from_data({
+            "name": manifest["name"],
+            "current_round": manifest["current_round"],
+            "version": manifest.get("version", 0),
+            "byes": manifest.get("byes", {}),
+            "unawarded_byes": manifest.get("unawarded_byes", []),
+            "id_counters": manifest.get("id_counters", {}),
+            "min_rest_hours": manifest.get("min_rest_hours", 0),
+            "scoring_rules": manifest.get("scoring_rules"),
+            "memberships": manifest.get("memberships", {}),
+            "teams": roster["teams"]
+        })
+        
+        reader = RoundShardReader(os.path.join(league_dir, ROUNDS_DIR), manifest["rounds"])
+        refs = [
+            ShardRef(reader, entry["round_number"], position)
+            for entry in manifest["rounds"]
+            for position in range(entry["count"])
+        ]
+        if "match" not in manifest.get("id_counters", {}):
+            refs = self._assign_legacy_match_ids(league, refs)
+        
+        if lazy:
+            reader.load(league.current_round)
+            league.matches = LazyMatchList(
+                refs,
+                lambda match_data: self._match_from_dict(match_data, league),
+                self._read_round_number,
+                self._read_match_id,
+                self._read_team_ids
+            )
+        else:
+            for ref in refs:
+                league.matches.append(self._match_from_dict(ref, league))
+        
+        if roster["teams"]:
+            self._rebuild_missing_stats(league, roster["teams"][0])
+        
+        return league
+    
+    def _rebuild_missing_stats(self, league, team_data):
+        """
+        旧形式のデータに保存されていない成績があれば試合履歴から作り直す
+        
+        Args:
+            league (League): 対象のリーグ
+            team_data (dict): 保存形式のチーム情報（保存されている項目の確認用）
+        """
+        rebuild_form = "form" not in team_data
+        rebuild_scores = "score_counts" not in team_data
+        if rebuild_form or rebuild_scores:
+            self._rebuild_form(league, rebuild_form, rebuild_scores)
+    
+    def _rebuild_form(self, league, form=True, scores=False):
+        """
+        直近の成績・得点の記録を保存していない旧形式のデータのため、試合履歴から1回の走査で作り直す
+        
+        遅延読み込みの試合は一時的に復元するだけで、リストには保持しない。
+        
+        Args:
+            league (League): 対象のリーグ
+            form (bool): チーム・選手の直近の成績を作り直すか
+            scores (bool): チームの得点・点差の記録（ボーナスポイントの計算用）を作り直すか
+        """
+        symbols = {1: '○', -1: '×', 0: '△'}
+        for _, raw, match in self._iter_match_entries(league.matches):
+            if match is None:
+                match = self._match_from_dict(raw, league)
+            if not match.is_finished or match.home_team is None or match.away_team is None:
+                continue
+            if scores:
+                for team, own, opponent in ((match.home_team, match.home_score, match.away_score),
+                                            (match.away_team, match.away_score, match.home_score)):
+                    team.score_counts[own] = team.score_counts.get(own, 0) + 1
+                    if own < opponent:
+                        team.loss_margins[opponent - own] = team.loss_margins.get(opponent - own, 0) + 1
+            if not form:
+                continue
+            outcome = (match.home_score > match.away_score) - (match.home_score < match.away_score)
+            match.home_team.form.add(symbols[outcome])
+            match.away_team.form.add(symbols[-outcome])
+            for player_id, result in match.player_results.items():
+                player = match.home_team.players.get(player_id) or match.away_team.players.get(player_id)
+                if player is not None:
+                    player.form.add(result)
+    
+    def _merge_from_disk(self, league, stem):
+        """
+        保存済みの内容をリーグに試合単位で取り込む
+        
+        試合は（ラウンド, ホーム, アウェイ, 同じ組み合わせ内の順番）で対応付け、試合IDは保存済みのものに揃える。
+        片方にしかない試合・結果・選手成績・移籍は追加し、同じ試合のスコアや
+        選手成績、同じ選手の移籍が食い違う場合は何も変更せずに食い違いの一覧を返す。
+        
+        Args:
+            league (League): 取り込み先のリーグオブジェクト
+            stem (str): 保存ファイル名（拡張子なし）
+            
+        Returns:
+            list: 食い違いの説明文のリスト（空なら取り込み成功）
+        """
+        from match_class import Match
+        from membership_history import FIRST_ROUND
+        from player_class import Player
+        from team_class import Team
+        
+        disk_league = self.load_league(stem, lazy=True)
+        if disk_league is None:
+            return ["保存済みのデータを読み込めませんでした"]
+        
+        league_dir = os.path.join(self.directory, stem)
+        manifest = self._read_manifest(league_dir)
+        disk_rounds = {entry["round_number"]: entry for entry in manifest["rounds"]} if manifest else {}
+        rounds_dir = os.path.abspath(os.path.join(league_dir, ROUNDS_DIR))
+        
+        own_entries = {}
+        for round_number, raw, match in self._iter_match_entries(league.matches):
+            own_entries.setdefault(round_number, []).append((raw, match))
+        
+        round_numbers = dict.fromkeys(
+            round_number for round_number, _, _ in self._iter_match_entries(disk_league.matches)
+        )
+        
+        actions = []
+        conflicts = []
+        for round_number in round_numbers:
+            disk_entry = disk_rounds.get(round_number)
+            entries = own_entries.get(round_number, [])
+            if disk_entry and self._is_clean_shard(entries, round_number, rounds_dir, disk_entry):
+                # 同じシャードから読み込んだまま変更していないラウンド
+                continue
+            
+            own_matches = {}
+            for match in league.matches_in_round(round_number):
+                key = (match.home_team.id, match.away_team.id)
+                own_matches.setdefault(key, []).append(match)
+            
+            occurrences = {}
+            for disk_match in disk_league.matches_in_round(round_number):
+                key = (disk_match.home_team.id, disk_match.away_team.id)
+                occurrence = occurrences.get(key, 0)
+                occurrences[key] = occurrence + 1
+                candidates = own_matches.get(key, [])
+                match = candidates[occurrence] if occurrence < len(candidates) else None
+                
+                if match is None:
+                    actions.append(("match", disk_match, None))
+                    continue
+                if match.id != disk_match.id:
+                    # 同じ試合を両方の端末で追加した場合は保存済みのIDに合わせる
+                    actions.append(("id", disk_match, match))
+                
+                if disk_match.is_finished:
+                    if not match.is_finished:
+                        actions.append(("score", disk_match, match))
+                    elif (match.home_score, match.away_score, match.overtime) != \
+                            (disk_match.home_score, disk_match.away_score, disk_match.overtime):
+                        conflicts.append(f"{match} (保存済み: {disk_match.home_score}-{disk_match.away_score})")
+                
+                for player_id, result in disk_match.player_results.items():
+                    own_result = match.player_results.get(player_id)
+                    if own_result is None:
+                        actions.append(("player", (player_id, result), match))
+                    elif own_result != result:
+                        conflicts.append(f"{match} 選手 {player_id}: {own_result} (保存済み: {result})")
+        
+        # 同じIDで別の選手が登録されている（両方のプロセスで同時に採番した）場合
+        for disk_team in disk_league.teams.values():
+            for disk_player in disk_team.players.values():
+                player = league.get_player(disk_player.id)
+                if player is not None and player.name != disk_player.name:
+                    conflicts.append(f"選手ID {disk_player.id}: {player.name} (保存済み: {disk_player.name})")
+        
+        # 他のプロセスでの移籍（この端末の所属履歴の続きであれば取り込む）
+        transfers = []
+        for player_id in disk_league.membership.transferred_player_ids():
+            disk_spells = disk_league.membership.spells(player_id)
+            player = league.get_player(player_id)
+            if player is None:
+                own_spells = disk_spells[:1]
+            else:
+                own_spells = league.membership.spells(player_id) or [(FIRST_ROUND, player.team_id)]
+            if disk_spells[:len(own_spells)] == own_spells:
+                transfers.extend((player_id, team_id, from_round) for from_round, team_id in disk_spells[len(own_spells):])
+            elif own_spells[:len(disk_spells)] != disk_spells:
+                conflicts.append(f"選手ID {player_id} の移籍: {own_spells} (保存済み: {disk_spells})")
+        
+        # 同じラウンドのバイを両方のプロセスで別のチームに割り当てた場合
+        for round_number, team_id in disk_league.byes.items():
+            own_team_id = league.byes.get(round_number)
+            if own_team_id is not None and own_team_id != team_id:
+                conflicts.append(f"第{round_number}ラウンドのバイ: {own_team_id} (保存済み: {team_id})")
+        
+        if conflicts:
+            return conflicts
+        
+        # 他のプロセスで追加されたチーム・選手（成績は試合結果の反映で積み上がる）
+        for disk_team in disk_league.teams.values():
+            if league.get_team(disk_team.id) is None:
+                league.add_team(Team(disk_team.id, disk_team.name))
+        for disk_team in disk_league.teams.values():
+            for disk_player in disk_team.players.values():
+                if league.get_player(disk_player.id) is None:
+                    # 移籍した選手は最初の所属チームに追加してから移籍を取り込む
+                    team_id = disk_league.membership.team_of(disk_player.id, FIRST_ROUND) or disk_team.id
+                    league.add_player(team_id, Player(
+                        disk_player.id, disk_player.name, team_id,
+                        disk_player.position, disk_player.age
+                    ))
+        
+        # 試合結果を反映する前に移籍を取り込む（結果を移籍前・移籍後のどちらのチームで数えるかが決まる）
+        for player_id, team_id, from_round in transfers:
+            league.transfer_player(player_id, team_id, from_round, allow_past=True)
+        
+        # 他のプロセスが採番した連番は再利用しない
+        for kind, counter in disk_league.id_counters.items():
+            league.id_counters[kind] = max(league.id_counters.get(kind, 0), counter)
+        
+        for kind, source, match in actions:
+            if kind == "id":
+                league.set_match_id(match, source.id)
+            elif kind == "match":
+                match = league.add_match(Match(
+                    league.get_team(source.home_team.id),
+                    league.get_team(source.away_team.id),
+                    source.date,
+                    source.round_number
+                ))
+                # 保存済みのIDを使う（同じIDをこの端末で別の試合に採番していれば、そちらを付け替える）
+                league.set_match_id(match, source.id)
+                if source.is_finished:
+                    match.set_score(source.home_score, source.away_score, source.overtime)
+                for player_id, result in source.player_results.items():
+                    match.add_player_result(player_id, result)
+            elif kind == "score":
+                match.set_score(source.home_score, source.away_score, source.overtime)
+            else:
+                match.add_player_result(*source)
+        
+        # 他のプロセスで組んだラウンドのバイは、create_swiss_round と同じく不戦勝もチームの成績に加える
+        for round_number, team_id in disk_league.byes.items():
+            if round_number not in league.byes:
+                league.record_bye(round_number, league.get_team(team_id),
+                                  award=round_number not in disk_league.unawarded_byes)
+        
+        league.current_round = max(league.current_round, disk_league.current_round)
+        return []
+    
+    def _read_manifest(self, league_dir):
+        """
+        マニフェストを読み込む
+        
+        Args:
+            league_dir (str): リーグのディレクトリ
+            
+        Returns:
+            dict: マニフェスト、存在しない場合はNone
+        """
+        path = os.path.join(league_dir, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return json.loads(f.read())
+    
+    def _shard_file_name(self, round_number, sha1):
+        """
+        ラウンド番号と内容のハッシュ値からシャードのファイル名を作成
+        
+        Args:
+            round_number (int): ラウンド番号（Noneも可）
+            sha1 (str): シャードの内容のハッシュ値
+            
+        Returns:
+            str: ファイル名
+        """
+        if round_number is None:
+            return f"round_none_{sha1[:12]}.jsonl"
+        return f"round_{round_number:04d}_{sha1[:12]}.jsonl"
+    
+    def _remove_stale_files(self, directory, live_files):
+        """
+        参照されなくなってから一定時間が過ぎたファイルを削除
+        
+        Args:
+            directory (str): 対象のディレクトリ
+            live_files (set): 現在のマニフェストが参照しているファイル名
+        """
+        threshold = time.time() - STALE_FILE_SECONDS
+        for name in os.listdir(directory):
+            if not (name.endswith(".jsonl") or name.startswith("roster")):
+                continue
+            if name in live_files:
+                continue
+            path = os.path.join(directory, name)
+            if os.path.getmtime(path) < threshold:
+                os.remove(path)
+    
+    def _is_clean_shard(self, entries, round_number, rounds_dir, old_entry):
+        """
+        ラウンドの試合が保存済みのシャードから変わっていないか判定
+        
+        すべての試合が同じシャードから未復元のまま順番どおり並んでいれば
+        内容を作り直さずに済む。
+        
+        Args:
+            entries (list): (元データ, Match) のリスト
+            round_number (int): ラウンド番号
+            rounds_dir (str): シャードファイルのあるディレクトリ（os.path.abspath で正規化済み）
+            old_entry (dict): マニフェストの既存のラウンド情報
+            
+        Returns:
+            bool: 書き換え不要ならTrue
+        """
+        if len(entries) != old_entry["count"]:
+            return False
+        reader = None
+        for position, (raw, match) in enumerate(entries):
+            if match is not None or not isinstance(raw, ShardRef):
+                return False
+            if raw.round_number != round_number or raw.position != position:
+                return False
+            if reader is None:
+                reader = raw.reader
+            elif raw.reader is not reader:
+                return False
+        if reader is None:
+            return True
+        # 読み込み元のシャードの確認はラウンドごとに1回だけ行う
+        return os.path.abspath(reader.rounds_dir) == rounds_dir and reader.digest(round_number) == old_entry["sha1"]
+    
+    def _write_atomic(self, path, data, codec="none"):
+        """
+        一時ファイルに書き込んでから置き換える
+        
+        Args:
+            path (str): 書き込み先のパス
+            data (bytes): 書き込む内容
+            codec (str): 圧縮形式
+        """
+        tmp_path = path + ".tmp"
+        with open_for_write(tmp_path, codec) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    
+    def _write_league_json(self, f, league_data, matches):
+        """
+        リーグ情報をJSONとして書き出す
+        
+        試合リストは末尾に1行1試合のコンパクトな形式で書き出すため、
+        遅延読み込み時は試合部分を解析せずに行単位で扱える。
+        出力は通常のJSONとしてもそのまま読み込める。
+        
+        Args:
+            f (file): 書き込み先のファイルオブジェクト（バイナリモード）
+            league_data (dict): 試合以外のリーグ情報
+            matches (list or LazyMatchList): 試合リスト
+        """
+        header = json.dumps(league_data, ensure_ascii=False, indent=2)
+        # 末尾の "\n}" を取り除いて試合リストを続ける
+        f.write(header[:-2].encode("utf-8"))
+        f.write(("," + MATCHES_MARKER.rstrip("\n")).encode("utf-8"))
+        
+        separator = b"\n"
+        for _, raw, match in self._iter_match_entries(matches):
+            f.write(separator)
+            f.write(self._match_bytes(raw, match))
+            separator = b",\n"
+        
+        f.write(b"\n  ]\n}")
+    
+    def _parse_league_json(self, data, lazy):
+        """
+        保存されたJSONデータを解析
+        
+        Args:
+            data (bytes): ファイルの内容（UTF-8）
+            lazy (bool): 試合部分の解析を省略するか
+            
+        Returns:
+            tuple: (リーグ情報 dict, 試合ごとのJSONバイト列のリスト または None)
+        """
+        marker = MATCHES_MARKER.encode("utf-8")
+        marker_pos = data.find(marker)
+        body_start = marker_pos + len(marker)
+        if not lazy or marker_pos < 0 or data.startswith(b" ", body_start):
+            # 通常読み込み、または旧形式（試合もインデント付き）のファイル
+            return json.loads(data), None
+        
+        league_data = json.loads(data[:marker_pos].rstrip(b",") + b"\n}")
+        body_end = data.rfind(b"\n  ]")
+        return league_data, data[body_start:body_end].split(b",\n")
+    
+    def _read_round_number(self, match_data):
+        """
+        試合データを解析せずにラウンド番号だけを取り出す
+        
+        Args:
+            match_data (dict, bytes or ShardRef): 保存形式の試合データ
+            
+        Returns:
+            int: ラウンド番号（未設定の場合はNone）
+        """
+        if isinstance(match_data, ShardRef):
+            return match_data.round_number
+        if not isinstance(match_data, bytes):
+            return match_data["round_number"]
+        
+        key = b'"round_number":'
+        start = match_data.find(key)
+        if start < 0:
+            return json.loads(match_data)["round_number"]
+        start += len(key)
+        value = match_data[start:match_data.find(b",", start)]
+        return None if value == b"null" else int(value)
+    
+    def _read_match_id(self, match_data):
+        """
+        試合データを解析せずに試合IDだけを取り出す
+        
+        Args:
+            match_data (dict, bytes or ShardRef): 保存形式の試合データ
+            
+        Returns:
+            str: 試合ID（未設定の場合はNone）
+        """
+        if isinstance(match_data, ShardRef):
+            match_data = match_data.read()
+        if not isinstance(match_data, bytes):
+            return match_data.get("id")
+        
+        prefix = b'{"id":"'
+        if match_data.startswith(prefix):
+            return match_data[len(prefix):match_data.index(b'"', len(prefix))].decode("utf-8")
+        return json.loads(match_data).get("id")
+    
+    def _read_team_ids(self, match_data):
+        """
+        試合データを解析せずに対戦チームのIDだけを取り出す
+        
+        Args:
+            match_data (dict, bytes or ShardRef): 保存形式の試合データ
+            
+        Returns:
+            tuple: (ホームチームID, アウェイチームID)
+        """
+        if isinstance(match_data, ShardRef):
+            match_data = match_data.read()
+        if isinstance(match_data, bytes):
+            ids = []
+            for key in (b'"home_team_id":"', b'"away_team_id":"'):
+                start = match_data.find(key)
+                if start < 0:
+                    break
+                start += len(key)
+                value = match_data[start:match_data.index(b'"', start)]
+                if b"\\" in value:
+                    # エスケープを含むIDは解析して読み取る
+                    break
+                ids.append(value.decode("utf-8"))
+            if len(ids) == 2:
+                return ids[0], ids[1]
+            match_data = json.loads(match_data)
+        return match_data["home_team_id"], match_data["away_team_id"]
+    
+    def _assign_legacy_match_ids(self, league, raw_matches):
+        """
+        試合IDのない古い形式のデータの試合に、保存順に試合IDを付ける
+        
+        試合データは解析せずにIDを書き加える。シャードへの参照は読み込んだ
+        バイト列に置き換わるため、次の保存で全シャードがIDを含む形式に書き直される。
+        
+        Args:
+            league (League): 試合IDを採番するリーグ
+            raw_matches (list): 保存形式の試合データ(dict, bytes または ShardRef)のリスト
+            
+        Returns:
+            list: 試合IDを書き加えた試合データのリスト
+        """
+        assigned = []
+        for raw in raw_matches:
+            match_id = league.allocate_match_id()
+            if isinstance(raw, ShardRef):
+                raw = raw.read()
+            if isinstance(raw, bytes):
+                raw = b'{"id":"' + match_id.encode("utf-8") + b'",' + raw[1:]
+            else:
+                raw = dict(raw, id=match_id)
+            assigned.append(raw)
+        return assigned
+    
+    def _match_to_dict(self, match):
+        """
+        試合オブジェクトを保存形式に変換
+        
+        Args:
+            match (Match): 試合オブジェクト
+            
+        Returns:
+            dict: 保存形式の試合データ
+        """
+        data = {
+            "id": match.id,  # 先頭に置き、_read_match_id で解析せずに読み取れるようにする
+            "home_team_id": match.home_team.id,
+            "away_team_id": match.away_team.id,
+            "date": match.date.strftime("%Y-%m-%d %H:%M:%S"),
+            "round_number": match.round_number,
+            "home_score": match.home_score,
+            "away_score": match.away_score,
+            "is_finished": match.is_finished,
+            "player_results": match.player_results
+        }
+        if match.overtime:
+            # 延長戦の試合だけに記録する（他の試合の保存形式は変えない）
+            data["overtime"] = True
+        return data
+    
+    def _iter_match_entries(self, matches):
+        """
+        試合リストを保存用に列挙
+        
+        未復元の試合（遅延読み込み）は復元せずに元データのまま返す
+        
+        Args:
+            matches (list or LazyMatchList): 試合リスト
+            
+        Yields:
+            tuple: (ラウンド番号, 元データ または None, 復元済み Match または None)
+        """
+        if isinstance(matches, LazyMatchList):
+            for raw, match in matches.iter_raw():
+                if match is not None:
+                    yield match.round_number, None, match
+                else:
+                    yield self._read_round_number(raw), raw, None
+        else:
+            for match in matches:
+                yield match.round_number, None, match
+    
+    def _match_bytes(self, raw, match):
+        """
+        試合を改行を含まないコンパクトなJSONバイト列に変換
+        
+        Args:
+            raw (dict, bytes or ShardRef): 未復元の試合データ
+            match (Match): 復元済みの試合オブジェクト（未復元ならNone）
+            
+        Returns:
+            bytes: 保存形式の試合データ
+        """
+        if match is not None:
+            raw = self._match_to_dict(match)
+        elif isinstance(raw, ShardRef):
+            return raw.read()
+        elif isinstance(raw, bytes):
+            return raw
+        return json.dumps(raw, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    
+    def _match_from_dict(self, match_data, league):
+        """
+        保存形式の試合データから試合オブジェクトを復元
+        
+        Args:
+            match_data (dict, bytes or ShardRef): 保存形式の試合データ
+            league (League): チームの参照先となるリーグ
+            
+        Returns:
+            Match: 復元した試合オブジェクト
+        """
+        from match_class import Match
+        
+        if isinstance(match_data, ShardRef):
+            match_data = match_data.read()
+        if isinstance(match_data, bytes):
+            match_data = json.loads(match_data)
+        
+        home_team = league.get_team(match_data["home_team_id"])
+        away_team = league.get_team(match_data["away_team_id"])
+        
+        # 試合オブジェクトの作成
+        match_date = datetime.fromisoformat(match_data["date"])
+        match = Match(home_team, away_team, match_date, match_data["round_number"])
+        match.id = match_data.get("id")
+        
+        # 試合結果の復元
+        if match_data["is_finished"]:
+            # スコアの設定だけで、チーム成績は更新しない（すでに復元済み）
+            match.home_score = match_data["home_score"]
+            match.away_score = match_data["away_score"]
+            match.overtime = match_data.get("overtime", False)
+            match.is_finished = True
+        
+        # 選手の試合結果の復元
+        match.player_results = match_data["player_results"]
+        return match
+    
     def get_available_leagues(self):
         """
-        利用可能なリーグファイルの一覧を取得
+        利用可能なリーグの一覧を取得
         
         Returns:
-            list: 保存されているリーグファイル名のリスト
+            list: 保存されているリーグ名のリスト
         """
         try:
-            files = [f for f in os.listdir(self.directory) if f.endswith('.json')]
-            # ファイル名から拡張子を除去
-            leagues = [os.path.splitext(f)[0] for f in files]
-            return leagues
+            leagues = []
+            for entry in sorted(os.listdir(self.directory)):
+                path = os.path.join(self.directory, entry)
+                if os.path.isdir(path):
+                    # ディレクトリ形式のリーグ
+                    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+                        leagues.append(entry)
+                elif entry.endswith('.json'):
+                    # 従来形式のファイル（拡張子を除去）
+                    leagues.append(os.path.splitext(entry)[0])
+            # 両方の形式がある場合は1つにまとめる
+            return list(dict.fromkeys(leagues))
         except Exception as e:
             print(f"リーグファイル一覧の取得中にエラーが発生しました: {e}")
             return []
\ No newline at end of file
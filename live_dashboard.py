@@ -0,0 +1,389 @@
+import argparse
+import json
+import os
+import time
+from league_storage import LeagueStorage
+from match_class import Match
+from scoring_rules import ScoringRules
+
+# 読み込み直しの途中で他の端末が保存した場合に、読み込みをやり直す回数
+LOAD_RETRIES = 3
+
+# 単一ファイル形式で前回との一致部分を探すときに一度に比べる長さ（バイト）
+COMPARE_CHUNK = 1 << 16
+
+# 単一ファイル形式の試合データの区切り
+LINE_SEPARATOR = b",\n"
+
+def _common_prefix_length(old, new):
+    """
+    2つのbytesの先頭から一致する長さ
+    
+    Args:
+        old (bytes): 前回のデータ
+        new (bytes): 今回のデータ
+        
+    Returns:
+        int: 一致する長さ
+    """
+    size = min(len(old), len(new))
+    start = 0
+    while start < size and new.startswith(old[start:start + COMPARE_CHUNK], start):
+        start += COMPARE_CHUNK
+    if start >= size:
+        return size
+    
+    # 一致しない区間の中を二分探索
+    low, high = start, min(start + COMPARE_CHUNK, size)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if new.startswith(old[start:middle], start):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def _common_suffix_length(old, new, limit):
+    """
+    2つのbytesの末尾から一致する長さ
+    
+    Args:
+        old (bytes): 前回のデータ
+        new (bytes): 今回のデータ
+        limit (int): 調べる長さの上限
+        
+    Returns:
+        int: 一致する長さ（limit 以下）
+    """
+    matched = 0
+    while matched < limit:
+        step = min(COMPARE_CHUNK, limit - matched)
+        old_end = len(old) - matched
+        new_end = len(new) - matched
+        if not new.endswith(old[old_end - step:old_end], 0, new_end):
+            break
+        matched += step
+    else:
+        return limit
+    
+    # 一致しない区間の中を二分探索
+    low, high = 0, step - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if new.endswith(old[old_end - middle:old_end], 0, new_end):
+            low = middle
+        else:
+            high = middle - 1
+    return matched + low
+
+def _split_lines(data):
+    """
+    試合データのbytesを1試合ずつに分ける
+    
+    Args:
+        data (bytes): 試合データを ",\\n" でつないだもの
+        
+    Returns:
+        list: 試合データ(bytes)のリスト
+    """
+    return data.split(LINE_SEPARATOR) if data else []
+
+def changed_lines(old, new):
+    """
+    単一ファイル形式の試合リストを比べ、変わった部分の試合データを取り出す
+    
+    先頭・末尾の一致する部分を試合の区切りの単位で除き、残りだけを分割する。
+    試合の追加などで前後の数が合わない場合は、先頭の一致部分だけを除く。
+    
+    Args:
+        old (bytes): 前回の試合リスト
+        new (bytes): 今回の試合リスト
+        
+    Returns:
+        tuple: (前回の試合データのリスト, 今回の試合データのリスト)（同じ位置が同じ試合）
+    """
+    prefix = _common_prefix_length(old, new)
+    start = old.rfind(LINE_SEPARATOR, 0, prefix)
+    start = 0 if start < 0 else start + len(LINE_SEPARATOR)
+    
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - start)
+    old_end = old.find(LINE_SEPARATOR, len(old) - suffix)
+    if old_end < 0:
+        old_end = len(old)
+    new_end = old_end + len(new) - len(old)
+    
+    old_lines = _split_lines(old[start:old_end])
+    new_lines = _split_lines(new[start:new_end])
+    if len(old_lines) != len(new_lines):
+        old_lines = _split_lines(old[start:])
+        new_lines = _split_lines(new[start:])
+    return old_lines, new_lines
+
+class LeagueWatcher:
+    def __init__(self, storage, league_name):
+        """
+        保存済みのリーグを監視し、変更を読み込むクラス（読み取り専用）
+        
+        保存ファイルの更新時刻・サイズを確認し、変わっていれば変更された
+        試合データだけを読んで、新しく入力された結果をチーム・選手の成績に反映する。
+        入力済みの結果が書き換えられた場合や、チーム・選手の追加・移籍があった場合など
+        差分で扱えない変更のときだけリーグ全体を読み込み直す。
+        
+        差分の反映ではチーム・選手の成績（順位表・ランキング）だけを更新し、
+        リーグの試合リストは更新しない。
+        
+        Args:
+            storage (LeagueStorage): リーグの読み込みに使うストレージ
+            league_name (str): 監視するリーグ名（保存ファイル名）
+        """
+        self.storage = storage
+        self.league_name = league_name
+        self.league = None
+        self.match_count = 0
+        self._signature = None  # 前回確認した保存ファイルの (更新時刻, サイズ)
+        self._rounds = {}       # ラウンド番号 -> (ハッシュ値, 試合データ(bytes)のリスト)
+                                # （単一ファイル形式では {None: (None, 試合リスト全体(bytes))}）
+        self._counts = None     # 前回読み込んだ (チーム数, 選手数, 移籍の回数)
+        self.last_refresh = None  # 直前の更新 ("full" または "incremental", 反映した試合数, 秒)
+    
+    def refresh(self):
+        """
+        保存ファイルが変わっていれば読み込む
+        
+        Returns:
+            bool: リーグを更新したらTrue
+        """
+        signature = self.storage.get_league_signature(self.league_name)
+        if signature is None or signature == self._signature:
+            return False
+        
+        start = time.perf_counter()
+        if self.league is not None:
+            applied = self._refresh_incremental()
+            if applied is not None:
+                self._signature = signature
+                self.last_refresh = ("incremental", applied, time.perf_counter() - start)
+                return True
+        
+        if not self._load_full():
+            return False
+        self._signature = signature
+        self.last_refresh = ("full", self.match_count, time.perf_counter() - start)
+        return True
+    
+    def _load_full(self):
+        """
+        リーグ全体を読み込み直す
+        
+        Returns:
+            bool: 読み込みに成功したらTrue
+        """
+        for _ in range(LOAD_RETRIES):
+            updates = self.storage.read_match_updates(self.league_name, {})
+            league = self.storage.load_league(self.league_name, lazy=True)
+            if league is None:
+                return False
+            if updates is not None and updates["version"] != league.version:
+                # 2つの読み込みの間に保存された
+                continue
+            
+            self.league = league
+            self.match_count = len(league.matches)
+            if updates is None:
+                # 差分を扱えない形式（毎回全体を読み込む）
+                self._rounds = {}
+                self._counts = None
+            else:
+                self._rounds = updates["rounds"]
+                self._counts = (updates["team_count"], updates["player_count"], updates["transfer_count"])
+            return True
+        return False
+    
+    def _refresh_incremental(self):
+        """
+        変更された試合データだけを読み、新しい結果を反映する
+        
+        Returns:
+            int: 反映した試合数、差分で扱えない場合はNone（リーグは変更しない）
+        """
+        if self._counts is None:
+            return None
+        digests = {round_number: digest for round_number, (digest, _) in self._rounds.items()}
+        updates = self.storage.read_match_updates(self.league_name, digests)
+        if updates is None:
+            return None
+        if updates["version"] == self.league.version:
+            return 0
+        if (updates["team_count"], updates["player_count"], updates["transfer_count"]) != self._counts:
+            # チーム・選手の追加・移籍は保存済みの名簿・所属履歴から読み込み直す
+            return None
+        if set(updates["round_numbers"]) != set(self._rounds) | set(updates["rounds"]):
+            # ラウンドが削除された
+            return None
+        
+        # すべての差分を確認してから反映する（途中で扱えない変更が見つかっても成績を変えない）
+        actions = []
+        for round_number, (_, lines) in updates["rounds"].items():
+            if round_number is None:
+                old_lines, lines = changed_lines(self._rounds[None][1], lines)
+            else:
+                old_lines = self._rounds.get(round_number, (None, []))[1]
+            round_actions = self._diff_lines(old_lines, lines)
+            if round_actions is None:
+                return None
+            actions.extend(round_actions)
+        
+        for new_match, home_team, away_team, round_number, match_id, score, player_results in actions:
+            # 移籍した選手の成績は試合のラウンドの時点の所属チームで数えるため、ラウンド番号も渡す
+            match = Match(home_team, away_team, round_number=round_number)
+            match.id = match_id
+            if score is not None:
+                match.set_score(*score)
+            for player_id, result in player_results:
+                match.add_player_result(player_id, result)
+            self.match_count += new_match
+        
+        rules = updates["scoring_rules"]
+        if rules is not None and rules != self.league.scoring_rules.to_dict():
+            # 勝点の計算方法の変更は次の順位表の取得でまとめて計算し直す
+            self.league.set_scoring_rules(ScoringRules.from_dict(rules))
+        
+        self._rounds.update(updates["rounds"])
+        self.league.version = updates["version"]
+        self.league.current_round = updates["current_round"] or self.league.current_round
+        return len(actions)
+    
+    def _diff_lines(self, old_lines, new_lines):
+        """
+        ラウンド（単一ファイル形式では全体）の試合データを比べ、反映する内容を求める
+        
+        Args:
+            old_lines (list): 前回の試合データ(bytes)のリスト
+            new_lines (list): 今回の試合データ(bytes)のリスト
+            
+        Returns:
+            list: [(新しい試合なら1, ホーム, アウェイ, ラウンド番号, 試合ID, (得点, 得点, 延長) または None,
+                新しい選手成績のリスト), ...]、差分で扱えない場合はNone
+        """
+        if len(new_lines) < len(old_lines):
+            return None
+        
+        actions = []
+        for i, line in enumerate(new_lines):
+            old_line = old_lines[i] if i < len(old_lines) else None
+            if line == old_line:
+                continue
+            
+            data = json.loads(line)
+            home_team = self.league.get_team(data["home_team_id"])
+            away_team = self.league.get_team(data["away_team_id"])
+            if home_team is None or away_team is None:
+                return None
+            
+            score = (data["home_score"], data["away_score"], data.get("overtime", False)) if data["is_finished"] else None
+            player_results = data["player_results"]
+            if old_line is not None:
+                old_data = json.loads(old_line)
+                if (old_data["home_team_id"], old_data["away_team_id"]) != (data["home_team_id"], data["away_team_id"]):
+                    return None
+                if old_data["is_finished"]:
+                    # 入力済みのスコアの書き換え・取り消しは差分で扱えない
+                    if score != (old_data["home_score"], old_data["away_score"], old_data.get("overtime", False)):
+                        return None
+                    score = None
+                old_results = old_data["player_results"]
+                if any(player_results.get(player_id) != result for player_id, result in old_results.items()):
+                    return None
+                player_results = {
+                    player_id: result for player_id, result in player_results.items()
+                    if player_id not in old_results
+                }
+            
+            actions.append((
+                1 if old_line is None else 0, home_team, away_team, data["round_number"], data.get("id"),
+                score, list(player_results.items())
+            ))
+        return actions
+
+class LiveDashboard:
+    def __init__(self, watcher, interval=1.0, top=10):
+        """
+        順位表・ランキングを表示し、保存ファイルが変わるたびに更新する画面
+        
+        Args:
+            watcher (LeagueWatcher): 監視するリーグ
+            interval (float): 保存ファイルを確認する間隔（秒）
+            top (int): 選手ランキングの表示人数
+        """
+        self.watcher = watcher
+        self.interval = interval
+        self.top = top
+    
+    def render(self):
+        """
+        画面の内容を作成
+        
+        Returns:
+            str: 表示する文字列
+        """
+        league = self.watcher.league
+        lines = [
+            "=" * 70,
+            f" {league.name}  Round {league.current_round}  （{self.watcher.match_count}試合・保存 v{league.version}）",
+            "=" * 70,
+            "",
+            f"{'順位':<4} {'チーム':<20} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'勝点':<4} {'得失':<5} {'直近':<6} {'連続':<6}"
+        ]
+        for rank, (team, points, _, goal_diff) in enumerate(league.get_standings(), 1):
+            lines.append(
+                f"{rank:<4} {team.name:<20} {team.matches_played:<4} {team.wins:<4} {team.draws:<4} "
+                f"{team.losses:<4} {points:<4} {goal_diff:<+5} {team.form.recent():<6} {team.form.streak():<6}"
+            )
+        
+        players, scores = league.rank_players()
+        lines += ["", f"選手勝率ランキング（上位{self.top}人）", f"{'順位':<4} {'選手名':<20} {'試合':<4} {'勝率':<6}"]
+        for rank, (player, score) in enumerate(zip(players[:self.top], scores), 1):
+            lines.append(f"{rank:<4} {player.name:<20} {player.matches_played:<4} {score:.3f}")
+        
+        kind, applied, seconds = self.watcher.last_refresh
+        label = "差分" if kind == "incremental" else "全体"
+        lines += ["", f"最終更新: {time.strftime('%H:%M:%S')}（{label}の読み込み {applied}試合, {seconds * 1000:.1f}ms）",
+                  "Ctrl+Cで終了"]
+        return "\n".join(lines)
+    
+    def run(self):
+        """
+        保存ファイルを監視して表示を更新し続ける
+        """
+        while True:
+            if self.watcher.refresh():
+                os.system('cls' if os.name == 'nt' else 'clear')
+                print(self.render())
+            time.sleep(self.interval)
+
+def main():
+    """
+    ライブ表示の起動
+    """
+    parser = argparse.ArgumentParser(description="保存済みのリーグの順位表・ランキングを自動で更新しながら表示する")
+    parser.add_argument("league", help="表示するリーグ名（保存ファイル名）")
+    parser.add_argument("--data", default="data", help="データディレクトリ")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="保存ファイルを確認する間隔（秒）")
+    parser.add_argument("--top", type=int, default=10, help="選手ランキングの表示人数")
+    args = parser.parse_args()
+    
+    watcher = LeagueWatcher(LeagueStorage(args.data), args.league)
+    if not watcher.refresh():
+        print(f"リーグ「{args.league}」を読み込めませんでした。")
+        raise SystemExit(1)
+    
+    dashboard = LiveDashboard(watcher, args.interval, args.top)
+    try:
+        print(dashboard.render())
+        dashboard.run()
+    except KeyboardInterrupt:
+        print("\n表示を終了します。")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
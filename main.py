@@ -1,21 +1,96 @@
 # 必要なクラスをインポート
-from player_class import Player
-from team_class import Team
-from match_class import Match
+import argparse
 from league_class import League
 from ui_class import LeagueUI
 
+def parse_args():
+    """
+    コマンドライン引数の解析
+    """
+    parser = argparse.ArgumentParser(description="勝率チェッカー")
+    parser.add_argument("--metrics", action="store_true",
+                        help="主要な処理の呼び出し回数・時間を計測し、終了時に表示する")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="セッション全体を cProfile/tracemalloc で計測し、レポートを DIR に書き出す")
+    parser.add_argument("--league", metavar="NAME",
+                        help="保存済みの大会を開いて起動する（省略時は前回開いた大会）")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="前回開いた大会のキャッシュを使わない（常に保存ファイルから読み込む）")
+    return parser.parse_args()
+
 def main():
     """
     メイン処理
     """
+    args = parse_args()
+    
+    if args.metrics:
+        import instrumentation
+        instrumentation.enable()
+    
+    if args.profile:
+        from instrumentation import SessionProfiler
+        with SessionProfiler(args.profile):
+            run_session(args.league, not args.no_cache)
+        print(f"プロファイル結果を {args.profile} に書き出しました。")
+    else:
+        run_session(args.league, not args.no_cache)
+    
+    if args.metrics:
+        print(instrumentation.format_report())
+
+def open_league(league_name=None, use_cache=True):
+    """
+    起動時に開く大会を用意
+    
+    大会名を指定した場合は保存済みの大会を、省略した場合は前回開いた大会を開く。
+    キャッシュが使えればJSONの解析をせずにすぐ開く（session_cache.py）。
+    
+    Args:
+        league_name (str, optional): 大会名
+        use_cache (bool): 前回開いた大会のキャッシュを使うか
+        
+    Returns:
+        tuple: (League または None, SessionCache または None)
+    """
+    cache = None
+    if use_cache:
+        from session_cache import SessionCache
+        cache = SessionCache()
+    
+    if league_name:
+        if cache:
+            league = cache.open(league_name)
+        else:
+            from league_storage import LeagueStorage
+            league = LeagueStorage().load_league(league_name, lazy=True)
+        if league is None:
+            # 保存されていない大会名は新しい大会として始める
+            league = League(league_name)
+        return league, cache
+    
+    # 前回の大会（メインメニューの見出しに大会名が表示される）
+    league = cache.load() if cache else None
+    return league, cache
+
+def run_session(league_name=None, use_cache=True):
+    """
+    コンソールUIのセッション
+    
+    Args:
+        league_name (str, optional): 起動時に開く大会名（省略時は前回開いた大会）
+        use_cache (bool): 前回開いた大会のキャッシュを使うか
+    """
     try:
-        # リーグの作成
-        league_name = input("リーグ名を入力してください: ")
-        league = League(league_name)
+        league, cache = open_league(league_name, use_cache)
+        if league is None:
+            # リーグの作成
+            league_name = input("リーグ名を入力してください: ")
+            league = League(league_name)
         
         # UIの作成
         ui = LeagueUI(league)
+        ui.session_cache = cache
         
         # メインループ
         while True:
@@ -31,8 +106,15 @@ def main():
                 ui.stats_menu()
             elif command == "5":
                 ui.file_menu()  # ファイル操作メニュー
+            elif command == "6":
+                ui.tournament_menu()
+            elif command == "7":
+                ui.search_menu()
+            elif command == "99":
+                ui.show_metrics()  # 計測結果の表示（メニューには表示しない）
             elif command == "0":
-                # 終了前に保存確認
+                # 終了前に保存確認（読み込みメニューで開き直した大会も対象）
+                league = ui.league
                 if league.teams or league.matches:
                     save_confirm = input("大会データを保存しますか？ (y/n): ")
                     if save_confirm.lower() == 'y':
@@ -40,6 +122,8 @@ def main():
                         storage = LeagueStorage()
                         if storage.save_league(league):
                             print(f"大会「{league.name}」のデータを保存しました。")
+                            if cache:
+                                cache.store(league)
                         else:
                             print("保存に失敗しました。")
                 
@@ -1,6 +1,13 @@
 from datetime import datetime
+from itertools import count
+
+# score_version の採番（複数のスレッドから呼ばれても値が重ならない）
+_score_versions = count(1)
 
 class Match:
+    # set_score が呼ばれるたびに増える値（集計結果のキャッシュの判定に使う）
+    score_version = 0
+    
     def __init__(self, home_team, away_team, date=None, round_number=None):
         """
         試合情報
@@ -11,6 +18,7 @@ class Match:
             date (datetime, optional): 試合日
             round_number (int, optional): ラウンド数
         """
+        self.id = None  # 試合ID（League.add_match で採番し、保存ファイルにも記録する）
         self.home_team = home_team
         self.away_team = away_team
         self.date = date if date else datetime.now()
@@ -20,35 +28,58 @@ class Match:
         self.home_score = None
         self.away_score = None
         self.is_finished = False
+        self.overtime = False  # 延長戦・PK戦で決着したか
         
         # 選手の結果（選手ID -> 結果）
         self.player_results = {}
     
-    def set_score(self, home_score, away_score):
+    def set_score(self, home_score, away_score, overtime=False):
         """
         スコアをセット
         
+        結果の入力は1試合につき1回だけ反映し、入力済みの試合への再入力
+        （同じ結果の二重送信など）は無視する。複数のスレッドから同時に呼ばれても、
+        両チームの成績はまとめて更新される（順位表には更新前か更新後の状態だけが見える）。
+        
         Args:
             home_score (int): ホームチームの得点
             away_score (int): アウェイチームの得点
+            overtime (bool): 延長戦・PK戦で決着したか（引き分けの場合は無視する）
+            
+        Returns:
+            bool: 反映したらTrue、入力済みの試合の場合はFalse
         """
-        self.home_score = home_score
-        self.away_score = away_score
-        self.is_finished = True
-        
-        # チームの成績を更新
         if home_score > away_score:
             # ホームチームの勝ち
-            self.home_team.add_match_result(home_score, away_score, '○')
-            self.away_team.add_match_result(away_score, home_score, '×')
+            home_result, away_result = '○', '×'
         elif home_score < away_score:
             # アウェイチームの勝ち
-            self.home_team.add_match_result(home_score, away_score, '×')
-            self.away_team.add_match_result(away_score, home_score, '○')
+            home_result, away_result = '×', '○'
         else:
             # 引き分け
-            self.home_team.add_match_result(home_score, away_score, '△')
-            self.away_team.add_match_result(away_score, home_score, '△')
+            home_result, away_result = '△', '△'
+            overtime = False
+        
+        home_team = self.home_team
+        away_team = self.away_team
+        if home_team.id <= away_team.id:
+            first, second = home_team.lock, away_team.lock
+        else:
+            first, second = away_team.lock, home_team.lock
+        
+        # 試合の結果は両チームのロックを（チームIDの順に）取得してから変更する
+        with first, second:
+            if self.is_finished:
+                return False
+            # チームの成績を更新
+            home_team.add_match_result(home_score, away_score, home_result, overtime)
+            away_team.add_match_result(away_score, home_score, away_result, overtime)
+            self.home_score = home_score
+            self.away_score = away_score
+            self.overtime = overtime
+            self.is_finished = True
+        Match.score_version = next(_score_versions)
+        return True
     
     def set_score_by_symbols(self, result_symbol):
         """
@@ -56,9 +87,9 @@ class Match:
         
         Args:
             result_symbol (str): 例 "○-×" (ホームの勝ち) or "×-○" (アウェイの勝ち) or "△-△" (引き分け)
-        
+            
         Returns:
-            bool: 設定に成功したらTrue
+            bool: 設定に成功したらTrue（記号が不正な場合・入力済みの試合の場合はFalse）
         """
         symbols = result_symbol.split('-')
         if len(symbols) != 2:
@@ -74,29 +105,70 @@ class Match:
         
         # 仮のスコアを設定
         if home_symbol == '○':
-            self.set_score(1, 0)  # ホームの勝ち
+            return self.set_score(1, 0)  # ホームの勝ち
         elif home_symbol == '×':
-            self.set_score(0, 1)  # アウェイの勝ち
+            return self.set_score(0, 1)  # アウェイの勝ち
         else:
-            self.set_score(0, 0)  # 引き分け
+            return self.set_score(0, 0)  # 引き分け
+    
+    def team_of_player(self, player_id):
+        """
+        選手がこの試合でどちらのチームに所属していたかを取得
         
-        return True
+        移籍した選手は試合のラウンドの時点の所属（リーグの所属履歴）で判定する。
+        
+        Args:
+            player_id (str): 選手ID
+            
+        Returns:
+            Team: 選手の所属チーム、どちらのチームにも所属していない場合はNone
+        """
+        membership = self.home_team.membership
+        if membership is not None and membership.has_history(player_id):
+            team_id = membership.team_of(player_id, self.round_number)
+            if team_id == self.home_team.id:
+                return self.home_team
+            if team_id == self.away_team.id:
+                return self.away_team
+            return None
+        if player_id in self.home_team.players:
+            return self.home_team
+        if player_id in self.away_team.players:
+            return self.away_team
+        return None
     
     def add_player_result(self, player_id, result):
         """
         選手の試合結果を追加
         
+        1試合につき選手ごとに1回だけ反映し、登録済みの選手への再入力は無視する。
+        移籍した選手の成績は、試合のラウンドの時点の所属チームでの成績としても集計する。
+        
         Args:
             player_id (str): 選手ID
             result (str): '○' (勝ち), '×' (負け), or '△' (引き分け)
+            
+        Returns:
+            bool: 反映したらTrue、この試合で登録済みの選手の場合はFalse
         """
-        self.player_results[player_id] = result
-        
         # 選手の所属チームを特定して選手の成績も更新
-        if player_id in self.home_team.players:
-            self.home_team.players[player_id].add_result(result)
-        elif player_id in self.away_team.players:
-            self.away_team.players[player_id].add_result(result)
+        # （同じ選手の結果は所属チームのロックを取得してから変更する）
+        team = self.team_of_player(player_id)
+        if team is None:
+            if player_id in self.player_results:
+                return False
+            self.player_results[player_id] = result
+            return True
+        
+        with team.lock:
+            if player_id in self.player_results:
+                return False
+            self.player_results[player_id] = result
+            if team.membership is not None and team.membership.has_history(player_id):
+                team.membership.add_result(player_id, team.id, result)
+            else:
+                team.players[player_id].add_result(result)
+        return True
     
     def __str__(self):
         """
@@ -106,6 +178,7 @@ class Match:
         date_str = self.date.strftime("%Y-%m-%d")
         
         if self.is_finished:
-            return f"{round_info}{self.home_team.name} {self.home_score}-{self.away_score} {self.away_team.name} ({date_str})"
+            overtime = " (延長)" if self.overtime else ""
+            return f"{round_info}{self.home_team.name} {self.home_score}-{self.away_score}{overtime} {self.away_team.name} ({date_str})"
         else:
             return f"{round_info}{self.home_team.name} vs {self.away_team.name} ({date_str})"
\ No newline at end of file
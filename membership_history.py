@@ -0,0 +1,234 @@
+import threading
+from bisect import bisect_right
+
+# 移籍前の所属の開始ラウンド（移籍していない選手は最初のラウンドから所属しているものとする）
+FIRST_ROUND = 1
+
+# チームごとの選手成績の並び
+STAT_FIELDS = ("matches_played", "wins", "losses", "draws")
+
+class MembershipHistory:
+    def __init__(self, players):
+        """
+        選手の所属履歴（選手, チーム, 有効開始ラウンド）とチームごとの在籍期間の索引
+        
+        移籍したことのある選手だけを記録し、移籍していない選手は全ラウンドで
+        現在のチームに所属しているものとして扱う。在籍期間は
+        [開始ラウンド, 終了ラウンド) の区間としてチームごとに開始ラウンドの順に並べ、
+        「ラウンドNの時点の選手」は開始がN以下の区間を二分探索で取り出して終了で絞り込む。
+        移籍した選手の成績はチームごとにも集計し、試合を調べずに答える。
+        
+        Args:
+            players (dict): 選手ID -> Playerオブジェクト（リーグの選手IDの索引を共有する）
+        """
+        self._players = players
+        self._spells = {}       # 選手ID -> [[開始ラウンド, 終了ラウンド(在籍中はNone), チームID, 選手ID], ...]（開始順）
+        self._team_spells = {}  # チームID -> 在籍期間のリスト（開始ラウンド順。_spells と同じリストを共有）
+        self._team_starts = {}  # チームID -> 各在籍期間の開始ラウンド（二分探索用）
+        self._stats = {}        # 選手ID -> {チームID: [試合数, 勝利数, 敗北数, 引き分け数]}
+        
+        # 移籍した選手の成績の更新は、試合のどちらのチームのロックでも起こるためまとめて排他制御する
+        self._lock = threading.RLock()
+    
+    def __getstate__(self):
+        """
+        保存用の状態（ロックは保存できないため除く。session_cache.py で使用）
+        """
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def has_history(self, player_id):
+        """
+        選手に移籍の記録があるか
+        
+        Args:
+            player_id (str): 選手ID
+            
+        Returns:
+            bool: 移籍したことがあればTrue
+        """
+        return player_id in self._spells
+    
+    def transferred_player_ids(self):
+        """
+        移籍したことのある選手のID
+        
+        Returns:
+            list: 選手IDのリスト
+        """
+        return list(self._spells)
+    
+    def transfer_count(self):
+        """
+        記録した移籍の回数（保存ファイルの所属履歴が変わったかの確認用）
+        
+        Returns:
+            int: 全選手の移籍の回数の合計
+        """
+        return sum(len(spells) - 1 for spells in self._spells.values())
+    
+    def spells(self, player_id):
+        """
+        選手の所属履歴を取得
+        
+        Args:
+            player_id (str): 選手ID
+            
+        Returns:
+            list: [(開始ラウンド, チームID), ...]（開始順）、移籍したことがない場合は空のリスト
+        """
+        return [(spell[0], spell[2]) for spell in self._spells.get(player_id, [])]
+    
+    def transfer(self, player_id, from_team_id, to_team_id, from_round):
+        """
+        移籍を記録
+        
+        最初の移籍では、それまでの成績を移籍前のチームでの成績として記録する。
+        
+        Args:
+            player_id (str): 選手ID
+            from_team_id (str): 移籍前のチームID
+            to_team_id (str): 移籍先のチームID
+            from_round (int): 移籍先の所属が有効になるラウンド
+            
+        Returns:
+            bool: 記録したらTrue、前回の移籍（または最初の所属）と同じかそれより前のラウンドの場合はFalse
+        """
+        with self._lock:
+            spells = self._spells.get(player_id)
+            if spells is None:
+                if from_round <= FIRST_ROUND:
+                    return False
+                player = self._players[player_id]
+                spells = self._spells[player_id] = []
+                self._add_spell(player_id, from_team_id, FIRST_ROUND)
+                self._stats[player_id] = {from_team_id: [getattr(player, field) for field in STAT_FIELDS]}
+            elif from_round <= spells[-1][0]:
+                return False
+            
+            spells[-1][1] = from_round
+            self._add_spell(player_id, to_team_id, from_round)
+            self._stats[player_id].setdefault(to_team_id, [0] * len(STAT_FIELDS))
+            return True
+    
+    def _add_spell(self, player_id, team_id, start):
+        """
+        在籍期間を選手の履歴とチームの索引に加える
+        
+        Args:
+            player_id (str): 選手ID
+            team_id (str): チームID
+            start (int): 開始ラウンド
+        """
+        spell = [start, None, team_id, player_id]
+        self._spells[player_id].append(spell)
+        starts = self._team_starts.setdefault(team_id, [])
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        self._team_spells.setdefault(team_id, []).insert(position, spell)
+    
+    def team_of(self, player_id, round_number=None):
+        """
+        指定ラウンドの時点の所属チームを取得
+        
+        Args:
+            player_id (str): 選手ID
+            round_number (int, optional): ラウンド番号（省略時は最新の所属）
+            
+        Returns:
+            str: チームID、移籍したことがない選手の場合はNone
+        """
+        spells = self._spells.get(player_id)
+        if spells is None:
+            return None
+        if round_number is not None:
+            for start, _, team_id, _ in reversed(spells):
+                if start <= round_number:
+                    return team_id
+            return spells[0][2]
+        return spells[-1][2]
+    
+    def squad_ids(self, team_id, round_number):
+        """
+        指定ラウンドの時点でチームに在籍している、移籍したことのある選手のID
+        
+        Args:
+            team_id (str): チームID
+            round_number (int): ラウンド番号
+            
+        Returns:
+            list: 選手IDのリスト（在籍期間の開始順）
+        """
+        starts = self._team_starts.get(team_id)
+        if not starts:
+            return []
+        candidates = self._team_spells[team_id][:bisect_right(starts, round_number)]
+        return [player_id for _, end, _, player_id in candidates if end is None or end > round_number]
+    
+    def add_result(self, player_id, team_id, result):
+        """
+        移籍したことのある選手の試合結果を追加（選手の通算成績とチームごとの成績）
+        
+        Args:
+            player_id (str): 選手ID
+            team_id (str): 試合に出場したときの所属チームID
+            result (str): '○' (勝ち), '×' (負け), or '△' (引き分け)
+        """
+        with self._lock:
+            stats = self._stats[player_id].setdefault(team_id, [0] * len(STAT_FIELDS))
+            stats[0] += 1
+            if result == '○':
+                stats[1] += 1
+            elif result == '×':
+                stats[2] += 1
+            elif result == '△':
+                stats[3] += 1
+            self._players[player_id].add_result(result)
+    
+    def team_stats(self, team_id):
+        """
+        チームに在籍したことのある、移籍した選手のそのチームでの成績
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            dict: 選手ID -> (試合数, 勝利数, 敗北数, 引き分け数)
+        """
+        player_ids = dict.fromkeys(spell[3] for spell in self._team_spells.get(team_id, []))
+        return {player_id: tuple(self._stats[player_id][team_id]) for player_id in player_ids}
+    
+    def to_dict(self):
+        """
+        保存形式に変換
+        
+        Returns:
+            dict: 選手ID -> {"spells": [[開始ラウンド, チームID], ...], "stats": {チームID: [試合数, 勝, 敗, 分]}}
+        """
+        return {
+            player_id: {
+                "spells": [[start, team_id] for start, _, team_id, _ in spells],
+                "stats": {team_id: list(stats) for team_id, stats in self._stats[player_id].items()}
+            }
+            for player_id, spells in self._spells.items()
+        }
+    
+    def restore(self, data):
+        """
+        保存形式から所属履歴を復元
+        
+        Args:
+            data (dict): to_dict の形式のデータ
+        """
+        for player_id, player_data in data.items():
+            self._spells[player_id] = []
+            for start, team_id in player_data["spells"]:
+                if self._spells[player_id]:
+                    self._spells[player_id][-1][1] = start
+                self._add_spell(player_id, team_id, start)
+            self._stats[player_id] = {team_id: list(stats) for team_id, stats in player_data["stats"].items()}
\ No newline at end of file
@@ -0,0 +1,202 @@
+import heapq
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from itertools import islice
+
+# 前方一致で調べる名前の数の上限（1文字だけの入力などで候補が多すぎる場合）
+PREFIX_SCAN_LIMIT = 200
+
+# 3文字組の一致率がこれ未満の名前は候補にしない
+MIN_SIMILARITY = 0.3
+
+# 候補がこの数に達したら、より多くの名前に含まれる3文字組からは候補を集めない
+CANDIDATE_TARGET = 500
+
+# 3文字組の一致率を計算する候補の数の上限（「Player」のようなありふれた3文字組しかない場合）
+CANDIDATE_LIMIT = 2000
+
+# 名前の先頭・末尾を表す文字（短い名前や先頭の一致も3文字組に含めるため）
+_START = "\x02"
+_END = "\x03"
+
+def normalize_name(text):
+    """
+    検索用に名前を正規化
+    
+    全角・半角（英数字・カナ）をそろえ、大文字小文字を区別せず、
+    ひらがなはカタカナに変換し、空白を取り除く。
+    
+    Args:
+        text (str): 名前
+        
+    Returns:
+        str: 正規化した名前
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    chars = []
+    for char in text:
+        if char.isspace():
+            continue
+        if "ぁ" <= char <= "ゖ":
+            # ひらがな -> カタカナ
+            char = chr(ord(char) + 0x60)
+        chars.append(char)
+    return "".join(chars)
+
+def _trigrams(normalized):
+    """
+    正規化した名前の3文字組の集合
+    
+    Args:
+        normalized (str): 正規化した名前
+        
+    Returns:
+        set: 3文字組の集合
+    """
+    padded = _START + normalized + _END
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameIndex:
+    def __init__(self):
+        """
+        名前の部分一致・あいまい検索用の索引
+        
+        正規化した名前の並び（前方一致用）と、3文字組 -> 名前の番号 の転置索引を持つ。
+        検索は入力の3文字組を含む名前だけを調べるため、登録数が多くても速い。
+        """
+        self._entries = {}   # 番号 -> (正規化した名前, 3文字組の数, 対象)
+        self._numbers = {}   # id(対象) -> 番号
+        self._sorted = []    # (正規化した名前, 番号) の昇順リスト
+        self._grams = {}     # 3文字組 -> 番号の集合
+        self._exact = {}     # 正規化した名前 -> 番号のリスト
+        self._next_number = 0
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, name, item):
+        """
+        名前を登録（同じ対象が登録済みなら置き換える）
+        
+        Args:
+            name (str): 名前
+            item (object): 検索結果として返す対象（TeamやPlayer）
+        """
+        self.remove(item)
+        normalized = normalize_name(name)
+        grams = _trigrams(normalized)
+        
+        number = self._next_number
+        self._next_number += 1
+        self._entries[number] = (normalized, len(grams), item)
+        self._numbers[id(item)] = number
+        insort(self._sorted, (normalized, number))
+        self._exact.setdefault(normalized, []).append(number)
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(number)
+    
+    def remove(self, item):
+        """
+        登録を取り消す
+        
+        Args:
+            item (object): 登録した対象
+            
+        Returns:
+            bool: 登録されていればTrue
+        """
+        number = self._numbers.pop(id(item), None)
+        if number is None:
+            return False
+        normalized, _, _ = self._entries.pop(number)
+        
+        position = bisect_left(self._sorted, (normalized, number))
+        del self._sorted[position]
+        numbers = self._exact[normalized]
+        numbers.remove(number)
+        if not numbers:
+            del self._exact[normalized]
+        for gram in _trigrams(normalized):
+            postings = self._grams[gram]
+            postings.discard(number)
+            if not postings:
+                del self._grams[gram]
+        return True
+    
+    def exact(self, name):
+        """
+        正規化した名前が一致する対象を取得
+        
+        Args:
+            name (str): 名前
+            
+        Returns:
+            list: 一致した対象のリスト（登録順）
+        """
+        return [self._entries[number][2] for number in self._exact.get(normalize_name(name), [])]
+    
+    def search(self, query, limit=10):
+        """
+        名前の候補を一致度の高い順に取得
+        
+        完全一致 > 前方一致（入力が名前に占める割合が大きいほど上位） >
+        3文字組の一致率（Dice係数）の順に並べる。
+        
+        Args:
+            query (str): 入力された名前（一部・表記ゆれを含んでよい）
+            limit (int): 返す候補の数
+            
+        Returns:
+            list: [(対象, 一致度), ...]（一致度は 0.0 ~ 1.0）
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        
+        scores = {}
+        
+        # 前方一致
+        position = bisect_left(self._sorted, (normalized,))
+        end = min(position + PREFIX_SCAN_LIMIT, len(self._sorted))
+        while position < end:
+            name, number = self._sorted[position]
+            if not name.startswith(normalized):
+                break
+            scores[number] = 0.8 + 0.2 * len(normalized) / len(name)
+            position += 1
+        
+        # 3文字組の一致率（前方一致の候補が足りない場合のみ。前方一致の方が常に上位になる）
+        if len(scores) < limit:
+            grams = _trigrams(normalized)
+            postings = sorted(
+                (self._grams[gram] for gram in grams if gram in self._grams), key=len
+            )
+            # 候補は含まれる名前の少ない3文字組から順に集める。j 個の3文字組から集めれば、
+            # 入力の3文字組のうち (全体 - j + 1) 個以上を含む名前は必ず候補に入る。
+            # 一致数は全ての3文字組で数える（集合の積なので候補の数だけの手間で済む）
+            candidates = set()
+            for posting in postings:
+                if len(candidates) >= CANDIDATE_TARGET:
+                    break
+                candidates.update(islice(posting, CANDIDATE_LIMIT - len(candidates)))
+            shared = Counter()
+            for posting in postings:
+                shared.update(candidates & posting)
+            
+            # 一致率が MIN_SIMILARITY 以上になるには、名前の3文字組の数によらず
+            # 一致数が size * MIN_SIMILARITY / (2 - MIN_SIMILARITY) 以上必要
+            size = len(grams)
+            min_count = size * MIN_SIMILARITY / (2 - MIN_SIMILARITY)
+            entries = self._entries
+            for number, count in shared.items():
+                if count < min_count:
+                    continue
+                similarity = 2 * count / (size + entries[number][1])
+                if similarity >= MIN_SIMILARITY:
+                    score = 0.8 * similarity
+                    if score > scores.get(number, 0.0):
+                        scores[number] = score
+        
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._entries[number][2], score) for number, score in best]
\ No newline at end of file
@@ -1,3 +1,5 @@
+from form_tracker import FormTracker
+
 class Player:
     def __init__(self, id, name, team_id=None, position=None, age=None):
         """
@@ -21,11 +23,15 @@ class Player:
         self.wins = 0            # 勝利数
         self.losses = 0          # 敗北数
         self.draws = 0           # 引き分け数
+        self.form = FormTracker()  # 直近の成績・連勝記録
     
     def add_result(self, result):
         """
         選手の試合結果を追加
         
+        複数のスレッドから結果を入力する場合は、所属チームのロックを取得してから呼ぶ
+        （Match.add_player_result はロックを取得してから呼び出す）。
+        
         Args:
             result (str): '○' (勝ち), '×' (負け), or '△' (引き分け)
         """
@@ -36,6 +42,7 @@ class Player:
             self.losses += 1
         elif result == '△':
             self.draws += 1
+        self.form.add(result)
     
     def win_rate(self):
         """
@@ -59,4 +66,7 @@ class Player:
             profile += f", {self.age}歳"
         
         stats = f"成績: {self.wins}勝 {self.losses}敗 {self.draws}引分 勝率: {self.win_rate():.3f}"
-        return f"{profile}\n{stats}"
\ No newline at end of file
+        if not self.form.count:
+            return f"{profile}\n{stats}"
+        form = f"直近{self.form.count}試合: {self.form.recent()} ({self.form.streak()}) 最長連勝: {self.form.longest_win_streak}"
+        return f"{profile}\n{stats}\n{form}"
\ No newline at end of file
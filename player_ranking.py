@@ -0,0 +1,153 @@
+import math
+from operator import attrgetter, itemgetter
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがない環境では標準ライブラリのみで計算する
+    np = None
+
+# 指標名 -> 表示名
+METRICS = {
+    "win_rate": "勝率",
+    "half_draw": "勝率（引分=0.5勝）",
+    "wilson": "勝率の信頼区間の下限（Wilson）",
+    "bayes": "補正勝率（ベイズ）"
+}
+
+# Wilsonの信頼区間に使う値（95%）
+WILSON_Z = 1.96
+
+# ベイズ補正で加える仮想的な試合数（全選手の平均勝率で戦ったとみなす）
+PRIOR_GAMES = 10
+
+class PlayerRankingEngine:
+    def __init__(self, metric="win_rate", min_games=1, z=WILSON_Z, prior_games=PRIOR_GAMES):
+        """
+        選手のランキングを複数の指標で計算するクラス
+        
+        選手の成績（試合数・勝ち・引き分け）を列ごとの配列にまとめ、
+        指標の計算と並べ替えを配列に対して一度に行う（NumPyがあればNumPyで計算する）。
+        win_rate 以外の指標は引き分けを0.5勝として数える。
+        
+        - win_rate: 勝ち / 試合数
+        - half_draw: (勝ち + 0.5 * 引き分け) / 試合数
+        - wilson: half_draw の95%信頼区間の下限。試合数の少ない選手ほど低くなる
+        - bayes: 全選手の平均勝率で prior_games 試合戦ったとみなして補正した勝率
+        
+        Args:
+            metric (str): 指標名（METRICS のいずれか）
+            min_games (int): ランキングに含める最低試合数
+            z (float): Wilsonの信頼区間に使う値
+            prior_games (float): ベイズ補正で加える仮想的な試合数
+        """
+        if metric not in METRICS:
+            raise ValueError(f"未対応の指標です: {metric}")
+        self.metric = metric
+        self.min_games = max(min_games, 1)
+        self.z = z
+        self.prior_games = prior_games
+    
+    def rank(self, players):
+        """
+        選手を指標の降順（同じ値なら試合数の多い順）に並べる
+        
+        Args:
+            players (list): Playerオブジェクトのリスト
+            
+        Returns:
+            tuple: (並べ替えた Player のリスト, 対応する指標の値のリスト)
+                （最低試合数に満たない選手は含まない）
+        """
+        matches = list(map(attrgetter("matches_played"), players))
+        wins = list(map(attrgetter("wins"), players))
+        draws = list(map(attrgetter("draws"), players))
+        
+        if np is not None:
+            order, scores = self._rank_numpy(matches, wins, draws)
+        else:
+            order, scores = self._rank_python(matches, wins, draws)
+        
+        if not order:
+            return [], []
+        if len(order) == 1:
+            return [players[order[0]]], scores
+        return list(itemgetter(*order)(players)), scores
+    
+    def _rank_numpy(self, matches, wins, draws):
+        """
+        NumPyで指標を計算して並べ替える
+        
+        Args:
+            matches (list): 選手ごとの試合数
+            wins (list): 選手ごとの勝ち数
+            draws (list): 選手ごとの引き分け数
+            
+        Returns:
+            tuple: (並べ替えた選手の番号のリスト, 指標の値のリスト)
+        """
+        matches = np.asarray(matches, dtype=np.float64)
+        wins = np.asarray(wins, dtype=np.float64)
+        draws = np.asarray(draws, dtype=np.float64)
+        
+        selected = np.flatnonzero(matches >= self.min_games)
+        games = matches[selected]
+        if self.metric == "win_rate":
+            scores = wins[selected] / games
+        else:
+            successes = wins[selected] + 0.5 * draws[selected]
+            if self.metric == "half_draw":
+                scores = successes / games
+            elif self.metric == "wilson":
+                rate = successes / games
+                z2 = self.z * self.z
+                spread = self.z * np.sqrt(rate * (1 - rate) / games + z2 / (4 * games * games))
+                scores = (rate + z2 / (2 * games) - spread) / (1 + z2 / games)
+            else:
+                total_games = matches.sum()
+                mean = (wins.sum() + 0.5 * draws.sum()) / total_games if total_games else 0.5
+                scores = (successes + self.prior_games * mean) / (games + self.prior_games)
+        
+        # 指標の降順、同じ値なら試合数の降順（それも同じなら元の順）
+        order = np.lexsort((-games, -scores))
+        return selected[order].tolist(), scores[order].tolist()
+    
+    def _rank_python(self, matches, wins, draws):
+        """
+        標準ライブラリのみで指標を計算して並べ替える（_rank_numpy と同じ計算）
+        
+        Args:
+            matches (list): 選手ごとの試合数
+            wins (list): 選手ごとの勝ち数
+            draws (list): 選手ごとの引き分け数
+            
+        Returns:
+            tuple: (並べ替えた選手の番号のリスト, 指標の値のリスト)
+        """
+        min_games = self.min_games
+        selected = [i for i, games in enumerate(matches) if games >= min_games]
+        
+        if self.metric == "win_rate":
+            scores = [wins[i] / matches[i] for i in selected]
+        elif self.metric == "half_draw":
+            scores = [(wins[i] + 0.5 * draws[i]) / matches[i] for i in selected]
+        elif self.metric == "wilson":
+            z = self.z
+            z2 = z * z
+            scores = []
+            for i in selected:
+                games = matches[i]
+                rate = (wins[i] + 0.5 * draws[i]) / games
+                spread = z * math.sqrt(rate * (1 - rate) / games + z2 / (4 * games * games))
+                scores.append((rate + z2 / (2 * games) - spread) / (1 + z2 / games))
+        else:
+            total_games = sum(matches)
+            mean = (sum(wins) + 0.5 * sum(draws)) / total_games if total_games else 0.5
+            prior = self.prior_games
+            scores = [
+                (wins[i] + 0.5 * draws[i] + prior * mean) / (matches[i] + prior)
+                for i in selected
+            ]
+        
+        # 指標の降順、同じ値なら試合数の降順（それも同じなら元の順）
+        positions = sorted(range(len(selected)), key=lambda k: (-scores[k], -matches[selected[k]]))
+        return [selected[k] for k in positions], [scores[k] for k in positions]
\ No newline at end of file
@@ -0,0 +1,206 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがない環境では標準ライブラリのみで計算する
+    np = None
+
+# 各チームに加える仮想的な試合数（強さ1の相手と半分ずつ勝ち負け）。
+# 全勝・全敗のチームがあっても強さが有限の値に収まるようにする
+PRIOR_GAMES = 2.0
+
+# 収束の判定（強さの対数の変化の最大値）と反復回数の上限
+TOLERANCE = 1e-6
+MAX_ITERATIONS = 1000
+
+class PowerRanking:
+    def __init__(self, prior_games=PRIOR_GAMES, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+        """
+        対戦相手の強さを考慮したチームの強さ（Bradley-Terryモデル）を推定するクラス
+        
+        チームiがチームjに勝つ確率を 強さi / (強さi + 強さj) として、
+        終了した試合の結果（引き分けは0.5勝）から各チームの強さを反復計算で求める。
+        試合はチームの組み合わせごとに勝ち数を集計した疎な対戦表として扱い、
+        NumPyがあればまとめて計算する。再計算は前回の強さを初期値にして行う。
+        
+        Args:
+            prior_games (float): 各チームに加える仮想的な試合数
+            tolerance (float): 収束とみなす強さの対数の変化
+            max_iterations (int): 反復回数の上限
+        """
+        self.prior_games = prior_games
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.strengths = {}  # チームID -> 強さ（次回の計算の初期値にも使う）
+        self.iterations = 0  # 直前の計算の反復回数
+    
+    def fit(self, league):
+        """
+        リーグの終了した試合から各チームの強さを計算
+        
+        Args:
+            league (League): 対象のリーグ
+            
+        Returns:
+            dict: チームID -> 強さ（幾何平均が1になるよう正規化）
+        """
+        team_ids = list(league.teams)
+        if not team_ids:
+            self.strengths = {}
+            return self.strengths
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        
+        # 終了した試合を (ホーム, アウェイ, ホームの勝ち数) に変換
+        homes = []
+        aways = []
+        scores = []
+        for match in league.matches:
+            if not match.is_finished:
+                continue
+            home = index.get(match.home_team.id)
+            away = index.get(match.away_team.id)
+            if home is None or away is None or home == away:
+                continue
+            homes.append(home)
+            aways.append(away)
+            if match.home_score > match.away_score:
+                scores.append(1.0)
+            elif match.home_score < match.away_score:
+                scores.append(0.0)
+            else:
+                scores.append(0.5)
+        
+        initial = [self.strengths.get(team_id, 1.0) for team_id in team_ids]
+        if np is not None:
+            values = self._fit_numpy(len(team_ids), homes, aways, scores, initial)
+        else:
+            values = self._fit_python(len(team_ids), homes, aways, scores, initial)
+        
+        self.strengths = dict(zip(team_ids, values))
+        return self.strengths
+    
+    def _fit_numpy(self, size, homes, aways, scores, initial):
+        """
+        NumPyで強さを計算
+        
+        Args:
+            size (int): チーム数
+            homes (list): 試合ごとのホームチームの番号
+            aways (list): 試合ごとのアウェイチームの番号
+            scores (list): 試合ごとのホームの勝ち数（1, 0.5, 0）
+            initial (list): チームごとの強さの初期値
+            
+        Returns:
+            list: チームごとの強さ
+        """
+        homes = np.asarray(homes, dtype=np.int64)
+        aways = np.asarray(aways, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.float64)
+        
+        # 組み合わせ（番号の小さいチーム, 大きいチーム）ごとに集計
+        swap = homes > aways
+        first = np.where(swap, aways, homes)
+        second = np.where(swap, homes, aways)
+        first_scores = np.where(swap, 1.0 - scores, scores)
+        pairs, inverse = np.unique(first * size + second, return_inverse=True)
+        first = pairs // size
+        second = pairs % size
+        games = np.bincount(inverse, minlength=len(pairs)).astype(np.float64)
+        first_wins = np.bincount(inverse, weights=first_scores, minlength=len(pairs))
+        second_wins = games - first_wins
+        
+        prior = self.prior_games / 2
+        log_strength = np.log(np.asarray(initial, dtype=np.float64))
+        self.iterations = 0
+        for self.iterations in range(1, self.max_iterations + 1):
+            strength = np.exp(log_strength)
+            # 相手の強さで重み付けした勝ち数 / 負け数 を更新値とする（Newman 2023 の反復式）
+            total = strength[first] + strength[second]
+            prior_total = strength + 1.0
+            numerator = (
+                np.bincount(first, weights=first_wins * strength[second] / total, minlength=size)
+                + np.bincount(second, weights=second_wins * strength[first] / total, minlength=size)
+                + prior / prior_total
+            )
+            denominator = (
+                np.bincount(first, weights=second_wins / total, minlength=size)
+                + np.bincount(second, weights=first_wins / total, minlength=size)
+                + prior / prior_total
+            )
+            updated = np.log(numerator) - np.log(denominator)
+            updated -= updated.mean()
+            change = np.abs(updated - log_strength).max()
+            log_strength = updated
+            if change < self.tolerance:
+                break
+        return np.exp(log_strength).tolist()
+    
+    def _fit_python(self, size, homes, aways, scores, initial):
+        """
+        標準ライブラリのみで強さを計算（_fit_numpy と同じ計算）
+        
+        Args:
+            size (int): チーム数
+            homes (list): 試合ごとのホームチームの番号
+            aways (list): 試合ごとのアウェイチームの番号
+            scores (list): 試合ごとのホームの勝ち数（1, 0.5, 0）
+            initial (list): チームごとの強さの初期値
+            
+        Returns:
+            list: チームごとの強さ
+        """
+        # 組み合わせごとに [勝ち数（番号の小さいチーム）, 勝ち数（大きいチーム）] を集計
+        pairs = {}
+        for home, away, score in zip(homes, aways, scores):
+            if home < away:
+                wins = pairs.setdefault((home, away), [0.0, 0.0])
+                wins[0] += score
+                wins[1] += 1.0 - score
+            else:
+                wins = pairs.setdefault((away, home), [0.0, 0.0])
+                wins[0] += 1.0 - score
+                wins[1] += score
+        pairs = [(first, second, wins[0], wins[1]) for (first, second), wins in pairs.items()]
+        
+        prior = self.prior_games / 2
+        log_strength = [math.log(value) for value in initial]
+        self.iterations = 0
+        for self.iterations in range(1, self.max_iterations + 1):
+            strength = [math.exp(value) for value in log_strength]
+            numerator = [prior / (value + 1.0) for value in strength]
+            denominator = list(numerator)
+            for first, second, first_wins, second_wins in pairs:
+                first_strength = strength[first]
+                second_strength = strength[second]
+                total = first_strength + second_strength
+                numerator[first] += first_wins * second_strength / total
+                numerator[second] += second_wins * first_strength / total
+                denominator[first] += second_wins / total
+                denominator[second] += first_wins / total
+            
+            updated = [math.log(n) - math.log(d) for n, d in zip(numerator, denominator)]
+            mean = sum(updated) / size
+            updated = [value - mean for value in updated]
+            change = max(abs(a - b) for a, b in zip(updated, log_strength))
+            log_strength = updated
+            if change < self.tolerance:
+                break
+        return [math.exp(value) for value in log_strength]
+    
+    def rankings(self, league):
+        """
+        計算済みの強さでチームを並べる
+        
+        Args:
+            league (League): 対象のリーグ
+            
+        Returns:
+            list: [(Team, 強さ, レーティング), ...] の形式で強さの降順
+                （レーティングは強さを 1500 + 400 * log10(強さ) に換算した値）
+        """
+        rows = []
+        for team_id, team in league.teams.items():
+            strength = self.strengths.get(team_id, 1.0)
+            rows.append((team, strength, 1500 + 400 * math.log10(strength)))
+        rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
\ No newline at end of file
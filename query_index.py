@@ -0,0 +1,343 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+from operator import attrgetter
+
+from name_index import normalize_name
+
+# 年齢の索引の区切り（5歳ごと）
+AGE_BUCKET = 5
+
+# 選手の並べ替えの指標 -> (表示名, 値の取得)
+PLAYER_SORT_KEYS = {
+    "win_rate": ("勝率", lambda player: player.win_rate()),
+    "matches": ("試合数", attrgetter("matches_played")),
+    "wins": ("勝利数", attrgetter("wins")),
+    "age": ("年齢", lambda player: player.age if player.age is not None else -1),
+    "name": ("名前", lambda player: normalize_name(player.name))
+}
+
+# 試合の並べ替えの指標 -> (表示名, 値の取得)
+MATCH_SORT_KEYS = {
+    "round": ("ラウンド", lambda match: (match.round_number or 0, match.date)),
+    "date": ("試合日", attrgetter("date"))
+}
+
+def too_close(first, second, min_rest):
+    """
+    2つの試合日時が同じ日、または間隔が min_rest 未満か
+    
+    Args:
+        first (datetime): 試合日時
+        second (datetime): 試合日時
+        min_rest (timedelta): 試合の間に必要な間隔
+        
+    Returns:
+        bool: 近すぎる場合はTrue
+    """
+    return first.date() == second.date() or abs(first - second) < min_rest
+
+class QueryIndex:
+    def __init__(self, league):
+        """
+        選手・試合の条件検索用の索引
+        
+        選手はポジション・年齢（5歳ごと）、試合はチーム・ラウンド・試合日の索引を持ち、
+        検索では候補が最も少なくなる索引から候補を取り出して残りの条件で絞り込む。
+        選手の索引は League.add_team / add_player で更新する。
+        試合は追加のみのため、検索のたびに前回以降に追加された試合だけを索引に加える。
+        
+        Args:
+            league (League): 対象のリーグ
+        """
+        self.league = league
+        self._positions = {}  # 正規化したポジション -> 選手の集合
+        self._ages = {}       # 年齢 // AGE_BUCKET -> 選手の集合
+        for team in league.teams.values():
+            for player in team.players.values():
+                self.add_player(player)
+        
+        self._matches = None  # 索引を作成した試合リスト（読み込みで置き換わったら作り直す）
+        self._indexed = 0     # 索引に加えた試合数
+        self.last_plan = None  # 直前の検索で使った索引 (索引名, 候補数)
+    
+    def add_player(self, player):
+        """
+        選手を索引に加える
+        
+        Args:
+            player (Player): 選手オブジェクト
+        """
+        if player.position:
+            self._positions.setdefault(normalize_name(player.position), set()).add(player)
+        if player.age is not None:
+            self._ages.setdefault(player.age // AGE_BUCKET, set()).add(player)
+    
+    def remove_player(self, player):
+        """
+        選手を索引から取り除く
+        
+        Args:
+            player (Player): 選手オブジェクト
+        """
+        if player.position:
+            self._positions.get(normalize_name(player.position), set()).discard(player)
+        if player.age is not None:
+            self._ages.get(player.age // AGE_BUCKET, set()).discard(player)
+    
+    def players(self, position=None, min_age=None, max_age=None, team_id=None, min_games=0,
+                sort="win_rate", descending=True, limit=None):
+        """
+        条件に合う選手を検索
+        
+        Args:
+            position (str, optional): ポジション（全角・半角や大文字小文字は区別しない）
+            min_age (int, optional): 年齢の下限（この年齢を含む）
+            max_age (int, optional): 年齢の上限（この年齢を含む）
+            team_id (str, optional): 所属チームID
+            min_games (int): 最低試合数
+            sort (str): 並べ替えの指標（PLAYER_SORT_KEYS のいずれか）
+            descending (bool): 降順に並べるか
+            limit (int, optional): 返す選手数の上限
+            
+        Returns:
+            list: 条件に合う Player のリスト
+        """
+        if sort not in PLAYER_SORT_KEYS:
+            raise ValueError(f"未対応の並べ替えです: {sort}")
+        
+        position = normalize_name(position) if position else None
+        with_age = min_age is not None or max_age is not None
+        low = min_age if min_age is not None else 0
+        high = max_age if max_age is not None else float("inf")
+        
+        # 使える索引ごとの候補数を見積もり、最も少ないものを使う
+        plans = []
+        same_position = self._positions.get(position, set())
+        if position is not None:
+            plans.append((len(same_position), "position", same_position))
+        if with_age:
+            buckets = [
+                players for bucket, players in self._ages.items()
+                if low // AGE_BUCKET <= bucket <= high // AGE_BUCKET
+            ]
+            plans.append((sum(map(len, buckets)), "age", (p for players in buckets for p in players)))
+            if position is not None:
+                # 両方の索引の積（集合の積は小さい方の大きさだけの手間で済む）
+                both = [players & same_position for players in buckets]
+                plans.append((sum(map(len, both)), "position+age", (p for players in both for p in players)))
+        if team_id is not None:
+            team = self.league.get_team(team_id)
+            candidates = team.players.values() if team else ()
+            plans.append((len(candidates), "team", candidates))
+        if not plans:
+            count = sum(len(team.players) for team in self.league.teams.values())
+            candidates = (p for team in self.league.teams.values() for p in team.players.values())
+            plans.append((count, "scan", candidates))
+        count, name, candidates = min(plans, key=lambda plan: plan[0])
+        self.last_plan = (name, count)
+        
+        results = [
+            player for player in candidates
+            if (position is None or player in same_position)
+            and (not with_age or (player.age is not None and low <= player.age <= high))
+            and (team_id is None or player.team_id == team_id)
+            and player.matches_played >= min_games
+        ]
+        return self._order(results, PLAYER_SORT_KEYS[sort][1], descending, limit)
+    
+    def matches(self, team_id=None, round_from=None, round_to=None, date_from=None, date_to=None,
+                finished=None, sort="round", descending=False, limit=None):
+        """
+        条件に合う試合を検索
+        
+        Args:
+            team_id (str, optional): ホーム・アウェイのどちらかがこのチームの試合
+            round_from (int, optional): ラウンドの下限（このラウンドを含む）
+            round_to (int, optional): ラウンドの上限（このラウンドを含む）
+            date_from (datetime, optional): 試合日時の下限（この日時を含む）
+            date_to (datetime, optional): 試合日時の上限（この日時を含む）
+            finished (bool, optional): True なら終了した試合、False なら未終了の試合のみ
+            sort (str): 並べ替えの指標（MATCH_SORT_KEYS のいずれか）
+            descending (bool): 降順に並べるか
+            limit (int, optional): 返す試合数の上限
+            
+        Returns:
+            list: 条件に合う Match のリスト
+        """
+        if sort not in MATCH_SORT_KEYS:
+            raise ValueError(f"未対応の並べ替えです: {sort}")
+        self._sync_matches()
+        matches = self.league.matches
+        
+        with_round = round_from is not None or round_to is not None
+        round_low = round_from if round_from is not None else float("-inf")
+        round_high = round_to if round_to is not None else float("inf")
+        with_date = date_from is not None or date_to is not None
+        
+        # 使える索引ごとの候補数を見積もり、最も少ないものを使う
+        plans = []
+        if team_id is not None:
+            fixtures = self._by_team.get(team_id, ())
+            plans.append((len(fixtures), "team", (i for _, i in fixtures)))
+        if with_round:
+            rounds = [
+                positions for round_number, positions in self._by_round.items()
+                if round_number is not None and round_low <= round_number <= round_high
+            ]
+            plans.append((sum(map(len, rounds)), "round", (i for positions in rounds for i in positions)))
+        if with_date:
+            start, end = self._date_range(self._by_date, date_from, date_to)
+            plans.append((max(end - start, 0), "date", (i for _, i in self._by_date[start:end])))
+        if not plans:
+            plans.append((len(matches), "scan", range(len(matches))))
+        count, name, positions = min(plans, key=lambda plan: plan[0])
+        self.last_plan = (name, count)
+        
+        results = []
+        for i in positions:
+            match = matches[i]
+            if team_id is not None and team_id not in (match.home_team.id, match.away_team.id):
+                continue
+            if with_round and (match.round_number is None or not round_low <= match.round_number <= round_high):
+                continue
+            if date_from is not None and match.date < date_from:
+                continue
+            if date_to is not None and match.date > date_to:
+                continue
+            if finished is not None and match.is_finished != finished:
+                continue
+            results.append(match)
+        return self._order(results, MATCH_SORT_KEYS[sort][1], descending, limit)
+    
+    def matches_between(self, start=None, end=None):
+        """
+        期間内の試合を日時の順に取得（O(log n + 件数)）
+        
+        Args:
+            start (datetime, optional): 期間の開始（この日時を含む）
+            end (datetime, optional): 期間の終了（この日時を含む）
+            
+        Returns:
+            list: 期間内の Match のリスト
+        """
+        self._sync_matches()
+        matches = self.league.matches
+        first, last = self._date_range(self._by_date, start, end)
+        return [matches[i] for _, i in self._by_date[first:last]]
+    
+    def conflicts_for(self, team_ids, date, min_rest=timedelta(0)):
+        """
+        新しい試合の日時が、チームの前後の試合と近すぎないかを調べる
+        
+        チームごとの日時順の試合から、新しい日時の前後の試合だけを調べる
+        （シーズン全体は調べない）。
+        
+        Args:
+            team_ids (iterable): 新しい試合に出るチームID
+            date (datetime): 新しい試合の日時
+            min_rest (timedelta): 試合の間に必要な間隔（同じ日の試合は間隔によらず重複とする）
+            
+        Returns:
+            list: [(チームID, 近すぎる Match), ...]
+        """
+        self._sync_matches()
+        matches = self.league.matches
+        conflicts = []
+        for team_id in team_ids:
+            fixtures = self._by_team.get(team_id, [])
+            position = bisect_left(fixtures, (date,))
+            # 前の試合（近すぎない試合が見つかれば、それより前の試合も近すぎない）
+            before = position - 1
+            while before >= 0 and too_close(fixtures[before][0], date, min_rest):
+                conflicts.append((team_id, matches[fixtures[before][1]]))
+                before -= 1
+            # 後の試合
+            after = position
+            while after < len(fixtures) and too_close(fixtures[after][0], date, min_rest):
+                conflicts.append((team_id, matches[fixtures[after][1]]))
+                after += 1
+        return conflicts
+    
+    def audit(self, min_rest=timedelta(0)):
+        """
+        シーズン全体の日程の重複を調べる
+        
+        日時の順に試合を1回だけたどり、チームごとに直前の試合と比べる。
+        
+        Args:
+            min_rest (timedelta): 試合の間に必要な間隔（同じ日の試合は間隔によらず重複とする）
+            
+        Returns:
+            list: [(チームID, 前の Match, 後の Match), ...] の形式で日時の順
+        """
+        self._sync_matches()
+        matches = self.league.matches
+        previous = {}  # チームID -> (直前の試合の日時, 試合の番号)
+        conflicts = []
+        for date, i in self._by_date:
+            match = matches[i]
+            for team_id in {match.home_team.id, match.away_team.id}:
+                last = previous.get(team_id)
+                if last is not None and too_close(last[0], date, min_rest):
+                    conflicts.append((team_id, matches[last[1]], match))
+                previous[team_id] = (date, i)
+        return conflicts
+    
+    def _date_range(self, fixtures, start, end):
+        """
+        (日時, 試合の番号) の昇順リストで期間内の範囲を求める
+        
+        Args:
+            fixtures (list): (日時, 試合の番号) の昇順リスト
+            start (datetime, optional): 期間の開始（この日時を含む）
+            end (datetime, optional): 期間の終了（この日時を含む）
+            
+        Returns:
+            tuple: (範囲の先頭, 範囲の末尾の次)
+        """
+        first = bisect_left(fixtures, (start,)) if start is not None else 0
+        last = bisect_right(fixtures, (end, float("inf"))) if end is not None else len(fixtures)
+        return first, last
+    
+    def _sync_matches(self):
+        """
+        前回以降に追加された試合を索引に加える
+        """
+        matches = self.league.matches
+        if self._matches is not matches:
+            # 読み込みなどで試合リストが置き換わった場合は作り直す
+            self._matches = matches
+            self._indexed = 0
+            self._by_team = {}   # チームID -> (試合日時, 試合の番号) の昇順リスト
+            self._by_round = {}  # ラウンド番号 -> 試合の番号のリスト
+            self._by_date = []   # (試合日時, 試合の番号) の昇順リスト
+        
+        for i in range(self._indexed, len(matches)):
+            match = matches[i]
+            fixture = (match.date, i)
+            insort(self._by_team.setdefault(match.home_team.id, []), fixture)
+            if match.away_team.id != match.home_team.id:
+                insort(self._by_team.setdefault(match.away_team.id, []), fixture)
+            self._by_round.setdefault(match.round_number, []).append(i)
+            insort(self._by_date, fixture)
+        self._indexed = len(matches)
+    
+    def _order(self, items, key, descending, limit):
+        """
+        並べ替えて上限までを返す（上限が少ない場合は全体を並べ替えない）
+        
+        Args:
+            items (list): 対象のリスト
+            key (callable): 並べ替えの値
+            descending (bool): 降順に並べるか
+            limit (int, optional): 返す数の上限
+            
+        Returns:
+            list: 並べ替えた結果
+        """
+        if limit is not None and limit < len(items):
+            if descending:
+                return heapq.nlargest(limit, items, key=key)
+            return heapq.nsmallest(limit, items, key=key)
+        return sorted(items, key=key, reverse=descending)
\ No newline at end of file
@@ -0,0 +1,404 @@
+from collections import deque
+
+# 最大流で判定できない場合に試す結果の組み合わせの上限
+SEARCH_LIMIT = 20000
+
+class _FlowNetwork:
+    def __init__(self, size):
+        """
+        最大流を求めるためのネットワーク（Dinic法）
+        
+        辺は番号で管理し、辺 e の逆辺は e ^ 1 とする。
+        
+        Args:
+            size (int): 頂点数
+        """
+        self.adjacent = [[] for _ in range(size)]
+        self.to = []
+        self.capacity = []
+    
+    def add_edge(self, source, target, capacity):
+        """
+        辺を追加
+        
+        Args:
+            source (int): 始点
+            target (int): 終点
+            capacity (int): 容量
+            
+        Returns:
+            int: 追加した辺の番号（流量は逆辺の容量で分かる）
+        """
+        edge = len(self.to)
+        self.adjacent[source].append(edge)
+        self.to.append(target)
+        self.capacity.append(capacity)
+        self.adjacent[target].append(edge + 1)
+        self.to.append(source)
+        self.capacity.append(0)
+        return edge
+    
+    def flow_on(self, edge):
+        """
+        辺に流れている量
+        
+        Args:
+            edge (int): add_edge が返した辺の番号
+            
+        Returns:
+            int: 流量
+        """
+        return self.capacity[edge ^ 1]
+    
+    def max_flow(self, source, sink):
+        """
+        最大流を求める
+        
+        Args:
+            source (int): 始点
+            sink (int): 終点
+            
+        Returns:
+            int: 最大流量
+        """
+        total = 0
+        while True:
+            level = self._levels(source)
+            if level[sink] < 0:
+                return total
+            pointer = [0] * len(self.adjacent)
+            while True:
+                pushed = self._push(source, sink, float("inf"), level, pointer)
+                if not pushed:
+                    break
+                total += pushed
+    
+    def _levels(self, source):
+        """
+        始点からの距離（BFS）
+        """
+        level = [-1] * len(self.adjacent)
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for edge in self.adjacent[node]:
+                target = self.to[edge]
+                if self.capacity[edge] > 0 and level[target] < 0:
+                    level[target] = level[node] + 1
+                    queue.append(target)
+        return level
+    
+    def _push(self, node, sink, limit, level, pointer):
+        """
+        距離が1ずつ増える経路に沿って流す（DFS）
+        """
+        if node == sink:
+            return limit
+        edges = self.adjacent[node]
+        while pointer[node] < len(edges):
+            edge = edges[pointer[node]]
+            target = self.to[edge]
+            if self.capacity[edge] > 0 and level[target] == level[node] + 1:
+                pushed = self._push(target, sink, min(limit, self.capacity[edge]), level, pointer)
+                if pushed:
+                    self.capacity[edge] -= pushed
+                    self.capacity[edge ^ 1] += pushed
+                    return pushed
+            pointer[node] += 1
+        return 0
+
+class RaceAnalysis:
+    def __init__(self, league, search_limit=SEARCH_LIMIT, rules=None):
+        """
+        残りの試合から優勝（1位）の可能性を判定するクラス
+        
+        チームXが1位になれるかは、Xが残り試合に全勝したときの勝点を上限として、
+        他の試合の結果を全チームがその上限以下に収まるように決められるかで判定する
+        （野球の優勝判定と同じ最大流の考え方）。
+        結果によって配分される勝点の合計が異なる（勝3・分1なら3点または2点）ため、
+        最大流では「各試合で少なくとも最小の合計は配分される」ことを使って
+        敗退を証明し、実際に上限に収まる結果の組み合わせを作れれば可能性ありとする。
+        どちらでもない場合だけ結果の組み合わせを探索する。
+        ボーナスポイントは、X は毎試合得るものとし、他のチームは得ないものとする。
+        
+        Args:
+            league (League): 対象のリーグ
+            search_limit (int): 探索する組み合わせ数の上限。上限に達した場合は
+                敗退と断定せず「可能性あり」とする
+            rules (ScoringRules, optional): 勝点の計算方法（省略時はリーグの設定）
+        """
+        self.league = league
+        self.search_limit = search_limit
+        self.rules = rules or league.scoring_rules
+        self.outcomes = self.rules.outcomes()
+        self.match_max = self.rules.max_match_points()
+        self.match_min = min(first + second for first, second in self.outcomes)
+        # X が勝ったときに相手が得る勝点（負けの勝点が0でない場合も相手の上限から引く）
+        best_share = max(first for first, _ in self.outcomes)
+        self.loser_points = min(second for first, second in self.outcomes if first == best_share)
+        # X が勝つのが常に最善（他の結果で相手との差がより広がらない）なら最大流・探索で判定できる
+        self.own_wins_best = all(
+            best_share - self.loser_points >= first - second for first, second in self.outcomes
+        )
+        if rules is None:
+            self.points = {team.id: points for team, points, _, _ in league.get_standings()}
+        else:
+            self.points = {team.id: points for team, points, _, _ in rules.standings(league.teams.values())}
+        self.remaining = dict.fromkeys(league.teams, 0)
+        self.pairs = {}  # (チームID, チームID) -> 残り試合数
+        
+        for match in league.matches:
+            if match.is_finished:
+                continue
+            home_id = match.home_team.id
+            away_id = match.away_team.id
+            if home_id not in self.remaining or away_id not in self.remaining or home_id == away_id:
+                continue
+            key = (home_id, away_id) if home_id < away_id else (away_id, home_id)
+            self.pairs[key] = self.pairs.get(key, 0) + 1
+            self.remaining[home_id] += 1
+            self.remaining[away_id] += 1
+    
+    def max_points(self, team_id):
+        """
+        残り試合に全勝した場合の勝点
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            int: 最大の勝点
+        """
+        return self.points[team_id] + self.match_max * self.remaining[team_id]
+    
+    def clinched(self, team_id):
+        """
+        1位が確定しているか（他のどのチームも同点以上になれない）
+        
+        Xが残り試合に全敗し、他のチームYが全勝した場合が
+        YがXに最も迫る場合なので、最大流は不要。
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            bool: 確定していればTrue
+        """
+        own = self.points[team_id]
+        return all(
+            self.max_points(other) < own
+            for other in self.points if other != team_id
+        )
+    
+    def eliminated(self, team_id):
+        """
+        1位（同点1位を含む）の可能性がなくなっているか
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            bool: 可能性がなければTrue
+        """
+        best = self.max_points(team_id)
+        caps = {other: best - points for other, points in self.points.items() if other != team_id}
+        if any(cap < 0 for cap in caps.values()):
+            return True
+        if not self.own_wins_best:
+            return False
+        if self.loser_points:
+            for (first, second), count in self.pairs.items():
+                if team_id in (first, second):
+                    other = second if first == team_id else first
+                    caps[other] -= self.loser_points * count
+            if any(cap < 0 for cap in caps.values()):
+                return True
+        
+        pairs = [(first, second, count) for (first, second), count in self.pairs.items()
+                 if team_id not in (first, second)]
+        
+        # どのチームも残りを全勝して上限に届かなければ判定不要
+        remaining = dict.fromkeys(caps, 0)
+        for first, second, count in pairs:
+            remaining[first] += count
+            remaining[second] += count
+        best_outcome = max(max(outcome) for outcome in self.outcomes)
+        if all(best_outcome * remaining[other] <= cap for other, cap in caps.items()):
+            return False
+        
+        flows = self._distribute(pairs, caps)
+        if flows is None:
+            return True
+        if self._can_repair() and self._repair(pairs, flows, caps):
+            return False
+        return self._search(pairs, caps) is False
+    
+    def _can_repair(self):
+        """
+        最大流の配分から試合結果を作れる勝点の計算方法か（勝ち・引き分け1点・負け0点のみ）
+        
+        Returns:
+            bool: _repair を使えればTrue
+        """
+        rules = self.rules
+        return rules.draw == 1 and rules.loss == 0 and rules.win >= 2 and not rules.uses_overtime
+    
+    def _distribute(self, pairs, caps):
+        """
+        各試合で最低限配分される勝点を上限内に配分できるかを最大流で調べる
+        
+        Args:
+            pairs (list): [(チームID, チームID, 試合数), ...]
+            caps (dict): チームID -> 獲得できる勝点の上限
+            
+        Returns:
+            list: 組み合わせごとの (1チーム目への配分, 2チーム目への配分)、
+                配分できない場合はNone
+        """
+        team_nodes = {team_id: 2 + i for i, team_id in enumerate(caps)}
+        network = _FlowNetwork(2 + len(team_nodes) + len(pairs))
+        for team_id, node in team_nodes.items():
+            network.add_edge(node, 1, caps[team_id])
+        
+        edges = []
+        required = 0
+        for i, (first, second, count) in enumerate(pairs):
+            node = 2 + len(team_nodes) + i
+            supply = self.match_min * count
+            required += supply
+            network.add_edge(0, node, supply)
+            edges.append((
+                network.add_edge(node, team_nodes[first], supply),
+                network.add_edge(node, team_nodes[second], supply)
+            ))
+        
+        if network.max_flow(0, 1) < required:
+            return None
+        return [(network.flow_on(first), network.flow_on(second)) for first, second in edges]
+    
+    def _repair(self, pairs, flows, caps):
+        """
+        最大流の配分から実際の試合結果を作り、上限を超えたチームがあれば結果を入れ替える
+        
+        引き分けが1点・負けが0点の場合だけ使う。
+        配分が (1, 1) の分は引き分け、片方に2点の分はそのチームの勝ちとする。
+        勝ちの勝点は配分より1点多いため上限を超えることがあり、その場合は
+        相手に余裕のある勝ちを引き分け・負けに変えて上限に収める。
+        
+        Args:
+            pairs (list): [(チームID, チームID, 試合数), ...]
+            flows (list): 組み合わせごとの配分
+            caps (dict): チームID -> 獲得できる勝点の上限
+            
+        Returns:
+            bool: 全チームを上限内に収める結果を作れたらTrue
+        """
+        win_points = self.rules.win
+        draw_points = self.rules.draw
+        slack = dict(caps)
+        wins = []  # 組み合わせごとの [1チーム目の勝ち数, 2チーム目の勝ち数]
+        for (first, second, count), (first_flow, second_flow) in zip(pairs, flows):
+            draws = min(first_flow, second_flow)
+            first_wins = (first_flow - draws) // 2
+            second_wins = (second_flow - draws) // 2
+            wins.append([first_wins, second_wins])
+            slack[first] -= win_points * first_wins + draw_points * draws
+            slack[second] -= win_points * second_wins + draw_points * draws
+        
+        by_team = {}
+        for index, (first, second, _) in enumerate(pairs):
+            by_team.setdefault(first, []).append((index, 0, second))
+            by_team.setdefault(second, []).append((index, 1, first))
+        
+        over = deque(team_id for team_id, value in slack.items() if value < 0)
+        while over:
+            team_id = over.popleft()
+            for index, side, opponent in by_team.get(team_id, []):
+                if slack[team_id] >= 0:
+                    break
+                while wins[index][side] and slack[team_id] < 0:
+                    if slack[opponent] >= draw_points:
+                        # 勝ち -> 引き分け
+                        slack[team_id] += win_points - draw_points
+                        slack[opponent] -= draw_points
+                    elif slack[opponent] >= win_points:
+                        # 勝ち -> 負け
+                        slack[team_id] += win_points
+                        slack[opponent] -= win_points
+                        wins[index][1 - side] += 1
+                    else:
+                        break
+                    wins[index][side] -= 1
+            if slack[team_id] < 0:
+                return False
+        return True
+    
+    def _search(self, pairs, caps):
+        """
+        上限内に収まる結果の組み合わせを探索
+        
+        Args:
+            pairs (list): [(チームID, チームID, 試合数), ...]
+            caps (dict): チームID -> 獲得できる勝点の上限
+            
+        Returns:
+            bool: 見つかればTrue、存在しなければFalse、上限に達した場合はNone
+        """
+        matches = [(first, second) for first, second, count in pairs for _ in range(count)]
+        # 余裕の少ないチームの試合から決める
+        matches.sort(key=lambda match: min(caps[match[0]], caps[match[1]]))
+        outcomes = self.outcomes
+        
+        slack = dict(caps)
+        choice = [-1] * len(matches)
+        depth = 0
+        nodes = 0
+        while True:
+            if depth == len(matches):
+                return True
+            if depth < 0:
+                return False
+            
+            first, second = matches[depth]
+            if choice[depth] >= 0:
+                # 前の選択を取り消す
+                first_points, second_points = outcomes[choice[depth]]
+                slack[first] += first_points
+                slack[second] += second_points
+            
+            choice[depth] += 1
+            while choice[depth] < len(outcomes):
+                first_points, second_points = outcomes[choice[depth]]
+                if slack[first] >= first_points and slack[second] >= second_points:
+                    break
+                choice[depth] += 1
+            
+            if choice[depth] == len(outcomes):
+                choice[depth] = -1
+                depth -= 1
+                continue
+            
+            nodes += 1
+            if nodes > self.search_limit:
+                return None
+            slack[first] -= first_points
+            slack[second] -= second_points
+            depth += 1
+    
+    def analyze(self):
+        """
+        全チームの優勝の可能性を判定
+        
+        Returns:
+            dict: チームID -> "clinched"（1位確定）, "eliminated"（可能性なし）, "alive"（可能性あり）
+        """
+        status = {}
+        for team_id in self.points:
+            if self.clinched(team_id):
+                status[team_id] = "clinched"
+            elif self.eliminated(team_id):
+                status[team_id] = "eliminated"
+            else:
+                status[team_id] = "alive"
+        return status
\ No newline at end of file
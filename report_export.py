@@ -0,0 +1,364 @@
+import argparse
+import csv
+import json
+import os
+from html import escape
+from league_storage import LeagueStorage
+
+# 出力形式 -> 拡張子
+FORMATS = {"csv": ".csv", "html": ".html", "jsonl": ".jsonl"}
+
+# レポート名 -> 表示名
+REPORTS = {
+    "standings": "チーム順位表",
+    "rankings": "選手ランキング",
+    "results": "全試合の結果",
+    "players": "選手ごとの試合履歴"
+}
+
+# レポートごとの列（キー, 表示名）。JSON Lines ではキー、CSV・HTMLでは表示名を見出しにする
+COLUMNS = {
+    "standings": (
+        ("rank", "順位"), ("team_id", "チームID"), ("team", "チーム名"), ("played", "試合"),
+        ("wins", "勝"), ("draws", "分"), ("losses", "負"), ("points", "勝点"), ("win_rate", "勝率"),
+        ("goals_for", "得点"), ("goals_against", "失点"), ("goal_difference", "得失点差"),
+        ("recent", "直近"), ("streak", "連続")
+    ),
+    "rankings": (
+        ("rank", "順位"), ("player_id", "選手ID"), ("player", "選手名"), ("team", "チーム"),
+        ("position", "ポジション"), ("played", "試合"), ("wins", "勝"), ("draws", "分"),
+        ("losses", "負"), ("score", "指標"), ("recent", "直近"), ("streak", "連続")
+    ),
+    "results": (
+        ("match_id", "試合ID"), ("round", "ラウンド"), ("date", "日時"), ("home_team_id", "ホームID"),
+        ("home_team", "ホーム"), ("away_team_id", "アウェイID"), ("away_team", "アウェイ"),
+        ("home_score", "ホーム得点"), ("away_score", "アウェイ得点"), ("overtime", "延長"), ("finished", "終了")
+    ),
+    "players": (
+        ("player_id", "選手ID"), ("player", "選手名"), ("team", "チーム"), ("match_id", "試合ID"),
+        ("round", "ラウンド"), ("date", "日時"), ("opponent", "対戦相手"), ("result", "結果"), ("score", "スコア")
+    )
+}
+
+# 書き出し時のバッファの大きさ（バイト）
+WRITE_BUFFER = 1 << 20
+
+def iter_matches(league):
+    """
+    試合を1件ずつ列挙
+    
+    遅延読み込みの試合は一時的に復元するだけで、リストには保持しない。
+    
+    Args:
+        league (League): 対象のリーグ
+        
+    Yields:
+        Match: 試合オブジェクト
+    """
+    matches = league.matches
+    if hasattr(matches, "iter_transient"):
+        yield from matches.iter_transient()
+    else:
+        yield from matches
+
+def iter_standings_rows(league):
+    """
+    チーム順位表の行を生成
+    
+    Args:
+        league (League): 対象のリーグ
+        
+    Yields:
+        tuple: COLUMNS["standings"] の順の値
+    """
+    for rank, (team, points, win_rate, goal_diff) in enumerate(league.get_standings(), 1):
+        yield (
+            rank, team.id, team.name, team.matches_played, team.wins, team.draws, team.losses,
+            points, round(win_rate, 3), team.goals_for, team.goals_against, goal_diff,
+            team.form.recent(), team.form.streak()
+        )
+
+def iter_ranking_rows(league, metric="win_rate", min_games=1):
+    """
+    選手ランキングの行を生成
+    
+    Args:
+        league (League): 対象のリーグ
+        metric (str): 指標名（player_ranking.METRICS のいずれか）
+        min_games (int): ランキングに含める最低試合数
+        
+    Yields:
+        tuple: COLUMNS["rankings"] の順の値
+    """
+    team_names = {team.id: team.name for team in league.teams.values()}
+    players, scores = league.rank_players(metric, min_games)
+    for rank, (player, score) in enumerate(zip(players, scores), 1):
+        yield (
+            rank, player.id, player.name, team_names.get(player.team_id, ""), player.position,
+            player.matches_played, player.wins, player.draws, player.losses, round(score, 3),
+            player.form.recent(), player.form.streak()
+        )
+
+def iter_result_rows(league):
+    """
+    全試合の結果の行を試合リストの順に生成
+    
+    Args:
+        league (League): 対象のリーグ
+        
+    Yields:
+        tuple: COLUMNS["results"] の順の値
+    """
+    for match in iter_matches(league):
+        yield (
+            match.id, match.round_number, match.date.strftime("%Y-%m-%d %H:%M:%S"),
+            match.home_team.id, match.home_team.name, match.away_team.id, match.away_team.name,
+            match.home_score, match.away_score, match.overtime, match.is_finished
+        )
+
+def iter_player_history_rows(league, player_ids=None):
+    """
+    選手ごとの試合履歴（成績を入力した試合）の行を試合リストの順に生成
+    
+    全選手の履歴を選手ごとにまとめ直すと全体をメモリに持つ必要があるため、
+    試合の順に出力する（選手ごとに見る場合は選手IDで並べ替える・絞り込む）。
+    
+    Args:
+        league (League): 対象のリーグ
+        player_ids (iterable, optional): 出力する選手ID（省略時は全選手）
+        
+    Yields:
+        tuple: COLUMNS["players"] の順の値
+    """
+    wanted = set(player_ids) if player_ids is not None else None
+    for match in iter_matches(league):
+        if not match.player_results:
+            continue
+        date = match.date.strftime("%Y-%m-%d %H:%M:%S")
+        score = f"{match.home_score}-{match.away_score}" if match.is_finished else ""
+        for player_id, result in match.player_results.items():
+            if wanted is not None and player_id not in wanted:
+                continue
+            # 移籍した選手は試合のラウンドの時点の所属チームで出力する
+            team = match.team_of_player(player_id)
+            if team is None:
+                continue
+            opponent = match.away_team if team is match.home_team else match.home_team
+            yield (
+                player_id, league.get_player(player_id).name, team.name, match.id, match.round_number,
+                date, opponent.name, result, score
+            )
+
+def iter_rows(league, report, metric="win_rate", min_games=1):
+    """
+    レポートの行を生成
+    
+    Args:
+        league (League): 対象のリーグ
+        report (str): レポート名（REPORTS のいずれか）
+        metric (str): 選手ランキングの指標名
+        min_games (int): 選手ランキングに含める最低試合数
+        
+    Returns:
+        generator: レポートの行
+    """
+    if report == "standings":
+        return iter_standings_rows(league)
+    if report == "rankings":
+        return iter_ranking_rows(league, metric, min_games)
+    if report == "results":
+        return iter_result_rows(league)
+    if report == "players":
+        return iter_player_history_rows(league)
+    raise ValueError(f"未対応のレポートです: {report}")
+
+def write_csv(f, columns, rows):
+    """
+    CSVとして書き出す
+    
+    Args:
+        f (file): 書き込み先（テキストモード、newline=""）
+        columns (tuple): (キー, 表示名) のタプル
+        rows (iterable): 行
+        
+    Returns:
+        int: 書き出した行数
+    """
+    writer = csv.writer(f)
+    writer.writerow([label for _, label in columns])
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+def write_jsonl(f, columns, rows):
+    """
+    JSON Lines（1行1件のJSON）として書き出す
+    
+    Args:
+        f (file): 書き込み先（テキストモード）
+        columns (tuple): (キー, 表示名) のタプル
+        rows (iterable): 行
+        
+    Returns:
+        int: 書き出した行数
+    """
+    keys = [key for key, _ in columns]
+    count = 0
+    for row in rows:
+        f.write(json.dumps(dict(zip(keys, row)), ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+def write_html(f, columns, rows, title):
+    """
+    外部ファイルを参照しない1つのHTMLページとして書き出す
+    
+    Args:
+        f (file): 書き込み先（テキストモード）
+        columns (tuple): (キー, 表示名) のタプル
+        rows (iterable): 行
+        title (str): ページの見出し
+        
+    Returns:
+        int: 書き出した行数
+    """
+    f.write(
+        "<!DOCTYPE html>\n<html lang=\"ja\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{escape(title)}</title>\n"
+        "<style>\n"
+        "body { font-family: sans-serif; margin: 1.5em; }\n"
+        "table { border-collapse: collapse; }\n"
+        "th, td { border: 1px solid #ccc; padding: 0.25em 0.6em; white-space: nowrap; }\n"
+        "th { background: #f0f0f0; position: sticky; top: 0; }\n"
+        "tr:nth-child(even) td { background: #fafafa; }\n"
+        "</style>\n</head>\n<body>\n"
+        f"<h1>{escape(title)}</h1>\n<table>\n<thead><tr>"
+    )
+    f.write("".join(f"<th>{escape(label)}</th>" for _, label in columns))
+    f.write("</tr></thead>\n<tbody>\n")
+    count = 0
+    for row in rows:
+        f.write("<tr>")
+        f.write("".join(f"<td>{escape(_cell_text(value))}</td>" for value in row))
+        f.write("</tr>\n")
+        count += 1
+    f.write("</tbody>\n</table>\n</body>\n</html>\n")
+    return count
+
+def _cell_text(value):
+    """
+    HTMLの表に表示する文字列
+    """
+    if value is None:
+        return ""
+    if value is True:
+        return "○"
+    if value is False:
+        return ""
+    return str(value)
+
+def export_report(league, report, fmt, path, metric="win_rate", min_games=1):
+    """
+    レポートをファイルに書き出す
+    
+    行は1行ずつ生成してバッファ付きで書き出すため、試合数が多くても
+    表全体をメモリに持たない。
+    
+    Args:
+        league (League): 対象のリーグ
+        report (str): レポート名（REPORTS のいずれか）
+        fmt (str): 出力形式（FORMATS のいずれか）
+        path (str): 出力先のファイル
+        metric (str): 選手ランキングの指標名
+        min_games (int): 選手ランキングに含める最低試合数
+        
+    Returns:
+        int: 書き出した行数
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"未対応の出力形式です: {fmt}")
+    rows = iter_rows(league, report, metric, min_games)
+    columns = COLUMNS[report]
+    
+    # CSVは表計算ソフトで文字化けしないようBOM付きで書き出す
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding=encoding, newline="", buffering=WRITE_BUFFER) as f:
+        if fmt == "csv":
+            count = write_csv(f, columns, rows)
+        elif fmt == "jsonl":
+            count = write_jsonl(f, columns, rows)
+        else:
+            count = write_html(f, columns, rows, f"{league.name} {REPORTS[report]}")
+    os.replace(tmp_path, path)
+    return count
+
+def export_path(directory, league_name, report, fmt):
+    """
+    レポートの出力先のファイル名を作成
+    
+    Args:
+        directory (str): 出力先のディレクトリ
+        league_name (str): リーグ名
+        report (str): レポート名
+        fmt (str): 出力形式
+        
+    Returns:
+        str: 出力先のファイルパス
+    """
+    return os.path.join(directory, f"{league_name.replace(' ', '_')}_{report}{FORMATS[fmt]}")
+
+def export_reports(league, reports, fmt, directory, metric="win_rate", min_games=1):
+    """
+    複数のレポートをディレクトリに書き出す
+    
+    Args:
+        league (League): 対象のリーグ
+        reports (list): レポート名のリスト
+        fmt (str): 出力形式
+        directory (str): 出力先のディレクトリ（なければ作成）
+        metric (str): 選手ランキングの指標名
+        min_games (int): 選手ランキングに含める最低試合数
+        
+    Returns:
+        list: [(出力先のファイルパス, 行数), ...]
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    written = []
+    for report in reports:
+        path = export_path(directory, league.name, report, fmt)
+        written.append((path, export_report(league, report, fmt, path, metric, min_games)))
+    return written
+
+def main():
+    """
+    保存済みのリーグのレポートをコマンドラインから書き出す
+    """
+    from player_ranking import METRICS
+    
+    parser = argparse.ArgumentParser(description="保存済みのリーグの順位表・ランキング・試合結果をCSV/HTML/JSON Linesに書き出す")
+    parser.add_argument("league", help="リーグ名（保存ファイル名）")
+    parser.add_argument("--report", choices=list(REPORTS) + ["all"], default="all",
+                        help="書き出すレポート（省略時はすべて）")
+    parser.add_argument("--format", choices=list(FORMATS), default="csv", help="出力形式")
+    parser.add_argument("--output", default="exports", help="出力先のディレクトリ")
+    parser.add_argument("--data", default="data", help="データディレクトリ")
+    parser.add_argument("--metric", choices=list(METRICS), default="win_rate", help="選手ランキングの指標")
+    parser.add_argument("--min-games", type=int, default=1, help="選手ランキングに含める最低試合数")
+    args = parser.parse_args()
+    
+    league = LeagueStorage(args.data).load_league(args.league, lazy=True)
+    if league is None:
+        print(f"リーグ「{args.league}」を読み込めませんでした。")
+        raise SystemExit(1)
+    
+    reports = list(REPORTS) if args.report == "all" else [args.report]
+    for path, count in export_reports(league, reports, args.format, args.output, args.metric, args.min_games):
+        print(f"{path}: {count}行")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
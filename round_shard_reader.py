@@ -0,0 +1,100 @@
+import os
+from collections import namedtuple
+from storage_codec import open_for_read
+
+class ShardRef(namedtuple("ShardRef", ["reader", "round_number", "position"])):
+    """
+    ラウンドシャード内の1試合を指す参照
+    
+    Attributes:
+        reader (RoundShardReader): 試合データの読み込み元
+        round_number (int): ラウンド番号
+        position (int): シャード内での試合の位置
+    """
+    __slots__ = ()
+    
+    def read(self):
+        """
+        参照先の試合データを読み込む
+        
+        Returns:
+            bytes: 保存形式の試合データ（JSONバイト列）
+        """
+        return self.reader.line(self.round_number, self.position)
+
+
+class RoundShardReader:
+    def __init__(self, rounds_dir, rounds):
+        """
+        ラウンドごとの試合シャードを必要になった時点で読み込むクラス
+        
+        一度読み込んだシャードは保持するため、同じラウンドのファイルが
+        後から書き換えられても参照の位置はずれない。
+        
+        Args:
+            rounds_dir (str): シャードファイルのあるディレクトリ
+            rounds (list): マニフェストのラウンド情報のリスト
+        """
+        self.rounds_dir = rounds_dir
+        self._entries = {entry["round_number"]: entry for entry in rounds}
+        self._lines = {}  # ラウンド番号 -> 試合データ(bytes)のリスト
+    
+    def __getstate__(self):
+        """
+        保存用の状態（session_cache.py で使用）
+        
+        シャードのファイル名はハッシュ値を含み、書き換えられないため、
+        読み込み済みの試合データは保存せず、復元後に必要になった時点で読み直す。
+        """
+        state = self.__dict__.copy()
+        state["_lines"] = {}
+        return state
+    
+    def digest(self, round_number):
+        """
+        読み込み時点のシャードのハッシュ値を取得
+        
+        Args:
+            round_number (int): ラウンド番号
+            
+        Returns:
+            str: ハッシュ値、シャードが存在しない場合はNone
+        """
+        entry = self._entries.get(round_number)
+        return entry["sha1"] if entry else None
+    
+    def load(self, round_number):
+        """
+        指定ラウンドのシャードを読み込む
+        
+        Args:
+            round_number (int): ラウンド番号
+            
+        Returns:
+            list: 試合データ(bytes)のリスト
+        """
+        lines = self._lines.get(round_number)
+        if lines is not None:
+            return lines
+        
+        entry = self._entries.get(round_number)
+        if entry is None:
+            lines = []
+        else:
+            with open_for_read(os.path.join(self.rounds_dir, entry["file"])) as f:
+                lines = f.read().splitlines()
+        self._lines[round_number] = lines
+        return lines
+    
+    def line(self, round_number, position):
+        """
+        指定ラウンド・位置の試合データを取得
+        
+        Args:
+            round_number (int): ラウンド番号
+            position (int): シャード内での試合の位置
+            
+        Returns:
+            bytes: 保存形式の試合データ（JSONバイト列）
+        """
+        return self.load(round_number)[position]
\ No newline at end of file
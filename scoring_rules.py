@@ -0,0 +1,247 @@
+from operator import itemgetter
+
+# 順位の決め方に使える項目 -> 表示名
+TIEBREAKERS = {
+    "points": "勝点",
+    "win_rate": "勝率",
+    "goal_difference": "得失点差",
+    "goals_for": "総得点",
+    "goals_against": "総失点（少ない方が上位）",
+    "wins": "勝利数",
+    "regulation_wins": "延長戦を除く勝利数"
+}
+
+# 従来の順位の決め方（勝点 > 勝率 > 得失点差）
+DEFAULT_TIEBREAKERS = ("points", "win_rate", "goal_difference")
+
+# standings が並べ替える行の中での各項目の位置
+# 行: (Team, 勝点, 勝率, 得失点差, 総得点, -総失点, 勝利数, 延長戦を除く勝利数)
+_ROW_COLUMNS = {
+    "points": 1,
+    "win_rate": 2,
+    "goal_difference": 3,
+    "goals_for": 4,
+    "goals_against": 5,
+    "wins": 6,
+    "regulation_wins": 7
+}
+
+class ScoringRules:
+    def __init__(self, win=3, draw=1, loss=0, overtime_win=None, overtime_loss=None,
+                 bonus_goals=None, bonus_loss_margin=None, tiebreakers=DEFAULT_TIEBREAKERS):
+        """
+        勝点の計算方法と順位の決め方（リーグごとの設定）
+        
+        設定は作成時に1度だけ並べ替えのキーに変換し、順位表は全チームの勝点と
+        並べ替えに使う値を1回の走査でまとめて計算する（チームごとのメソッド呼び出しはしない）。
+        設定を変える場合は新しいオブジェクトを作る（League.set_scoring_rules）。
+        
+        Args:
+            win (int): 勝ちの勝点
+            draw (int): 引き分けの勝点
+            loss (int): 負けの勝点
+            overtime_win (int, optional): 延長戦・PK戦での勝ちの勝点（省略時は win と同じ）
+            overtime_loss (int, optional): 延長戦・PK戦での負けの勝点（省略時は loss と同じ）
+            bonus_goals (int, optional): 1試合でこの得点以上なら勝点+1（ボーナスポイント）
+            bonus_loss_margin (int, optional): この点差以内の負けなら勝点+1（ボーナスポイント）
+            tiebreakers (iterable): 順位の決め方（TIEBREAKERS の項目を優先順に並べたもの）
+        """
+        tiebreakers = tuple(tiebreakers)
+        if not tiebreakers:
+            raise ValueError("順位の決め方を1つ以上指定してください")
+        for name in tiebreakers:
+            if name not in TIEBREAKERS:
+                raise ValueError(f"未対応の順位の決め方です: {name}")
+        if bonus_goals is not None and bonus_goals < 1:
+            raise ValueError(f"ボーナスポイントの得点は1以上にしてください: {bonus_goals}")
+        if bonus_loss_margin is not None and bonus_loss_margin < 1:
+            raise ValueError(f"ボーナスポイントの点差は1以上にしてください: {bonus_loss_margin}")
+        
+        self.win = win
+        self.draw = draw
+        self.loss = loss
+        self.overtime_win = overtime_win
+        self.overtime_loss = overtime_loss
+        self.bonus_goals = bonus_goals
+        self.bonus_loss_margin = bonus_loss_margin
+        self.tiebreakers = tiebreakers
+        
+        # 並べ替えのキー（行の中の項目の位置を優先順に取り出す）
+        self._sort_key = itemgetter(*(_ROW_COLUMNS[name] for name in tiebreakers))
+        self._overtime_win = win if overtime_win is None else overtime_win
+        self._overtime_loss = loss if overtime_loss is None else overtime_loss
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        保存形式から復元
+        
+        Args:
+            data (dict): to_dict の戻り値（None なら既定の設定）
+            
+        Returns:
+            ScoringRules: 復元した設定
+        """
+        if not data:
+            return cls()
+        return cls(
+            data.get("win", 3),
+            data.get("draw", 1),
+            data.get("loss", 0),
+            data.get("overtime_win"),
+            data.get("overtime_loss"),
+            data.get("bonus_goals"),
+            data.get("bonus_loss_margin"),
+            data.get("tiebreakers", DEFAULT_TIEBREAKERS)
+        )
+    
+    def to_dict(self):
+        """
+        保存形式に変換
+        
+        Returns:
+            dict: 設定の値
+        """
+        return {
+            "win": self.win,
+            "draw": self.draw,
+            "loss": self.loss,
+            "overtime_win": self.overtime_win,
+            "overtime_loss": self.overtime_loss,
+            "bonus_goals": self.bonus_goals,
+            "bonus_loss_margin": self.bonus_loss_margin,
+            "tiebreakers": list(self.tiebreakers)
+        }
+    
+    def __eq__(self, other):
+        return isinstance(other, ScoringRules) and self.to_dict() == other.to_dict()
+    
+    def __hash__(self):
+        return hash((self.win, self.draw, self.loss, self.overtime_win, self.overtime_loss,
+                     self.bonus_goals, self.bonus_loss_margin, self.tiebreakers))
+    
+    @property
+    def uses_overtime(self):
+        """
+        延長戦・PK戦の勝敗で勝点が変わるか
+        """
+        return self._overtime_win != self.win or self._overtime_loss != self.loss
+    
+    @property
+    def uses_bonus(self):
+        """
+        ボーナスポイントがあるか
+        """
+        return self.bonus_goals is not None or self.bonus_loss_margin is not None
+    
+    def standings(self, teams):
+        """
+        順位表を計算
+        
+        Args:
+            teams (list): Teamオブジェクトのリスト
+            
+        Returns:
+            list: [(Team, 勝点, 勝率, 得失点差), ...] の形式で順位の順
+        """
+        teams = list(teams)
+        win, draw, loss = self.win, self.draw, self.loss
+        overtime_win, overtime_loss = self._overtime_win, self._overtime_loss
+        rows = [
+            (
+                team,
+                team.wins * win + team.draws * draw + team.losses * loss
+                + team.overtime_wins * (overtime_win - win) + team.overtime_losses * (overtime_loss - loss),
+                team.wins / team.matches_played if team.matches_played else 0.0,
+                team.goals_for - team.goals_against,
+                team.goals_for,
+                -team.goals_against,
+                team.wins,
+                team.wins - team.overtime_wins
+            )
+            for team in teams
+        ]
+        if self.uses_bonus:
+            rows = [(row[0], row[1] + bonus) + row[2:] for row, bonus in zip(rows, self._bonus_points(teams))]
+        rows.sort(key=self._sort_key, reverse=True)
+        return [row[:4] for row in rows]
+    
+    def _bonus_points(self, teams):
+        """
+        チームごとのボーナスポイント
+        
+        Args:
+            teams (list): Teamオブジェクトのリスト
+            
+        Returns:
+            list: teams と同じ順のボーナスポイント
+        """
+        bonus_goals = self.bonus_goals
+        margin = self.bonus_loss_margin
+        points = []
+        for team in teams:
+            total = 0
+            if bonus_goals is not None:
+                total += sum(count for goals, count in team.score_counts.items() if goals >= bonus_goals)
+            if margin is not None:
+                total += sum(count for difference, count in team.loss_margins.items() if difference <= margin)
+            points.append(total)
+        return points
+    
+    def points_for(self, team):
+        """
+        1チームの勝点
+        
+        Args:
+            team (Team): チームオブジェクト
+            
+        Returns:
+            int: 勝点
+        """
+        return self.standings([team])[0][1]
+    
+    def outcomes(self):
+        """
+        1試合で両チームが得る勝点の組み合わせ（ボーナスポイントを除く）
+        
+        Returns:
+            list: [(1チーム目の勝点, 2チーム目の勝点), ...]
+        """
+        outcomes = [(self.win, self.loss), (self.draw, self.draw), (self.loss, self.win)]
+        if self.uses_overtime:
+            outcomes += [(self._overtime_win, self._overtime_loss), (self._overtime_loss, self._overtime_win)]
+        return outcomes
+    
+    def max_match_points(self):
+        """
+        1試合で1チームが得られる最大の勝点（ボーナスポイントを含む）
+        
+        Returns:
+            int: 最大の勝点
+        """
+        goal_bonus = 1 if self.bonus_goals is not None else 0
+        loss_bonus = 1 if self.bonus_loss_margin is not None else 0
+        return max(
+            max(self.win, self._overtime_win, self.draw) + goal_bonus,
+            max(self.loss, self._overtime_loss) + goal_bonus + loss_bonus
+        )
+    
+    def describe(self):
+        """
+        設定の説明文
+        
+        Returns:
+            str: 例 "勝3・分1・負0 / 順位: 勝点 > 勝率 > 得失点差"
+        """
+        parts = [f"勝{self.win}・分{self.draw}・負{self.loss}"]
+        if self.uses_overtime:
+            parts.append(f"延長勝{self._overtime_win}・延長負{self._overtime_loss}")
+        if self.bonus_goals is not None:
+            parts.append(f"{self.bonus_goals}点以上で+1")
+        if self.bonus_loss_margin is not None:
+            parts.append(f"{self.bonus_loss_margin}点差以内の負けで+1")
+        order = " > ".join(TIEBREAKERS[name] for name in self.tiebreakers)
+        return f"{'、'.join(parts)} / 順位: {order}"
+
+# 設定のないリーグ・チームで使う勝点の計算方法（勝=3点, 引分=1点, 負=0点）
+DEFAULT_RULES = ScoringRules()
\ No newline at end of file
@@ -0,0 +1,197 @@
+import os
+import pickle
+import sys
+from league_storage import LeagueStorage
+
+# キャッシュのファイル名（保存先ディレクトリ内。大会の一覧には表示されない）
+CACHE_FILE = ".session_cache.pickle"
+
+# キャッシュの形式のバージョン（形式を変えたら増やす）
+CACHE_FORMAT_VERSION = 1
+
+# キャッシュに保存されるオブジェクトのクラスを定義するモジュール
+# （いずれかのファイルが変わったら、保存時と属性が異なる可能性があるためキャッシュを使わない）
+PICKLED_MODULES = (
+    "league_class", "team_class", "player_class", "match_class", "form_tracker",
+    "scoring_rules", "membership_history", "lazy_match_list", "round_shard_reader", "league_storage",
+    "session_cache"
+)
+
+class SessionCache:
+    def __init__(self, storage=None):
+        """
+        前回開いた大会を次回の起動時にすぐ開くためのキャッシュ
+        
+        最後に開いた（読み込んだ・保存した）大会を、保存ファイルの内容のハッシュ値と一緒に
+        pickle で保存しておく。次回の起動時はハッシュ値が変わっていなければ、
+        JSONの解析とチーム・選手の復元をせずにキャッシュから大会を復元する。
+        試合データは保存形式のまま（ディレクトリ形式ではシャードへの参照のまま）保持し、
+        通常の遅延読み込みと同じくアクセスされた時点で復元する。
+        
+        Args:
+            storage (LeagueStorage, optional): 大会の保存先（省略時は既定の data ディレクトリ）
+        """
+        self.storage = storage or LeagueStorage()
+        self.path = os.path.join(self.storage.directory, CACHE_FILE)
+    
+    def _fingerprint(self):
+        """
+        キャッシュを作ったプログラムの識別値
+        
+        Returns:
+            tuple: (Pythonのバージョン, 各モジュールの(更新時刻, サイズ))
+        """
+        base = os.path.dirname(os.path.abspath(__file__))
+        files = []
+        for name in PICKLED_MODULES:
+            try:
+                stat = os.stat(os.path.join(base, f"{name}.py"))
+            except OSError:
+                files.append(None)
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(sys.version_info[:3]), tuple(files)
+    
+    def _read_header(self, f):
+        """
+        キャッシュの先頭の情報を読み込んで確認
+        
+        Args:
+            f (file): キャッシュファイル
+            
+        Returns:
+            dict: 先頭の情報、形式・プログラムが一致しない場合はNone
+        """
+        header = pickle.load(f)
+        if not isinstance(header, dict) or header.get("format") != CACHE_FORMAT_VERSION:
+            return None
+        if header.get("fingerprint") != self._fingerprint():
+            return None
+        return header
+    
+    def last_league_name(self):
+        """
+        キャッシュに保存されている大会名を取得
+        
+        Returns:
+            str: 大会名、キャッシュがない・使えない場合はNone
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                header = self._read_header(f)
+        except Exception:
+            return None
+        return header["league"] if header else None
+    
+    def load(self, league_name=None):
+        """
+        キャッシュから大会を復元
+        
+        保存ファイルのハッシュ値がキャッシュを作ったときと異なる場合（他の端末での保存・
+        ファイルの書き換え）や、キャッシュが壊れている場合は使わない。
+        
+        Args:
+            league_name (str, optional): 大会名（省略時は前回開いた大会）
+            
+        Returns:
+            League: 復元した大会、キャッシュが使えない場合はNone
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                header = self._read_header(f)
+                if header is None:
+                    return None
+                # 別の大会を指定した場合は保存ファイルが異なるためハッシュ値も一致しない
+                if header["checksum"] != self.storage.get_league_checksum(league_name or header["league"]):
+                    return None
+                league = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 壊れたキャッシュは作り直す
+            self.clear()
+            return None
+        
+        self.storage.bind_matches(league)
+        return league
+    
+    def open(self, league_name):
+        """
+        大会を開く（キャッシュが使えればキャッシュから、使えなければ保存ファイルから読み込む）
+        
+        保存ファイルから読み込んだ場合はキャッシュを作り直す。
+        
+        Args:
+            league_name (str): 大会名
+            
+        Returns:
+            League: 開いた大会、保存されていない場合はNone
+        """
+        league = self.load(league_name)
+        if league is not None:
+            return league
+        
+        # 読み込む前のハッシュ値を記録する（読み込み中に保存された場合は次回の起動時に作り直される）
+        checksum = self.storage.get_league_checksum(league_name)
+        league = self.storage.load_league(league_name, lazy=True)
+        if league is not None and checksum is not None:
+            self._write(league, checksum)
+        return league
+    
+    def store(self, league):
+        """
+        開いている大会をキャッシュに保存（保存ファイルに保存した直後に使用）
+        
+        保存ファイルのバージョンが大会と一致する場合だけ保存する。
+        ハッシュ値を先に計算するため、その後に他の端末で保存されても
+        古いハッシュ値のキャッシュになるだけで、新しい保存ファイルと取り違えることはない。
+        
+        Args:
+            league (League): 保存する大会
+            
+        Returns:
+            bool: キャッシュを保存したらTrue
+        """
+        checksum = self.storage.get_league_checksum(league.name)
+        if checksum is None or self.storage.get_league_version(league.name) != league.version:
+            return False
+        return self._write(league, checksum)
+    
+    def _write(self, league, checksum):
+        """
+        キャッシュファイルを書き込む（一時ファイルに書いてから置き換える）
+        
+        Args:
+            league (League): 保存する大会
+            checksum (str): 大会の保存ファイルのハッシュ値
+            
+        Returns:
+            bool: 保存に成功したらTrue
+        """
+        header = {
+            "format": CACHE_FORMAT_VERSION,
+            "fingerprint": self._fingerprint(),
+            "league": league.name,
+            "checksum": checksum
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(league, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception:
+            # キャッシュがなくても通常の読み込みで開けるため、失敗は無視する
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+    
+    def clear(self):
+        """
+        キャッシュを削除
+        """
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
\ No newline at end of file
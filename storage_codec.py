@@ -0,0 +1,74 @@
+import bz2
+import gzip
+import lzma
+
+# 圧縮形式 -> ファイル先頭のマジックナンバー
+CODEC_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "lzma": b"\xfd7zXZ\x00"
+}
+
+CODECS = ("none", "gzip", "bz2", "lzma")
+
+def detect_codec(path):
+    """
+    ファイル先頭のバイト列から圧縮形式を判定
+    
+    Args:
+        path (str): 判定するファイルのパス
+        
+    Returns:
+        str: 圧縮形式（"none", "gzip", "bz2", "lzma"）
+    """
+    with open(path, 'rb') as f:
+        header = f.read(6)
+    for codec, magic in CODEC_MAGIC.items():
+        if header.startswith(magic):
+            return codec
+    return "none"
+
+def open_for_read(path):
+    """
+    圧縮形式を自動判定してバイナリ読み込み用に開く
+    
+    圧縮ファイルは読み進めながら展開されるため、
+    圧縮データ全体をメモリに保持することはない。
+    
+    Args:
+        path (str): 読み込むファイルのパス
+        
+    Returns:
+        file: バイナリ読み込み用のファイルオブジェクト
+    """
+    codec = detect_codec(path)
+    if codec == "gzip":
+        return gzip.open(path, 'rb')
+    if codec == "bz2":
+        return bz2.open(path, 'rb')
+    if codec == "lzma":
+        return lzma.open(path, 'rb')
+    return open(path, 'rb')
+
+def open_for_write(path, codec):
+    """
+    指定した圧縮形式でバイナリ書き込み用に開く
+    
+    書き込んだデータは逐次圧縮されてファイルに出力される。
+    
+    Args:
+        path (str): 書き込むファイルのパス
+        codec (str): 圧縮形式（"none", "gzip", "bz2", "lzma"）
+        
+    Returns:
+        file: バイナリ書き込み用のファイルオブジェクト
+    """
+    if codec == "gzip":
+        return gzip.open(path, 'wb', compresslevel=6)
+    if codec == "bz2":
+        return bz2.open(path, 'wb')
+    if codec == "lzma":
+        return lzma.open(path, 'wb')
+    if codec in (None, "none"):
+        return open(path, 'wb')
+    raise ValueError(f"未対応の圧縮形式です: {codec}")
\ No newline at end of file
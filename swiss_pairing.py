@@ -0,0 +1,370 @@
+from collections import deque
+from itertools import chain
+
+# 重み付きマッチングで組み合わせるチーム数の上限（これより多い場合はグループごとのダッチ方式で組む）
+WEIGHTED_PAIRING_LIMIT = 200
+# 勝点グループの外で候補にする、グループの前後のチーム数
+CANDIDATE_PARTNERS = 16
+
+class SwissPairing:
+    def __init__(self, league):
+        """
+        スイス式トーナメントの組み合わせを作成するクラス
+        
+        勝点の近いチーム同士を対戦させる。同じ勝点のグループ内では
+        上位半分と下位半分を対戦させ（ダッチ方式）、対戦済みの組み合わせは
+        避ける。グループ内で組めないチームは近いグループのチームと組む。
+        組めなかったチームは未対戦の組だけで増加路を探して組み替えるため、
+        未対戦の組だけで全チームを組める限り再戦にはならない。
+        
+        Args:
+            league (League): 対象のリーグ
+        """
+        self.league = league
+        self.opponents = {}    # チームID -> 対戦済みのチームIDの集合
+        self.home_balance = {}  # チームID -> ホーム回数 - アウェイ回数
+        self._build_index()
+    
+    def _build_index(self):
+        """
+        既存の試合から対戦済みの組み合わせとホーム・アウェイの偏りを集計
+        
+        遅延読み込みの試合リストでは試合を復元せず、保存データから対戦チームのIDだけを読み取る。
+        """
+        from lazy_match_list import LazyMatchList
+        
+        for team_id in self.league.teams:
+            self.opponents[team_id] = set()
+            self.home_balance[team_id] = 0
+        
+        matches = self.league.matches
+        if isinstance(matches, LazyMatchList):
+            fixtures = (matches.match_teams(i) for i in range(len(matches)))
+        else:
+            fixtures = ((match.home_team.id, match.away_team.id) for match in matches)
+        for home_id, away_id in fixtures:
+            self.opponents[home_id].add(away_id)
+            self.opponents[away_id].add(home_id)
+            self.home_balance[home_id] += 1
+            self.home_balance[away_id] -= 1
+    
+    def ranked_teams(self):
+        """
+        組み合わせ用の順位でチームを並べる
+        
+        勝点はリーグの勝点の計算方法による（順位表の計算結果を使う）。
+        
+        Returns:
+            list: (勝点, Team) のリスト（勝点・得失点差の降順、同点はチームID順）
+        """
+        ranked = [(points, goal_diff, team.id, team) for team, points, _, goal_diff in self.league.get_standings()]
+        ranked.sort(key=lambda row: (-row[0], -row[1], row[2]))
+        return [(points, team) for points, _, _, team in ranked]
+    
+    def _choose_bye(self, ranked):
+        """
+        チーム数が奇数の場合に不戦勝（バイ）のチームを選ぶ
+        
+        まだバイを受けていないチームのうち最下位のチームを選ぶ。
+        
+        Args:
+            ranked (list): (勝点, Team) のリスト
+            
+        Returns:
+            Team: バイのチーム、偶数の場合はNone
+        """
+        if len(ranked) % 2 == 0:
+            return None
+        had_bye = set(self.league.byes.values())
+        for _, team in reversed(ranked):
+            if team.id not in had_bye:
+                return team
+        return ranked[-1][1]
+    
+    def _orient(self, first, second):
+        """
+        ホーム・アウェイの回数が偏らないよう向きを決める
+        
+        Args:
+            first (Team): 上位のチーム
+            second (Team): 下位のチーム
+            
+        Returns:
+            tuple: (ホームチーム, アウェイチーム)
+        """
+        if self.home_balance[first.id] > self.home_balance[second.id]:
+            return second, first
+        return first, second
+    
+    def _pair_weights(self, teams, groups, rematch=False):
+        """
+        組み合わせの候補の組ごとに望ましさ（重み）を計算
+        
+        候補は同じ勝点グループの組と、グループの前後 CANDIDATE_PARTNERS チームとの組だけとする
+        （全ての組は作らない）。重みは次の順に優先する罰点を引いたもの（大きいほど望ましい）:
+        勝点グループの離れ具合（の2乗）、ホーム・アウェイの偏りが同じ側のチーム同士か、
+        グループ内で上位半分と下位半分の対応する位置から離れている度合い（ダッチ方式）。
+        
+        Args:
+            teams (list): 順位順の Team のリスト
+            groups (list): teams と同じ順の勝点グループの番号のリスト
+            rematch (bool): Trueなら対戦済みの組も含める
+            
+        Returns:
+            dict: (i, j) -> 重み（i < j は teams の位置、rematch が False なら対戦済みの組は含まない）
+        """
+        size = len(teams)
+        group_sizes = {}
+        group_starts = {}
+        for position, group in enumerate(groups):
+            group_sizes[group] = group_sizes.get(group, 0) + 1
+            group_starts.setdefault(group, position)
+        
+        colour_unit = size + 1
+        score_unit = colour_unit * (1 + max(abs(balance) for balance in self.home_balance.values()))
+        
+        penalties = {}
+        for i in range(size):
+            played = self.opponents[teams[i].id]
+            balance_i = self.home_balance[teams[i].id]
+            group_end = group_starts[groups[i]] + group_sizes[groups[i]]
+            for j in range(i + 1, min(size, group_end + CANDIDATE_PARTNERS)):
+                if not rematch and teams[j].id in played:
+                    continue
+                gap = groups[j] - groups[i]
+                if gap == 0:
+                    # 同じグループでは i 番目と i + 半数 番目の対戦が最も望ましい
+                    half = group_sizes[groups[i]] // 2
+                    dutch = abs((j - i) - half)
+                else:
+                    # 繰り下げは下のグループの上位と組む
+                    dutch = j - group_starts[groups[j]]
+                balance_j = self.home_balance[teams[j].id]
+                colour = min(abs(balance_i), abs(balance_j)) if balance_i * balance_j > 0 else 0
+                penalties[i, j] = gap * gap * score_unit + colour * colour_unit + dutch
+        
+        top = 1 + max(penalties.values(), default=0)
+        return {pair: top - penalty for pair, penalty in penalties.items()}
+    
+    def _pair_groups(self, teams, groups, rematch=False):
+        """
+        勝点グループごとにダッチ方式で組み合わせる（チーム数が多い場合の最初の組み合わせ）
+        
+        上位のグループから順に、グループ（と繰り下げられたチーム）の上位半分の i 番目と
+        下位半分の i 番目を対戦させ、対戦済みなら下位半分の次のチーム、さらにグループ内の
+        残りのチームを順に探す。組めなかったチームは次のグループに繰り下げる。
+        
+        Args:
+            teams (list): 順位順の Team のリスト
+            groups (list): teams と同じ順の勝点グループの番号のリスト
+            rematch (bool): Trueなら対戦済みの組も組む
+            
+        Returns:
+            list: 位置 -> 相手の位置（組めなかった位置は -1）のリスト
+        """
+        mate = [-1] * len(teams)
+        floaters = []
+        start = 0
+        while start < len(teams):
+            end = start
+            while end < len(teams) and groups[end] == groups[start]:
+                end += 1
+            block = floaters + list(range(start, end))
+            size = len(block)
+            half = size // 2
+            for i in range(size):
+                if mate[block[i]] != -1:
+                    continue
+                played = () if rematch else self.opponents[teams[block[i]].id]
+                # 下位半分の対応する位置から探し、見つからなければグループ全体を探す
+                first = max(i + 1, i + half) if i < half else i + 1
+                for j in chain(range(first, size), range(i + 1, first)):
+                    if mate[block[j]] == -1 and teams[block[j]].id not in played:
+                        mate[block[i]] = block[j]
+                        mate[block[j]] = block[i]
+                        break
+            floaters = [position for position in block if mate[position] == -1]
+            start = end
+        return mate
+    
+    def _match(self, teams, groups, rematch=False):
+        """
+        最初の組み合わせを求める
+        
+        チーム数が WEIGHTED_PAIRING_LIMIT 以下なら、候補の組の中で組の数が最大で、その中で
+        重みの合計が最大になる組み合わせを求める。多い場合は勝点グループごとにダッチ方式で組む。
+        どちらも組めないチームが残ることがある（_augment で組み替える）。
+        
+        Args:
+            teams (list): 順位順の Team のリスト
+            groups (list): teams と同じ順の勝点グループの番号のリスト
+            rematch (bool): Trueなら対戦済みの組も組む
+            
+        Returns:
+            list: 位置 -> 相手の位置（組めなかった位置は -1）のリスト
+        """
+        from graph_matching import max_weight_matching
+        
+        if len(teams) > WEIGHTED_PAIRING_LIMIT:
+            return self._pair_groups(teams, groups, rematch)
+        weights = self._pair_weights(teams, groups, rematch)
+        mate = max_weight_matching([(i, j, weight) for (i, j), weight in weights.items()], max_cardinality=True)
+        return mate + [-1] * (len(teams) - len(mate))
+    
+    def _augment(self, teams, mate, rematch=False):
+        """
+        組めなかったチームから増加路（Edmonds のブロッサム法）を探して組み替える
+        
+        相手の候補は順位の前後 CANDIDATE_PARTNERS チームから探し始め、それでも組めない
+        チームが残る間は範囲を4倍ずつ広げる（最後は全チーム）。全チームを候補にしても
+        増加路がなければ、未対戦の組だけでは組めるチームの数はそれ以上増えない。
+        
+        Args:
+            teams (list): 順位順の Team のリスト
+            mate (list): 位置 -> 相手の位置（組めなかった位置は -1）のリスト（その場で更新）
+            rematch (bool): Trueなら対戦済みの組も組む
+        """
+        size = len(teams)
+        ids = [team.id for team in teams]
+        played = [() if rematch else self.opponents[team_id] for team_id in ids]
+        
+        window = CANDIDATE_PARTNERS
+        while True:
+            for root in range(size):
+                if mate[root] == -1:
+                    self._find_path(root, mate, ids, played, window)
+            if window >= size or -1 not in mate:
+                return
+            window *= 4
+    
+    def _find_path(self, root, mate, ids, played, window):
+        """
+        組めていない root から増加路を幅優先で探し、見つかれば組み替える
+        
+        奇数長の閉路（ブロッサム）は根に近い頂点（底）にまとめて扱う。
+        探索で訪れた頂点の分だけ状態を持つため、増加路が近くにあれば短時間で終わる。
+        
+        Args:
+            root (int): 探索を始める位置
+            mate (list): 位置 -> 相手の位置（組めなかった位置は -1）のリスト（その場で更新）
+            ids (list): 位置 -> チームID のリスト
+            played (list): 位置 -> 対戦済みのチームIDの集合のリスト
+            window (int): 相手の候補にする順位の前後の範囲
+            
+        Returns:
+            bool: 組み替えられたらTrue
+        """
+        size = len(mate)
+        parent = {}   # 奇数側の頂点 -> 探索木での親
+        base = {}     # 頂点 -> ブロッサムの底（含まれない頂点は自分自身）
+        outer = {root}  # 偶数側の頂点
+        tree = [root]
+        queue = deque([root])
+        
+        def base_of(v):
+            return base.get(v, v)
+        
+        def common_base(a, b):
+            # a から根までの偶数側の底に印を付け、b から上って最初に印のある底を探す
+            marked = set()
+            while True:
+                a = base_of(a)
+                marked.add(a)
+                if mate[a] == -1:
+                    break
+                a = parent[mate[a]]
+            while True:
+                b = base_of(b)
+                if b in marked:
+                    return b
+                b = parent[mate[b]]
+        
+        def mark_blossom(v, bottom, child, blossom):
+            while base_of(v) != bottom:
+                blossom.add(base_of(v))
+                blossom.add(base_of(mate[v]))
+                parent[v] = child
+                child = mate[v]
+                v = parent[mate[v]]
+        
+        while queue:
+            v = queue.popleft()
+            for step in range(1, window + 1):
+                if v - step < 0 and v + step >= size:
+                    break
+                for to in (v - step, v + step):
+                    if to < 0 or to >= size or ids[to] in played[v]:
+                        continue
+                    if base_of(v) == base_of(to) or mate[v] == to:
+                        continue
+                    if to == root or (mate[to] != -1 and mate[to] in parent):
+                        # 偶数側の頂点同士がつながった: ブロッサムを縮約する
+                        bottom = common_base(v, to)
+                        blossom = set()
+                        mark_blossom(v, bottom, to, blossom)
+                        mark_blossom(to, bottom, v, blossom)
+                        for u in tree:
+                            if base_of(u) in blossom:
+                                base[u] = bottom
+                                if u not in outer:
+                                    outer.add(u)
+                                    queue.append(u)
+                    elif to not in parent:
+                        parent[to] = v
+                        tree.append(to)
+                        if mate[to] == -1:
+                            # 増加路が見つかった: 根まで組み替える
+                            while to != -1:
+                                previous = parent[to]
+                                following = mate[previous]
+                                mate[to] = previous
+                                mate[previous] = to
+                                to = following
+                            return True
+                        outer.add(mate[to])
+                        tree.append(mate[to])
+                        queue.append(mate[to])
+        return False
+    
+    def pair(self):
+        """
+        次のラウンドの組み合わせを作成（試合は作成しない）
+        
+        最初の組み合わせ（_match）で組めなかったチームから、未対戦の組だけで増加路を探して
+        組み替える（_augment）。再戦は、未対戦の組だけでは全チームを組めない場合に
+        組めなかったチーム同士に限って許す（再戦の数はこれで最小になる）。
+        
+        Returns:
+            tuple: ([(ホームチーム, アウェイチーム), ...], バイのチーム または None)
+        """
+        ranked = self.ranked_teams()
+        bye = self._choose_bye(ranked)
+        
+        # 勝点ごとのグループの番号を付ける
+        teams = []
+        groups = []
+        last_points = None
+        for points, team in ranked:
+            if team is bye:
+                continue
+            if points != last_points:
+                last_points = points
+                group = len(groups) and groups[-1] + 1
+            teams.append(team)
+            groups.append(group)
+        
+        mate = self._match(teams, groups)
+        self._augment(teams, mate)
+        pairs = [(teams[i], teams[j]) for i, j in enumerate(mate) if i < j]
+        leftovers = [i for i, j in enumerate(mate) if j == -1]
+        
+        if leftovers:
+            # どう組み替えても未対戦の相手がいないチームは、残ったチーム同士で再戦とする
+            rest = [teams[i] for i in leftovers]
+            rest_mate = self._match(rest, [groups[i] for i in leftovers], rematch=True)
+            self._augment(rest, rest_mate, rematch=True)
+            pairs.extend((rest[i], rest[j]) for i, j in enumerate(rest_mate) if i < j)
+        
+        rank = {team.id: position for position, (_, team) in enumerate(ranked)}
+        pairs.sort(key=lambda pair: rank[pair[0].id])
+        return [self._orient(first, second) for first, second in pairs], bye
\ No newline at end of file
@@ -1,3 +1,40 @@
+import threading
+from contextlib import contextmanager
+from operator import attrgetter
+from form_tracker import FormTracker
+from scoring_rules import DEFAULT_RULES
+
+@contextmanager
+def hold_locks(locks):
+    """
+    複数のロックを並びの順に取得し、逆順に解放する
+    
+    Args:
+        locks (list): ロックのリスト（lock_teams と同じくチームIDの順に並べておく）
+    """
+    for lock in locks:
+        lock.acquire()
+    try:
+        yield
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+def lock_teams(teams):
+    """
+    複数のチームのロックをまとめて取得
+    
+    ロックは常にチームIDの順に取得するため、同じチームを含む組み合わせを
+    複数のスレッドが同時にロックしてもデッドロックしない。
+    
+    Args:
+        teams (iterable): ロックするチームオブジェクト
+        
+    Returns:
+        contextmanager: with 文で使うロックの取得
+    """
+    return hold_locks([team.lock for team in sorted(set(teams), key=attrgetter("id"))])
+
 class Team:
     def __init__(self, id, name):
         """
@@ -18,6 +55,28 @@ class Team:
         self.draws = 0           # 引き分け数
         self.goals_for = 0       # 得点
         self.goals_against = 0   # 失点
+        self.form = FormTracker()  # 直近の成績・連勝記録
+        self.overtime_wins = 0    # 延長戦・PK戦での勝利数（wins に含む）
+        self.overtime_losses = 0  # 延長戦・PK戦での敗北数（losses に含む）
+        self.score_counts = {}    # 1試合の得点 -> 試合数（ボーナスポイントの計算用）
+        self.loss_margins = {}    # 負けた試合の点差 -> 試合数（ボーナスポイントの計算用）
+        self.scoring_rules = None  # 所属リーグの勝点の計算方法（League.add_team で設定）
+        self.membership = None  # 所属リーグの選手の所属履歴（League.add_team で設定）
+        
+        # チーム・所属選手の成績を更新するときのロック（複数のスレッドから結果を入力する場合）
+        self.lock = threading.RLock()
+    
+    def __getstate__(self):
+        """
+        保存用の状態（ロックは保存できないため除く。session_cache.py で使用）
+        """
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
     
     def add_player(self, player):
         """
@@ -29,25 +88,35 @@ class Team:
         player.team_id = self.id
         self.players[player.id] = player
     
-    def add_match_result(self, own_score, opponent_score, result):
+    def add_match_result(self, own_score, opponent_score, result, overtime=False):
         """
         チームの試合結果を追加
         
+        複数のスレッドから結果を入力する場合は、チームのロックを取得してから呼ぶ
+        （Match.set_score は両チームのロックを取得してから呼び出す）。
+        
         Args:
             own_score (int): 自チームの得点
             opponent_score (int): 相手チームの得点
             result (str): '○' (勝ち), '×' (負け), or '△' (引き分け)
+            overtime (bool): 延長戦・PK戦で決着した試合か
         """
         self.matches_played += 1
         self.goals_for += own_score
         self.goals_against += opponent_score
+        self.score_counts[own_score] = self.score_counts.get(own_score, 0) + 1
         
         if result == '○':
             self.wins += 1
+            self.overtime_wins += overtime
         elif result == '×':
             self.losses += 1
+            self.overtime_losses += overtime
+            margin = opponent_score - own_score
+            self.loss_margins[margin] = self.loss_margins.get(margin, 0) + 1
         elif result == '△':
             self.draws += 1
+        self.form.add(result)
     
     def win_rate(self):
         """
@@ -60,14 +129,18 @@ class Team:
             return 0.0
         return self.wins / self.matches_played
     
-    def points(self):
+    def points(self, rules=None):
         """
-        勝ち点を計算（勝=3点, 引分=1点, 負=0点）
+        勝ち点を計算
         
+        Args:
+            rules (ScoringRules, optional): 勝点の計算方法。省略時は所属リーグの設定
+                （リーグに属していなければ 勝=3点, 引分=1点, 負=0点）
+                
         Returns:
             int: 勝ち点
         """
-        return self.wins * 3 + self.draws * 1
+        return (rules or self.scoring_rules or DEFAULT_RULES).points_for(self)
     
     def goal_difference(self):
         """
@@ -85,4 +158,7 @@ class Team:
         basic = f"{self.name} ({len(self.players)}人)"
         stats = f"成績: {self.wins}勝 {self.losses}敗 {self.draws}引分 勝率: {self.win_rate():.3f}"
         points = f"勝点: {self.points()}点 得点: {self.goals_for} 失点: {self.goals_against} 得失点差: {self.goal_difference()}"
-        return f"{basic}\n{stats}\n{points}"
\ No newline at end of file
+        if not self.form.count:
+            return f"{basic}\n{stats}\n{points}"
+        form = f"直近{self.form.count}試合: {self.form.recent()} ({self.form.streak()}) 最長連勝: {self.form.longest_win_streak}"
+        return f"{basic}\n{stats}\n{points}\n{form}"
\ No newline at end of file
@@ -0,0 +1,422 @@
+from array import array
+from match_class import Match
+
+# 枠の状態（0以上はシード順の出場チーム番号）
+EMPTY = -1  # まだ決まっていない
+BYE = -2    # 対戦相手なし（不戦勝）
+
+ELIMINATIONS = ("single", "double")
+
+class Tournament:
+    def __init__(self, name, elimination="single"):
+        """
+        トーナメント（勝ち抜き戦）情報
+        
+        組み合わせ表は配列で持つ。試合は番号で管理し、各試合の
+        ホーム・アウェイの枠、勝者、勝者・敗者の進む先の枠（試合番号*2 + 0:ホーム/1:アウェイ）を
+        試合番号の位置に格納する。同じラウンドの試合は番号が連続するため、
+        勝者を進める処理は O(1)、ラウンドの表示は そのラウンドの試合数 に比例する。
+        
+        Args:
+            name (str): トーナメント名
+            elimination (str): "single"（シングルエリミネーション）または
+                "double"（ダブルエリミネーション）
+        """
+        if elimination not in ELIMINATIONS:
+            raise ValueError(f"未対応の形式です: {elimination}")
+        
+        self.name = name
+        self.elimination = elimination
+        self.teams = {}     # チームID -> Teamオブジェクト
+        self.entrants = []  # シード順のチームID（番号 = シード - 1）
+        self.version = 0    # 読み込み・保存時の保存ファイルのバージョン
+        
+        self.rounds = []             # (ラウンド名, 最初の試合番号, 試合数)
+        self.home = array('i')       # 試合番号 -> ホーム側の出場チーム番号
+        self.away = array('i')       # 試合番号 -> アウェイ側の出場チーム番号
+        self.winner = array('i')     # 試合番号 -> 勝者の出場チーム番号
+        self.win_to = array('i')     # 試合番号 -> 勝者が進む枠（なしは-1）
+        self.lose_to = array('i')    # 試合番号 -> 敗者が進む枠（なしは-1）
+        self.matches = []            # 試合番号 -> Matchオブジェクト（対戦が決まるまではNone）
+        self.results = array('i')    # 結果を入力した試合番号（入力順）
+    
+    def add_team(self, team):
+        """
+        トーナメントにチームを追加
+        
+        Args:
+            team (Team): チームオブジェクト
+        """
+        self.teams[team.id] = team
+    
+    def get_team(self, team_id):
+        """
+        チームIDからチームを取得
+        
+        Args:
+            team_id (str): チームID
+            
+        Returns:
+            Team: チームオブジェクト、存在しない場合はNone
+        """
+        return self.teams.get(team_id)
+    
+    def start(self, team_ids):
+        """
+        シード順に組み合わせ表を作成
+        
+        出場チーム数が2のべき乗でない場合は、上位シードから順に不戦勝となる。
+        
+        Args:
+            team_ids (list): シード順（1位から）のチームIDのリスト
+        """
+        self.entrants = list(team_ids)
+        count = len(self.entrants)
+        
+        size = 4 if self.elimination == "double" else 2
+        while size < count:
+            size *= 2
+        
+        self._build(size)
+        
+        # 1回戦の枠にシード順に配置（1位 vs 最下位、2位 vs 下から2番目…）
+        positions = self._seed_positions(size)
+        for slot, seed in enumerate(positions):
+            self._place(slot, seed - 1 if seed <= count else BYE)
+    
+    def _seed_positions(self, size):
+        """
+        1回戦の枠ごとのシード番号を求める
+        
+        上位シード同士が決勝まで当たらない標準的な並びにする。
+        
+        Args:
+            size (int): 枠の数（2のべき乗）
+            
+        Returns:
+            list: 枠の順のシード番号（1から）
+        """
+        positions = [1]
+        while len(positions) < size:
+            total = len(positions) * 2 + 1
+            positions = [seed for position in positions for seed in (position, total - position)]
+        return positions
+    
+    def _add_round(self, name, count):
+        """
+        ラウンドの試合番号を確保
+        
+        Args:
+            name (str): ラウンド名
+            count (int): 試合数
+            
+        Returns:
+            int: 最初の試合番号
+        """
+        start = 0
+        if self.rounds:
+            _, last_start, last_count = self.rounds[-1]
+            start = last_start + last_count
+        self.rounds.append((name, start, count))
+        return start
+    
+    def _build(self, size):
+        """
+        枠の数に合わせて試合と進出先を配列に作成
+        
+        ダブルエリミネーションでは、勝者側の各ラウンドの敗者が敗者側に回り、
+        勝者側・敗者側の優勝チームがグランドファイナルで対戦する。グランドファイナルで
+        敗者側のチームが勝った場合は両チームとも1敗となるため、再戦（最後の試合）で優勝を決める。
+        
+        Args:
+            size (int): 枠の数（2のべき乗）
+        """
+        double = self.elimination == "double"
+        depth = size.bit_length() - 1
+        self.rounds = []
+        
+        # 勝者側（シングルエリミネーションでは本戦）
+        winners_starts = []
+        for r in range(1, depth + 1):
+            count = size >> r
+            if count == 1:
+                name = "勝者側 決勝" if double else "決勝"
+            elif count == 2 and not double:
+                name = "準決勝"
+            else:
+                name = f"勝者側 {r}回戦" if double else f"{r}回戦"
+            winners_starts.append(self._add_round(name, count))
+        
+        # 敗者側: 1回戦の敗者同士 → 勝者側 r回戦の敗者との対戦 → 勝ち残り同士 …
+        losers_starts = []
+        majors = {}
+        if double:
+            losers_starts.append(self._add_round("敗者側 1回戦", size >> 2))
+            for r in range(2, depth + 1):
+                majors[r] = len(losers_starts)
+                losers_starts.append(self._add_round(f"敗者側 {len(losers_starts) + 1}回戦", size >> r))
+                if r < depth:
+                    losers_starts.append(self._add_round(f"敗者側 {len(losers_starts) + 1}回戦", size >> (r + 1)))
+            final_start = self._add_round("グランドファイナル", 1)
+            reset_start = self._add_round("グランドファイナル 再戦", 1)
+        
+        _, last_start, last_count = self.rounds[-1]
+        total = last_start + last_count
+        self.home = array('i', [EMPTY]) * total
+        self.away = array('i', [EMPTY]) * total
+        self.winner = array('i', [EMPTY]) * total
+        self.win_to = array('i', [-1]) * total
+        self.lose_to = array('i', [-1]) * total
+        self.matches = [None] * total
+        self.results = array('i')
+        
+        for r, start in enumerate(winners_starts, 1):
+            count = size >> r
+            for k in range(count):
+                match_index = start + k
+                if r < depth:
+                    self.win_to[match_index] = (winners_starts[r] + k // 2) * 2 + k % 2
+                elif double:
+                    self.win_to[match_index] = final_start * 2
+                if not double:
+                    continue
+                if r == 1:
+                    self.lose_to[match_index] = (losers_starts[0] + k // 2) * 2 + k % 2
+                else:
+                    # 同じ山の相手と再び当たりにくいよう逆順に配置する
+                    self.lose_to[match_index] = (losers_starts[majors[r]] + count - 1 - k) * 2 + 1
+        
+        for position, start in enumerate(losers_starts):
+            count = self.rounds[len(winners_starts) + position][2]
+            last = position == len(losers_starts) - 1
+            next_count = 0 if last else self.rounds[len(winners_starts) + position + 1][2]
+            for k in range(count):
+                match_index = start + k
+                if last:
+                    self.win_to[match_index] = final_start * 2 + 1
+                elif next_count == count:
+                    # 次のラウンドで勝者側から落ちてくるチームと対戦
+                    self.win_to[match_index] = (losers_starts[position + 1] + k) * 2
+                else:
+                    # 勝ち残り同士で対戦
+                    self.win_to[match_index] = (losers_starts[position + 1] + k // 2) * 2 + k % 2
+        
+        if double:
+            # 再戦は勝者側の優勝チームをホームにする（勝者側のチームが勝った場合は _advance で打ち切る）
+            self.win_to[final_start] = reset_start * 2 + 1
+            self.lose_to[final_start] = reset_start * 2
+    
+    def _place(self, slot, entrant):
+        """
+        枠に出場チーム（またはBYE）を入れ、両方の枠が埋まれば対戦を決める
+        
+        Args:
+            slot (int): 枠（試合番号*2 + 0:ホーム/1:アウェイ）
+            entrant (int): 出場チーム番号またはBYE
+        """
+        match_index = slot >> 1
+        if slot & 1:
+            self.away[match_index] = entrant
+        else:
+            self.home[match_index] = entrant
+        
+        home = self.home[match_index]
+        away = self.away[match_index]
+        if home == EMPTY or away == EMPTY:
+            return
+        
+        if home == BYE or away == BYE:
+            # 不戦勝はそのまま次に進める（両方BYEならBYEを進める）
+            self._advance(match_index, away if home == BYE else home, BYE)
+        else:
+            self.matches[match_index] = Match(
+                self.teams[self.entrants[home]],
+                self.teams[self.entrants[away]],
+                round_number=self.round_of(match_index) + 1
+            )
+    
+    def _advance(self, match_index, winner, loser):
+        """
+        試合の勝者・敗者を次の枠に進める
+        
+        Args:
+            match_index (int): 試合番号
+            winner (int): 勝者の出場チーム番号
+            loser (int): 敗者の出場チーム番号
+        """
+        self.winner[match_index] = winner
+        if self.is_grand_final(match_index) and winner == self.home[match_index]:
+            # 勝者側の優勝チームが勝てば敗者側のチームは2敗目のため、再戦は行わずに優勝とする
+            self.winner[match_index + 1] = winner
+            return
+        if self.win_to[match_index] >= 0:
+            self._place(self.win_to[match_index], winner)
+        if self.lose_to[match_index] >= 0:
+            self._place(self.lose_to[match_index], loser)
+    
+    def set_score(self, match_index, home_score, away_score):
+        """
+        試合のスコアを入力して勝者を進める
+        
+        Args:
+            match_index (int): 試合番号
+            home_score (int): ホームチームの得点
+            away_score (int): アウェイチームの得点
+            
+        Returns:
+            bool: 入力できたらTrue（対戦が未決定・入力済み・引き分けの場合はFalse）
+        """
+        match = self.get_match(match_index)
+        if match is None or match.is_finished or home_score == away_score:
+            return False
+        
+        match.set_score(home_score, away_score)
+        self._finish(match_index)
+        return True
+    
+    def restore_score(self, match_index, home_score, away_score):
+        """
+        保存済みのスコアを復元して勝者を進める（チーム成績は更新しない）
+        
+        Args:
+            match_index (int): 試合番号
+            home_score (int): ホームチームの得点
+            away_score (int): アウェイチームの得点
+            
+        Returns:
+            Match: 復元した試合オブジェクト
+        """
+        match = self.matches[match_index]
+        match.home_score = home_score
+        match.away_score = away_score
+        match.is_finished = True
+        self._finish(match_index)
+        return match
+    
+    def _finish(self, match_index):
+        """
+        スコアの入った試合の勝者・敗者を進める
+        
+        Args:
+            match_index (int): 試合番号
+        """
+        match = self.matches[match_index]
+        home = self.home[match_index]
+        away = self.away[match_index]
+        if match.home_score > match.away_score:
+            self._advance(match_index, home, away)
+        else:
+            self._advance(match_index, away, home)
+        self.results.append(match_index)
+    
+    def get_match(self, match_index):
+        """
+        試合番号から試合を取得
+        
+        Args:
+            match_index (int): 試合番号
+            
+        Returns:
+            Match: 試合オブジェクト、対戦が決まっていない場合はNone
+        """
+        if 0 <= match_index < len(self.matches):
+            return self.matches[match_index]
+        return None
+    
+    def is_grand_final(self, match_index):
+        """
+        ダブルエリミネーションのグランドファイナル（再戦の前の試合）か
+        
+        Args:
+            match_index (int): 試合番号
+            
+        Returns:
+            bool: グランドファイナルならTrue
+        """
+        return self.elimination == "double" and match_index == len(self.winner) - 2
+    
+    def is_reset_skipped(self, match_index):
+        """
+        グランドファイナルの再戦が不要になったか（勝者側の優勝チームがグランドファイナルに勝った場合）
+        
+        Args:
+            match_index (int): 試合番号
+            
+        Returns:
+            bool: 再戦の試合で、行わずに優勝が決まった場合はTrue
+        """
+        return (self.elimination == "double" and match_index == len(self.winner) - 1
+                and self.winner[match_index] >= 0 and self.matches[match_index] is None)
+    
+    def round_of(self, match_index):
+        """
+        試合番号からラウンドの番号を取得
+        
+        Args:
+            match_index (int): 試合番号
+            
+        Returns:
+            int: ラウンドの番号（0から）
+        """
+        low, high = 0, len(self.rounds) - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.rounds[middle][1] <= match_index:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+    
+    def round_matches(self, round_index):
+        """
+        ラウンドの試合を取得
+        
+        Args:
+            round_index (int): ラウンドの番号（0から）
+            
+        Returns:
+            list: [(試合番号, ホームのTeam, アウェイのTeam, Match), ...]
+                （未決定の枠・不戦勝の枠のチームはNone、対戦が決まっていない試合のMatchはNone）
+        """
+        _, start, count = self.rounds[round_index]
+        rows = []
+        for match_index in range(start, start + count):
+            rows.append((
+                match_index,
+                self._entrant_team(self.home[match_index]),
+                self._entrant_team(self.away[match_index]),
+                self.matches[match_index]
+            ))
+        return rows
+    
+    def _entrant_team(self, entrant):
+        """
+        出場チーム番号からチームを取得
+        
+        Args:
+            entrant (int): 出場チーム番号
+            
+        Returns:
+            Team: チームオブジェクト、未決定・不戦勝の場合はNone
+        """
+        if entrant < 0:
+            return None
+        return self.teams[self.entrants[entrant]]
+    
+    def champion(self):
+        """
+        優勝チームを取得
+        
+        Returns:
+            Team: 優勝チーム、決まっていない場合はNone
+        """
+        if not self.rounds:
+            return None
+        return self._entrant_team(self.winner[len(self.winner) - 1])
+    
+    def __str__(self):
+        """
+        トーナメント情報の文字列表現
+        """
+        kind = "ダブルエリミネーション" if self.elimination == "double" else "シングルエリミネーション"
+        return f"{self.name} - {kind}, {len(self.entrants)}チーム, {len(self.results)}試合終了"
\ No newline at end of file
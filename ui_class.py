@@ -1,8 +1,10 @@
 import os
-import re
+from datetime import datetime, time, timedelta
 from team_class import Team
 from player_class import Player
-from match_class import Match
+
+# 名前の検索で表示する候補の数
+SEARCH_CANDIDATES = 5
 
 class LeagueUI:
     def __init__(self, league):
@@ -13,6 +15,8 @@ class LeagueUI:
             league (League): 管理対象のリーグ
         """
         self.league = league
+        self.tournament = None  # トーナメントメニューで扱うトーナメント
+        self.session_cache = None  # 次回の起動時に開く大会のキャッシュ（main.py で設定）
     
     def clear_screen(self):
         """
@@ -47,6 +51,8 @@ class LeagueUI:
         print("3. 試合管理")
         print("4. 成績表示")
         print("5. ファイル操作")  # 新しいメニュー項目
+        print("6. トーナメント")
+        print("7. 検索")
         print("0. 終了")
         print()
         
@@ -106,10 +112,8 @@ class LeagueUI:
             input("Enterキーを押してください...")
             return
         
-        # チームIDはチーム名のアルファベット部分から生成
-        team_id = re.sub(r'[^a-zA-Z]', '', team_name).lower()
-        if not team_id:
-            team_id = f"team{len(self.league.teams) + 1}"
+        # チームIDはチーム名のアルファベット部分から生成（使用済みなら連番を付ける）
+        team_id = self.league.allocate_team_id(team_name)
         
         team = Team(team_id, team_name)
         self.league.add_team(team)
@@ -123,25 +127,96 @@ class LeagueUI:
         """
         self.print_header("チーム詳細")
         
-        team_name = input("チーム名を入力してください: ").strip()
-        team = self.league.get_team_by_name(team_name)
-        
+        team = self.select_team("チーム名を入力してください: ")
         if not team:
-            print(f"チーム「{team_name}」は見つかりません。")
-            input("Enterキーを押してください...")
             return
         
         print(team)
-        print("\n選手一覧:")
-        if not team.players:
+        print("\n選手一覧（このチームでの成績）:")
+        rows = self.league.team_player_stats(team.id)
+        if not rows:
             print("  登録選手がいません。")
         else:
-            for i, player in enumerate(team.players.values(), 1):
-                print(f"  {i}. {player.name} - 勝率: {player.win_rate():.3f} ({player.wins}勝{player.losses}敗{player.draws}引分)")
+            for i, (player, matches, wins, losses, draws, current) in enumerate(rows, 1):
+                win_rate = wins / matches if matches else 0.0
+                left = "" if current else f" [移籍: {self.league.get_team(player.team_id).name}]"
+                print(f"  {i}. {player.name} - 勝率: {win_rate:.3f} ({wins}勝{losses}敗{draws}引分){left}")
         
         print()
         input("Enterキーを押してください...")
     
+    def select_team(self, prompt):
+        """
+        チーム名（一部・表記ゆれ可）を入力してもらい、チームを選択
+        
+        名前が一致すればそのチームを、一致しなければ候補を表示して番号で選択してもらう。
+        
+        Args:
+            prompt (str): 入力を促す文字列
+            
+        Returns:
+            Team: 選択したチーム、見つからない・キャンセルした場合はNone
+        """
+        team_name = input(prompt).strip()
+        team = self.league.get_team_by_name(team_name)
+        if team:
+            return team
+        
+        candidates = [
+            (team, team.name)
+            for team, _ in self.league.search_teams(team_name, SEARCH_CANDIDATES)
+        ]
+        return self._choose_candidate(f"チーム「{team_name}」", candidates)
+    
+    def select_player(self, prompt):
+        """
+        選手名（一部・表記ゆれ可）を入力してもらい、選手を選択
+        
+        Args:
+            prompt (str): 入力を促す文字列
+            
+        Returns:
+            Player: 選択した選手、見つからない・キャンセルした場合はNone
+        """
+        player_name = input(prompt).strip()
+        results = self.league.search_players(player_name, SEARCH_CANDIDATES)
+        
+        # 名前が一致する選手が1人だけならそのまま選択
+        exact = [player for player, score in results if score == 1.0]
+        if len(exact) == 1:
+            return exact[0]
+        
+        candidates = [
+            (player, f"{player.name} ({self.league.get_team(player.team_id).name})")
+            for player, _ in results
+        ]
+        return self._choose_candidate(f"選手「{player_name}」", candidates)
+    
+    def _choose_candidate(self, label, candidates):
+        """
+        検索の候補を表示して番号で選択してもらう
+        
+        Args:
+            label (str): 見つからない場合の表示に使う入力内容
+            candidates (list): [(候補, 表示名), ...] の形式で一致度の降順
+            
+        Returns:
+            object: 選択した候補、候補がない・キャンセルした場合はNone
+        """
+        if not candidates:
+            print(f"{label}は見つかりません。")
+            input("Enterキーを押してください...")
+            return None
+        
+        print(f"{label}は見つかりません。次の候補があります:")
+        for i, (_, name) in enumerate(candidates, 1):
+            print(f"  {i}. {name}")
+        
+        choice = input("番号を選択してください（0: キャンセル）: ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(candidates):
+            return candidates[int(choice) - 1][0]
+        return None
+    
     # 選手管理メニューとその関連機能
     def player_menu(self):
         """
@@ -153,6 +228,7 @@ class LeagueUI:
             print("1. 選手一覧")
             print("2. 選手追加")
             print("3. 選手詳細")
+            print("4. 移籍")
             print("0. メインメニューに戻る")
             print()
             
@@ -164,6 +240,8 @@ class LeagueUI:
                 self.add_player()
             elif command == "3":
                 self.show_player_details()
+            elif command == "4":
+                self.transfer_player()
             elif command == "0":
                 break
             else:
@@ -195,12 +273,8 @@ class LeagueUI:
         """
         self.print_header("選手追加")
         
-        team_name = input("所属チーム名を入力してください: ").strip()
-        team = self.league.get_team_by_name(team_name)
-        
+        team = self.select_team("所属チーム名を入力してください: ")
         if not team:
-            print(f"チーム「{team_name}」は見つかりません。")
-            input("Enterキーを押してください...")
             return
         
         player_name = input("選手名を入力してください: ").strip()
@@ -214,15 +288,13 @@ class LeagueUI:
         age_str = input("年齢を入力してください（任意）: ").strip()
         age = int(age_str) if age_str.isdigit() else None
         
-        # 選手IDは選手名のアルファベット部分から生成
-        player_id = re.sub(r'[^a-zA-Z]', '', player_name).lower()
-        if not player_id:
-            player_id = f"player{len(team.players) + 1}"
+        # 選手IDは選手名のアルファベット部分から生成（全チームで使用済みなら連番を付ける）
+        player_id = self.league.allocate_player_id(player_name)
         
         player = Player(player_id, player_name, team.id, position, age)
-        team.add_player(player)
+        self.league.add_player(team.id, player)
         
-        print(f"選手「{player_name}」をチーム「{team_name}」に追加しました。")
+        print(f"選手「{player_name}」をチーム「{team.name}」に追加しました。")
         input("Enterキーを押してください...")
     
     def show_player_details(self):
@@ -231,29 +303,56 @@ class LeagueUI:
         """
         self.print_header("選手詳細")
         
-        player_name = input("選手名を入力してください: ").strip()
+        player = self.select_player("選手名を入力してください: ")
+        if not player:
+            return
         
-        found_player = None
-        team_name = None
+        print(f"チーム: {self.league.get_team(player.team_id).name}")
+        print(player)
         
-        for team in self.league.teams.values():
-            for player in team.players.values():
-                if player.name == player_name:
-                    found_player = player
-                    team_name = team.name
-                    break
-            if found_player:
-                break
+        spells = self.league.membership.spells(player.id)
+        if spells:
+            print("\n所属履歴:")
+            for i, (from_round, team_id) in enumerate(spells):
+                until = f"Round {spells[i + 1][0] - 1}まで" if i + 1 < len(spells) else "現在"
+                print(f"  Round {from_round}から{until}: {self.league.get_team(team_id).name}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def transfer_player(self):
+        """
+        選手の移籍
+        """
+        self.print_header("移籍")
+        
+        player = self.select_player("移籍する選手名を入力してください: ")
+        if not player:
+            return
         
-        if not found_player:
-            print(f"選手「{player_name}」は見つかりません。")
+        old_team = self.league.get_team(player.team_id)
+        print(f"現在の所属: {old_team.name}")
+        team = self.select_team("移籍先のチーム名を入力してください: ")
+        if not team:
+            return
+        if team.id == old_team.id:
+            print("現在の所属チームと同じです。")
             input("Enterキーを押してください...")
             return
         
-        print(f"チーム: {team_name}")
-        print(found_player)
+        current_round = self.league.current_round
+        round_str = input(f"何ラウンドから移籍先の所属にしますか？（Enterで Round {current_round}）: ").strip()
+        if round_str and not round_str.isdigit():
+            print("数値を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        from_round = int(round_str) if round_str else current_round
         
-        print()
+        if self.league.transfer_player(player.id, team.id, from_round):
+            print(f"{player.name}を{old_team.name}から{team.name}に移籍させました（Round {from_round}から）。")
+            print(f"Round {from_round - 1}までの試合の成績は{old_team.name}での成績として集計されます。")
+        else:
+            print(f"移籍できませんでした。Round {max(current_round, 2)}以降で、前回の移籍より後のラウンドを指定してください。")
         input("Enterキーを押してください...")
     
     # 試合管理メニューとその関連機能
@@ -270,6 +369,9 @@ class LeagueUI:
             print("4. 勝敗入力（○×）")
             print("5. 選手成績入力")
             print("6. 次のラウンドへ")
+            print("7. スイス式で次のラウンドを組み合わせ")
+            print("8. 日程表示（今週末・期間指定）")
+            print("9. 日程の重複チェック")
             print("0. メインメニューに戻る")
             print()
             
@@ -287,6 +389,12 @@ class LeagueUI:
                 self.enter_player_results()
             elif command == "6":
                 self.next_round()
+            elif command == "7":
+                self.create_swiss_round()
+            elif command == "8":
+                self.show_schedule()
+            elif command == "9":
+                self.check_schedule_conflicts()
             elif command == "0":
                 break
             else:
@@ -313,20 +421,12 @@ class LeagueUI:
         """
         self.print_header("試合追加")
         
-        home_team_name = input("ホームチーム名を入力してください: ").strip()
-        away_team_name = input("アウェイチーム名を入力してください: ").strip()
-        
-        home_team = self.league.get_team_by_name(home_team_name)
-        away_team = self.league.get_team_by_name(away_team_name)
-        
+        home_team = self.select_team("ホームチーム名を入力してください: ")
         if not home_team:
-            print(f"チーム「{home_team_name}」は見つかりません。")
-            input("Enterキーを押してください...")
             return
         
+        away_team = self.select_team("アウェイチーム名を入力してください: ")
         if not away_team:
-            print(f"チーム「{away_team_name}」は見つかりません。")
-            input("Enterキーを押してください...")
             return
         
         if home_team.id == away_team.id:
@@ -334,10 +434,156 @@ class LeagueUI:
             input("Enterキーを押してください...")
             return
         
-        match = Match(home_team, away_team, round_number=self.league.current_round)
-        self.league.matches.append(match)
+        if self.league.find_fixture(home_team.id, away_team.id, self.league.current_round) is not None:
+            print(f"Round {self.league.current_round} には {home_team.name} vs {away_team.name} の試合がすでに登録されています。")
+            input("Enterキーを押してください...")
+            return
+        
+        date_text = input("試合日時を入力してください (YYYY-MM-DD [HH:MM]、Enterで現在日時): ").strip()
+        date = None
+        if date_text:
+            date = self._parse_datetime(date_text)
+            if date is None:
+                print("日時の形式が正しくありません。")
+                input("Enterキーを押してください...")
+                return
+            
+            # 日程の重複（同じ日・休養間隔不足）の確認
+            conflicts = self.league.find_schedule_conflicts(home_team.id, away_team.id, date)
+            if conflicts:
+                print("\n次の試合と日程が重複しています:")
+                for team_id, match in conflicts:
+                    print(f"  {self.league.get_team(team_id).name}: {match}")
+                if input("それでも追加しますか？ (y/n): ").strip().lower() != "y":
+                    return
+        
+        # 日程の重複は確認済み。同じ組み合わせの試合は入力中に他のスレッドが追加した場合も作成しない
+        match = self.league.create_match(home_team.id, away_team.id, date=date, allow_conflicts=True)
+        if match is None:
+            print(f"Round {self.league.current_round} には {home_team.name} vs {away_team.name} の試合がすでに登録されています。")
+            input("Enterキーを押してください...")
+            return
+        
+        print(f"Round {self.league.current_round}: {home_team.name} vs {away_team.name} の試合を追加しました。（試合ID: {match.id}）")
+        input("Enterキーを押してください...")
+    
+    def show_schedule(self):
+        """
+        期間内の試合を日時の順に表示（今週末・今日・期間指定）
+        """
+        self.print_header("日程表示")
+        
+        print("1. 今週末（土・日）")
+        print("2. 今日")
+        print("3. 期間を指定")
+        choice = input("\n期間を選択してください: ").strip()
+        
+        today = datetime.now().date()
+        if choice == "1":
+            # 日曜日は前日の土曜日から、それ以外は次の土曜日から
+            if today.weekday() == 6:
+                saturday = today - timedelta(days=1)
+            else:
+                saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+            first, last = saturday, saturday + timedelta(days=1)
+        elif choice == "2":
+            first, last = today, today
+        elif choice == "3":
+            try:
+                first = datetime.strptime(input("開始日 (YYYY-MM-DD): ").strip(), "%Y-%m-%d").date()
+                last = datetime.strptime(input("終了日 (YYYY-MM-DD): ").strip(), "%Y-%m-%d").date()
+            except ValueError:
+                print("日付の形式が正しくありません。")
+                input("Enterキーを押してください...")
+                return
+        else:
+            input("無効なコマンドです。Enterキーを押してください...")
+            return
+        
+        matches = self.league.matches_between(datetime.combine(first, time.min), datetime.combine(last, time.max))
         
-        print(f"Round {self.league.current_round}: {home_team.name} vs {away_team.name} の試合を追加しました。")
+        print(f"\n{first} ~ {last}")
+        if not matches:
+            print("この期間の試合はありません。")
+        else:
+            for match in matches:
+                print(f"  {match.date.strftime('%m/%d %H:%M')} {match}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def check_schedule_conflicts(self):
+        """
+        シーズン全体の日程の重複チェック
+        """
+        self.print_header("日程の重複チェック")
+        
+        print(f"現在の休養間隔: {self.league.min_rest_hours}時間（同じ日の試合は常に重複として扱います）")
+        hours_text = input("休養間隔（時間）を変更する場合は入力してください (Enterで変更しない): ").strip()
+        if hours_text:
+            if not hours_text.isdigit():
+                print("数値を入力してください。")
+                input("Enterキーを押してください...")
+                return
+            self.league.min_rest_hours = int(hours_text)
+        
+        conflicts = self.league.audit_schedule()
+        
+        if not conflicts:
+            print("\n日程の重複はありません。")
+        else:
+            print(f"\n{len(conflicts)}件の重複があります:")
+            for team_id, previous, match in conflicts:
+                print(f"  {self.league.get_team(team_id).name}:")
+                print(f"    {previous}")
+                print(f"    {match}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def _parse_datetime(self, text):
+        """
+        入力された日時を変換
+        
+        Args:
+            text (str): "YYYY-MM-DD" または "YYYY-MM-DD HH:MM"
+            
+        Returns:
+            datetime: 日時、形式が正しくない場合はNone
+        """
+        for date_format in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+            try:
+                return datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+        return None
+    
+    def create_swiss_round(self):
+        """
+        スイス式で次のラウンドの組み合わせを作成
+        """
+        self.print_header("スイス式組み合わせ")
+        
+        if len(self.league.teams) < 2:
+            print("チームが2つ以上登録されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        confirm = input("勝点の近いチーム同士で次のラウンドを組み合わせますか？ (y/n): ")
+        if confirm.lower() != 'y':
+            print("キャンセルしました。")
+            input("Enterキーを押してください...")
+            return
+        
+        matches, bye = self.league.create_swiss_round()
+        
+        print(f"\nRound {self.league.current_round} の組み合わせ ({len(matches)}試合):")
+        for i, match in enumerate(matches, 1):
+            print(f"{i}. {match.home_team.name} vs {match.away_team.name}")
+        if bye:
+            print(f"不戦勝（バイ）: {bye.name}")
+        
+        print()
         input("Enterキーを押してください...")
     
     def enter_match_score(self):
@@ -384,8 +630,12 @@ class LeagueUI:
                 input("Enterキーを押してください...")
                 return
             
-            match.set_score(home_score, away_score)
-            print(f"スコアを登録しました: {match.home_team.name} {home_score}-{away_score} {match.away_team.name}")
+            overtime = False
+            if home_score != away_score and self.league.scoring_rules.uses_overtime:
+                overtime = input("延長戦・PK戦で決着しましたか？ (y/N): ").lower() == 'y'
+            
+            match.set_score(home_score, away_score, overtime)
+            print(f"スコアを登録しました: {match}")
             input("Enterキーを押してください...")
         except ValueError:
             print("数値を入力してください。")
@@ -484,13 +734,14 @@ class LeagueUI:
         
         team = match.home_team if team_choice == "1" else match.away_team
         
-        if not team.players:
+        # 試合のラウンドの時点で所属していた選手（移籍した選手は移籍前・移籍後のチームで分かれる）
+        players_list = self.league.squad(team.id, match.round_number)
+        if not players_list:
             print(f"{team.name}に選手が登録されていません。")
             input("Enterキーを押してください...")
             return
         
         print(f"\n{team.name}の選手一覧:")
-        players_list = list(team.players.values())
         for i, player in enumerate(players_list, 1):
             print(f"{i}. {player.name}")
         
@@ -515,8 +766,10 @@ class LeagueUI:
             input("Enterキーを押してください...")
             return
         
-        match.add_player_result(player.id, result)
-        print(f"{player.name}の成績を {result} として登録しました。")
+        if not match.add_player_result(player.id, result):
+            print(f"{player.name}の成績はこの試合ですでに {match.player_results[player.id]} として登録されています。")
+        else:
+            print(f"{player.name}の成績を {result} として登録しました。")
         input("Enterキーを押してください...")
     
     def next_round(self):
@@ -554,6 +807,9 @@ class LeagueUI:
             
             print("1. チーム順位表")
             print("2. 選手勝率ランキング")
+            print("3. 優勝の可能性")
+            print("4. パワーランキング")
+            print("5. 勝点の計算方法・順位の決め方")
             print("0. メインメニューに戻る")
             print()
             
@@ -563,6 +819,12 @@ class LeagueUI:
                 self.show_team_standings()
             elif command == "2":
                 self.show_player_rankings()
+            elif command == "3":
+                self.show_race_status()
+            elif command == "4":
+                self.show_power_rankings()
+            elif command == "5":
+                self.edit_scoring_rules()
             elif command == "0":
                 break
             else:
@@ -581,15 +843,77 @@ class LeagueUI:
             input("Enterキーを押してください...")
             return
         
-        print(f"{'順位':<4} {'チーム名':<20} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'勝点':<4} {'勝率':<6} {'得点':<4} {'失点':<4} {'得失':<4}")
-        print("-" * 80)
+        print(f"勝点の計算方法: {self.league.scoring_rules.describe()}")
+        print()
+        print(f"{'順位':<4} {'チーム名':<20} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'勝点':<4} {'勝率':<6} {'得点':<4} {'失点':<4} {'得失':<4} {'直近':<6} {'連続':<6}")
+        print("-" * 96)
         
         for rank, (team, points, win_rate, goal_diff) in enumerate(standings, 1):
             print(f"{rank:<4} {team.name:<20} {team.matches_played:<4} {team.wins:<4} {team.draws:<4} "
                   f"{team.losses:<4} {points:<4} {win_rate:.3f} {team.goals_for:<4} "
-                  f"{team.goals_against:<4} {goal_diff:<4}")
+                  f"{team.goals_against:<4} {goal_diff:<4} {team.form.recent():<6} {team.form.streak():<6}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def edit_scoring_rules(self):
+        """
+        勝点の計算方法・順位の決め方の変更
+        """
+        self.print_header("勝点の計算方法・順位の決め方")
         
+        from scoring_rules import ScoringRules, TIEBREAKERS
+        rules = self.league.scoring_rules
+        print(f"現在の設定: {rules.describe()}")
+        print("空欄のままEnterで現在の値を使います（任意の項目は - で使わない設定にします）。")
         print()
+        
+        def ask(label, current, optional=False):
+            shown = "なし" if current is None else current
+            text = input(f"{label} [{shown}]: ").strip()
+            if not text:
+                return current
+            if optional and text == "-":
+                return None
+            return int(text)
+        
+        try:
+            win = ask("勝ちの勝点", rules.win)
+            draw = ask("引き分けの勝点", rules.draw)
+            loss = ask("負けの勝点", rules.loss)
+            overtime_win = ask("延長戦・PK戦の勝ちの勝点", rules.overtime_win, optional=True)
+            overtime_loss = ask("延長戦・PK戦の負けの勝点", rules.overtime_loss, optional=True)
+            bonus_goals = ask("ボーナスポイント（この得点以上で+1）", rules.bonus_goals, optional=True)
+            bonus_loss_margin = ask("ボーナスポイント（この点差以内の負けで+1）", rules.bonus_loss_margin, optional=True)
+        except ValueError:
+            print("数値を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        
+        names = list(TIEBREAKERS)
+        print("\n順位の決め方（優先する順に番号をカンマ区切りで入力）:")
+        for i, name in enumerate(names, 1):
+            print(f"{i}. {TIEBREAKERS[name]}")
+        current = ",".join(str(names.index(name) + 1) for name in rules.tiebreakers)
+        text = input(f"番号 [{current}]: ").strip()
+        
+        try:
+            tiebreakers = rules.tiebreakers
+            if text:
+                numbers = [int(value) for value in text.split(",")]
+                if any(number < 1 or number > len(names) for number in numbers):
+                    raise ValueError("無効な番号です")
+                tiebreakers = [names[number - 1] for number in numbers]
+            new_rules = ScoringRules(win, draw, loss, overtime_win, overtime_loss,
+                                     bonus_goals, bonus_loss_margin, tiebreakers)
+        except ValueError as e:
+            print(f"設定を変更できません: {e}")
+            input("Enterキーを押してください...")
+            return
+        
+        self.league.set_scoring_rules(new_rules)
+        print(f"\n設定を変更しました: {new_rules.describe()}")
+        print("順位表はこの設定で計算し直されます（保存すると大会データに記録されます）。")
         input("Enterキーを押してください...")
     
     def show_player_rankings(self):
@@ -598,9 +922,24 @@ class LeagueUI:
         """
         self.print_header("選手勝率ランキング")
         
-        rankings = self.league.get_player_rankings()
+        from player_ranking import METRICS
+        metric_names = list(METRICS)
+        for i, name in enumerate(metric_names, 1):
+            print(f"{i}. {METRICS[name]}")
         
-        if not rankings:
+        try:
+            choice = input("\n指標を選択してください (Enterで 1): ").strip()
+            metric = metric_names[int(choice) - 1] if choice else "win_rate"
+            min_text = input("最低試合数を入力してください (Enterで 1): ").strip()
+            min_games = int(min_text) if min_text else 1
+        except (ValueError, IndexError):
+            print("無効な入力です。")
+            input("Enterキーを押してください...")
+            return
+        
+        players, scores = self.league.rank_players(metric, min_games)
+        
+        if not players:
             print("選手が登録されていないか、試合が行われていません。")
             input("Enterキーを押してください...")
             return
@@ -611,27 +950,476 @@ class LeagueUI:
             for player_id in team.players:
                 team_names[player_id] = team.name
         
-        print(f"{'順位':<4} {'選手名':<20} {'チーム':<15} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'勝率':<6}")
-        print("-" * 70)
+        print(f"\n指標: {METRICS[metric]}（{min_games}試合以上）")
+        print(f"{'順位':<4} {'選手名':<20} {'チーム':<15} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'指標':<6} {'直近':<6} {'連続':<6}")
+        print("-" * 86)
         
-        for rank, (player, win_rate, matches) in enumerate(rankings, 1):
+        for rank, (player, score) in enumerate(zip(players, scores), 1):
             print(f"{rank:<4} {player.name:<20} {team_names.get(player.id, ''):<15} "
                   f"{player.matches_played:<4} {player.wins:<4} {player.draws:<4} "
-                  f"{player.losses:<4} {win_rate:.3f}")
+                  f"{player.losses:<4} {score:.3f}  {player.form.recent():<6} {player.form.streak():<6}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def show_race_status(self):
+        """
+        残り試合から判定した各チームの優勝の可能性の表示
+        """
+        self.print_header("優勝の可能性")
+        
+        standings = self.league.get_standings()
+        if not standings:
+            print("チームが登録されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        status = self.league.get_race_status()
+        labels = {"clinched": "優勝確定", "eliminated": "可能性なし", "alive": "可能性あり"}
+        
+        print(f"{'順位':<4} {'チーム名':<20} {'勝点':<4} {'判定':<10}")
+        print("-" * 50)
+        for rank, (team, points, _, _) in enumerate(standings, 1):
+            print(f"{rank:<4} {team.name:<20} {points:<4} {labels[status[team.id]]}")
+        
+        print("\n※ 可能性ありは同点1位を含みます。")
+        print()
+        input("Enterキーを押してください...")
+    
+    def show_power_rankings(self):
+        """
+        対戦相手の強さを考慮したパワーランキングの表示
+        """
+        self.print_header("パワーランキング")
+        
+        rankings = self.league.get_power_rankings()
+        if not rankings:
+            print("チームが登録されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        print(f"{'順位':<4} {'チーム名':<20} {'レーティング':<8} {'勝点':<4} {'勝率':<6}")
+        print("-" * 50)
+        for rank, (team, _, rating) in enumerate(rankings, 1):
+            print(f"{rank:<4} {team.name:<20} {rating:<8.0f} {team.points():<4} {team.win_rate():.3f}")
+        
+        print("\n※ 強い相手への勝ちほど高く評価されます（Bradley-Terryモデル）。")
+        print()
+        input("Enterキーを押してください...")
+    
+    def show_metrics(self):
+        """
+        処理ごとの計測結果の表示（--metrics 指定時のみ有効）
+        """
+        self.print_header("計測結果")
+        
+        import instrumentation
+        if not instrumentation.is_enabled():
+            print("計測は無効です。--metrics を付けて起動してください。")
+        else:
+            print(instrumentation.format_report())
         
         print()
         input("Enterキーを押してください...")
     
+    # トーナメントメニューとその関連機能
+    def tournament_menu(self):
+        """
+        トーナメント（勝ち抜き戦）メニュー
+        """
+        while True:
+            self.print_header("トーナメント")
+            
+            if self.tournament:
+                print(f"現在のトーナメント: {self.tournament}")
+                print()
+            
+            print("1. トーナメントを作成（順位表・パワーランキングでシード）")
+            print("2. 組み合わせ表示")
+            print("3. スコア入力")
+            print("4. トーナメントを保存")
+            print("5. トーナメントを読み込む")
+            print("0. メインメニューに戻る")
+            print()
+            
+            command = input("コマンドを選択してください: ")
+            
+            if command == "1":
+                self.create_tournament()
+            elif command == "2":
+                self.show_tournament_round()
+            elif command == "3":
+                self.enter_tournament_score()
+            elif command == "4":
+                self.save_tournament_data()
+            elif command == "5":
+                self.load_tournament_data()
+            elif command == "0":
+                break
+            else:
+                input("無効なコマンドです。Enterキーを押してください...")
+    
+    def create_tournament(self):
+        """
+        リーグの順位表をシードにしたトーナメントの作成
+        """
+        self.print_header("トーナメント作成")
+        
+        if len(self.league.teams) < 2:
+            print("チームが2つ以上登録されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        name = input("トーナメント名を入力してください: ").strip()
+        if not name:
+            print("トーナメント名が入力されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        kind = input("形式を選択してください (1: シングルエリミネーション, 2: ダブルエリミネーション): ")
+        if kind not in ["1", "2"]:
+            print("1または2を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        
+        limit_text = input(f"出場チーム数を入力してください (Enterで全{len(self.league.teams)}チーム): ").strip()
+        try:
+            limit = int(limit_text) if limit_text else None
+        except ValueError:
+            print("数値を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        if limit is not None and limit < 2:
+            print("出場チーム数は2以上を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        
+        seeding = input("シードの基準を選択してください (1: 順位表, 2: パワーランキング): ")
+        if seeding not in ["1", "2"]:
+            print("1または2を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        ratings = self.league.get_power_ratings() if seeding == "2" else None
+        
+        self.tournament = self.league.create_tournament(
+            name, "single" if kind == "1" else "double", ratings=ratings, limit=limit
+        )
+        print(f"トーナメント「{name}」を作成しました。")
+        print(self.tournament)
+        input("Enterキーを押してください...")
+    
+    def select_tournament_round(self):
+        """
+        トーナメントのラウンドを選択
+        
+        Returns:
+            int: ラウンドの番号（0から）、キャンセル時はNone
+        """
+        for i, (name, _, count) in enumerate(self.tournament.rounds, 1):
+            print(f"{i}. {name} ({count}試合)")
+        
+        try:
+            round_index = int(input("\nラウンドの番号を入力: ")) - 1
+            if round_index < 0 or round_index >= len(self.tournament.rounds):
+                print("無効な番号です。")
+                return None
+        except ValueError:
+            print("数値を入力してください。")
+            return None
+        return round_index
+    
+    def show_tournament_round(self):
+        """
+        トーナメントのラウンドの組み合わせ表示
+        """
+        self.print_header("組み合わせ表示")
+        
+        if not self.tournament:
+            print("トーナメントが作成されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        round_index = self.select_tournament_round()
+        if round_index is None:
+            input("Enterキーを押してください...")
+            return
+        
+        print(f"\n{self.tournament.rounds[round_index][0]}:")
+        for match_index, home_team, away_team, match in self.tournament.round_matches(round_index):
+            home_name = home_team.name if home_team else "(未定)"
+            away_name = away_team.name if away_team else "(未定)"
+            if match is not None and match.is_finished:
+                print(f"[{match_index}] {home_name} {match.home_score}-{match.away_score} {away_name}")
+            elif self.tournament.is_reset_skipped(match_index):
+                print(f"[{match_index}] 再戦なし（グランドファイナルで勝者側の優勝チームが勝利）")
+            elif match is None and self.tournament.winner[match_index] >= 0:
+                print(f"[{match_index}] {home_name if home_team else away_name} (不戦勝)")
+            else:
+                print(f"[{match_index}] {home_name} vs {away_name}")
+        
+        champion = self.tournament.champion()
+        if champion:
+            print(f"\n優勝: {champion.name}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def enter_tournament_score(self):
+        """
+        トーナメントの試合スコアの入力
+        """
+        self.print_header("トーナメント スコア入力")
+        
+        if not self.tournament:
+            print("トーナメントが作成されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        round_index = self.select_tournament_round()
+        if round_index is None:
+            input("Enterキーを押してください...")
+            return
+        
+        # 対戦が決まっていて未終了の試合のみ表示
+        ready_matches = [
+            (match_index, match)
+            for match_index, _, _, match in self.tournament.round_matches(round_index)
+            if match is not None and not match.is_finished
+        ]
+        if not ready_matches:
+            print("スコアを入力できる試合がありません。")
+            input("Enterキーを押してください...")
+            return
+        
+        print("スコアを入力する試合を選んでください:")
+        for i, (_, match) in enumerate(ready_matches, 1):
+            print(f"{i}. {match.home_team.name} vs {match.away_team.name}")
+        
+        try:
+            match_idx = int(input("\n番号を入力: ")) - 1
+            if match_idx < 0 or match_idx >= len(ready_matches):
+                print("無効な番号です。")
+                input("Enterキーを押してください...")
+                return
+            
+            match_index, match = ready_matches[match_idx]
+            home_score = int(input(f"{match.home_team.name}のスコア: "))
+            away_score = int(input(f"{match.away_team.name}のスコア: "))
+        except ValueError:
+            print("数値を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        
+        if home_score < 0 or away_score < 0:
+            print("スコアは0以上の整数を入力してください。")
+        elif self.tournament.set_score(match_index, home_score, away_score):
+            print(f"スコアを登録しました: {match.home_team.name} {home_score}-{away_score} {match.away_team.name}")
+            champion = self.tournament.champion()
+            if champion:
+                print(f"優勝: {champion.name}")
+        else:
+            print("トーナメントでは引き分けは登録できません。")
+        
+        input("Enterキーを押してください...")
+    
+    def save_tournament_data(self):
+        """
+        トーナメントを保存
+        """
+        self.print_header("トーナメントの保存")
+        
+        if not self.tournament:
+            print("トーナメントが作成されていません。")
+            input("Enterキーを押してください...")
+            return
+        
+        from league_storage import LeagueStorage
+        storage = LeagueStorage()
+        if storage.save_tournament(self.tournament):
+            print(f"トーナメント「{self.tournament.name}」を保存しました。")
+        else:
+            print("保存に失敗しました。")
+        
+        input("Enterキーを押してください...")
+    
+    def load_tournament_data(self):
+        """
+        保存されたトーナメントを読み込む
+        """
+        self.print_header("トーナメントの読み込み")
+        
+        from league_storage import LeagueStorage
+        storage = LeagueStorage()
+        available = storage.get_available_tournaments()
+        
+        if not available:
+            print("保存されているトーナメントが見つかりません。")
+            input("Enterキーを押してください...")
+            return
+        
+        print("利用可能なトーナメント:")
+        for i, name in enumerate(available, 1):
+            print(f"{i}. {name}")
+        
+        try:
+            index = int(input("\n読み込むトーナメントの番号を入力: ")) - 1
+            if index < 0 or index >= len(available):
+                print("無効な番号です。")
+                input("Enterキーを押してください...")
+                return
+        except ValueError:
+            print("数値を入力してください。")
+            input("Enterキーを押してください...")
+            return
+        
+        tournament = storage.load_tournament(available[index])
+        if tournament:
+            self.tournament = tournament
+            print(f"トーナメント「{tournament.name}」を読み込みました。")
+            print(tournament)
+        else:
+            print("読み込みに失敗しました。")
+        
+        input("Enterキーを押してください...")
+    
+    # 検索メニューとその関連機能
+    def search_menu(self):
+        """
+        検索メニュー（条件を指定して選手・試合を絞り込む）
+        """
+        while True:
+            self.print_header("検索")
+            
+            print("1. 選手を検索")
+            print("2. 試合を検索")
+            print("0. メインメニューに戻る")
+            print()
+            
+            command = input("コマンドを選択してください: ")
+            
+            if command == "1":
+                self.search_players()
+            elif command == "2":
+                self.search_matches()
+            elif command == "0":
+                break
+            else:
+                input("無効なコマンドです。Enterキーを押してください...")
+    
+    def search_players(self):
+        """
+        条件を指定して選手を検索
+        """
+        self.print_header("選手を検索")
+        
+        from query_index import PLAYER_SORT_KEYS
+        print("条件を入力してください（Enterで指定なし）")
+        try:
+            position = input("ポジション: ").strip() or None
+            min_age = self._optional_int(input("年齢の下限: "))
+            max_age = self._optional_int(input("年齢の上限: "))
+            team_id = None
+            if input("チームを指定しますか？ (y/n): ").strip().lower() == "y":
+                team = self.select_team("チーム名を入力してください: ")
+                if not team:
+                    return
+                team_id = team.id
+            min_games = self._optional_int(input("最低試合数: ")) or 0
+            
+            sort_keys = list(PLAYER_SORT_KEYS)
+            for i, key in enumerate(sort_keys, 1):
+                print(f"{i}. {PLAYER_SORT_KEYS[key][0]}")
+            choice = input("並べ替えを選択してください (Enterで 1): ").strip()
+            sort = sort_keys[int(choice) - 1] if choice else "win_rate"
+            ascending = input("昇順にしますか？ (y/n, Enterで降順): ").strip().lower() == "y"
+            limit = self._optional_int(input("表示件数 (Enterで 20): ")) or 20
+        except (ValueError, IndexError):
+            print("無効な入力です。")
+            input("Enterキーを押してください...")
+            return
+        
+        players = self.league.query_players(
+            position, min_age, max_age, team_id, min_games, sort, not ascending, limit
+        )
+        
+        if not players:
+            print("\n条件に合う選手はいません。")
+        else:
+            print(f"\n{'選手名':<20} {'チーム':<15} {'ポジション':<8} {'年齢':<4} {'試合':<4} {'勝':<4} {'分':<4} {'負':<4} {'勝率':<6}")
+            print("-" * 86)
+            for player in players:
+                team = self.league.get_team(player.team_id)
+                age = player.age if player.age is not None else "-"
+                print(f"{player.name:<20} {team.name if team else '':<15} {player.position or '-':<8} "
+                      f"{age:<4} {player.matches_played:<4} {player.wins:<4} {player.draws:<4} "
+                      f"{player.losses:<4} {player.win_rate():.3f}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def search_matches(self):
+        """
+        条件を指定して試合を検索
+        """
+        self.print_header("試合を検索")
+        
+        print("条件を入力してください（Enterで指定なし）")
+        try:
+            team_id = None
+            if input("チームを指定しますか？ (y/n): ").strip().lower() == "y":
+                team = self.select_team("チーム名を入力してください: ")
+                if not team:
+                    return
+                team_id = team.id
+            round_from = self._optional_int(input("ラウンドの下限: "))
+            round_to = self._optional_int(input("ラウンドの上限: "))
+            date_text = input("試合日の下限 (YYYY-MM-DD): ").strip()
+            date_from = datetime.strptime(date_text, "%Y-%m-%d") if date_text else None
+            date_text = input("試合日の上限 (YYYY-MM-DD): ").strip()
+            date_to = datetime.combine(datetime.strptime(date_text, "%Y-%m-%d"), time.max) if date_text else None
+            status = input("状態 (1: 終了した試合, 2: 未終了の試合, Enterで指定なし): ").strip()
+            finished = {"1": True, "2": False}.get(status)
+        except ValueError:
+            print("無効な入力です。")
+            input("Enterキーを押してください...")
+            return
+        
+        matches = self.league.query_matches(team_id, round_from, round_to, date_from, date_to, finished)
+        
+        if not matches:
+            print("\n条件に合う試合はありません。")
+        else:
+            print(f"\n{len(matches)}試合:")
+            for match in matches:
+                print(f"  {match}")
+        
+        print()
+        input("Enterキーを押してください...")
+    
+    def _optional_int(self, text):
+        """
+        任意入力の数値を変換
+        
+        Args:
+            text (str): 入力された文字列
+            
+        Returns:
+            int: 数値、空の場合はNone（数値でなければ ValueError）
+        """
+        text = text.strip()
+        return int(text) if text else None
+    
     # ファイル操作メニューとその関連機能
     def file_menu(self):
         """
-        ファイル操作メニュー（保存/読み込み）
+        ファイル操作メニュー（保存/読み込み/レポートの書き出し）
         """
         while True:
             self.print_header("ファイル操作")
             
             print("1. 大会データを保存")
             print("2. 大会データを読み込む")
+            print("3. レポートを書き出す（CSV/HTML/JSON Lines）")
             print("0. メインメニューに戻る")
             print()
             
@@ -641,11 +1429,65 @@ class LeagueUI:
                 self.save_league_data()
             elif command == "2":
                 self.load_league_data()
+            elif command == "3":
+                self.export_reports()
             elif command == "0":
                 break
             else:
                 input("無効なコマンドです。Enterキーを押してください...")
-
+    
+    def export_reports(self):
+        """
+        順位表・ランキング・試合結果・選手の試合履歴をファイルに書き出す
+        """
+        self.print_header("レポートの書き出し")
+        
+        from player_ranking import METRICS
+        from report_export import FORMATS, REPORTS, export_reports
+        
+        report_names = list(REPORTS)
+        for i, name in enumerate(report_names, 1):
+            print(f"{i}. {REPORTS[name]}")
+        print(f"{len(report_names) + 1}. すべて")
+        
+        format_names = list(FORMATS)
+        metric = "win_rate"
+        try:
+            choice = input(f"\nレポートを選択してください (Enterで {len(report_names) + 1}): ").strip()
+            index = int(choice) - 1 if choice else len(report_names)
+            if index < 0 or index > len(report_names):
+                raise ValueError
+            reports = report_names if index == len(report_names) else [report_names[index]]
+            
+            fmt = input(f"出力形式を選択してください {'/'.join(format_names)} (Enterで csv): ").strip().lower() or "csv"
+            if fmt not in FORMATS:
+                raise ValueError
+            
+            if "rankings" in reports:
+                metric_names = list(METRICS)
+                print()
+                for i, name in enumerate(metric_names, 1):
+                    print(f"{i}. {METRICS[name]}")
+                choice = input("選手ランキングの指標を選択してください (Enterで 1): ").strip()
+                metric = metric_names[int(choice) - 1] if choice else "win_rate"
+        except (ValueError, IndexError):
+            print("無効な入力です。")
+            input("Enterキーを押してください...")
+            return
+        
+        directory = input("出力先のディレクトリ (Enterで exports): ").strip() or "exports"
+        
+        try:
+            written = export_reports(self.league, reports, fmt, directory, metric)
+        except OSError as e:
+            print(f"書き出しに失敗しました: {e}")
+            input("Enterキーを押してください...")
+            return
+        
+        for path, count in written:
+            print(f"{path} に書き出しました（{count}行）。")
+        input("Enterキーを押してください...")
+    
     def save_league_data(self):
         """
         リーグデータを保存
@@ -665,15 +1507,28 @@ class LeagueUI:
         
         # LeagueStorageを使用してデータを保存
         from league_storage import LeagueStorage
+        from storage_codec import CODECS
         storage = LeagueStorage()
         
-        if storage.save_league(self.league):
+        # 圧縮形式の選択（未入力なら保存済みの形式を引き継ぐ）
+        current_codec = storage.get_league_codec(self.league.name) or storage.codec
+        codec = input(f"圧縮形式を選択してください {'/'.join(CODECS)} (Enterで {current_codec}): ").strip().lower()
+        if not codec:
+            codec = current_codec
+        elif codec not in CODECS:
+            print("無効な圧縮形式です。")
+            input("Enterキーを押してください...")
+            return
+        
+        if storage.save_league(self.league, codec=codec):
             print(f"大会「{self.league.name}」のデータを保存しました。")
+            if self.session_cache:
+                self.session_cache.store(self.league)
         else:
             print("保存に失敗しました。")
         
         input("Enterキーを押してください...")
-
+    
     def load_league_data(self):
         """
         保存されたリーグデータを読み込む
@@ -717,7 +1572,12 @@ class LeagueUI:
         selected_league = available_leagues[league_idx]
         
         # リーグデータの読み込み
-        loaded_league = storage.load_league(selected_league)
+        # 試合データは必要になった時点で復元する
+        # 前回の起動時のキャッシュがあればJSONを解析せずに開き、なければ次回の起動用に作る
+        if self.session_cache:
+            loaded_league = self.session_cache.open(selected_league)
+        else:
+            loaded_league = storage.load_league(selected_league, lazy=True)
         
         if loaded_league:
             self.league = loaded_league